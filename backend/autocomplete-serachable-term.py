@@ -2,9 +2,11 @@ import os
 import re
 import time
 import unicodedata
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Session
 from database import SessionLocal
 from models import Product
+import category_mapping
 
 BATCH_SIZE = 50
 
@@ -71,6 +73,8 @@ def main():
                 product.searchable_term = model
                 total_applied += 1
 
+            # searchable_term entra en la búsqueda de /products: invalida las respuestas en caché
+            session.execute(sql_text(category_mapping.BUMP_VERSION_SQL))
             session.commit()
             print(f"✅ Batch #{batch_num} completo. Productos procesados: {len(products)}")
             batch_num += 1
@@ -1,18 +1,23 @@
-import os
-import httpx
+import argparse
+import asyncio
+from sqlalchemy import text, update
 from sqlalchemy.orm import Session
 from database import SessionLocal
 from models import Product, Category
 from dotenv import load_dotenv
 import json
-import re
 import time
 import unicodedata
+import category_classifier
+import category_mapping
+import llm
 
 load_dotenv()
-deepseek_key = os.getenv("DEEPSEEK_API_KEY")
 
+# Productos de poca confianza por llamada a DeepSeek
 BATCH_SIZE = 20
+# Títulos por llamada al clasificador local
+CLASSIFY_CHUNK = 5000
 
 def normalize_text(text):
     # Normaliza Unicode, convierte a minúsculas y colapsa espacios múltiples
@@ -22,18 +27,18 @@ def normalize_text(text):
     return text
 
 def get_uncategorized_products(session: Session):
+    # Solo las columnas que hacen falta: pueden ser decenas de miles de filas
     return (
-        session.query(Product)
+        session.query(Product.id, Product.title, Product.retail_category)
         .filter(Product.category_id == None)
         .order_by(Product.id.asc())
-        .limit(BATCH_SIZE)
         .all()
     )
 
 def get_categories(session: Session):
     return session.query(Category).all()
 
-def ask_deepseek(titles, category_names):
+async def ask_deepseek(titles, category_names):
     system = "Sos un clasificador. Te paso una lista de títulos de productos y las categorías disponibles. Indicá a cuál categoría pertenece cada producto. Respondé una lista en formato JSON."
 
     prompt = f"""
@@ -53,103 +58,130 @@ Categorías disponibles:
 {json.dumps(category_names, ensure_ascii=False, indent=2)}
 """
 
-    res = httpx.post(
-        "https://api.deepseek.com/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {deepseek_key}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": "deepseek-chat",
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.2
-        },
-        timeout=120  # mayor timeout por si el prompt crece
-    )
-    res.raise_for_status()
-    return res.json()["choices"][0]["message"]["content"]
+    # mayor timeout por si el prompt crece
+    return await llm.deepseek.chat_json(prompt, system, temperature=0.2, timeout=120, endpoint="autosuggest-product-categories")
+
+def classify_locally(products, classifier, threshold):
+    """(asignaciones [(producto, category_id, confianza)], productos que quedan para DeepSeek)."""
+    assigned, pending = [], []
+    for i in range(0, len(products), CLASSIFY_CHUNK):
+        chunk = products[i:i + CLASSIFY_CHUNK]
+        predictions = classifier.predict([p.title for p in chunk], [p.retail_category for p in chunk])
+        for product, (category_id, confidence) in zip(chunk, predictions):
+            if confidence >= threshold:
+                assigned.append((product, category_id, confidence))
+            else:
+                pending.append(product)
+    return assigned, pending
+
+async def classify_with_llm(products, category_map):
+    """[(producto, category_id)] de un batch según DeepSeek."""
+    titles = [normalize_text(p.title) for p in products]
+    suggestions = await ask_deepseek(titles, list(category_map.keys()))
+
+    applied = []
+    for suggestion in suggestions:
+        title = suggestion["title"]
+        cat_name = suggestion["categoria"].lower()
+        product = next(
+            (p for p in products if normalize_text(p.title) == normalize_text(title)),
+            None
+        )
+        if product and cat_name in category_map:
+            print(f"✔️ {title} → {cat_name}")
+            applied.append((product, category_map[cat_name]))
+    return applied
+
+def save_categories(session: Session, assignments):
+    if assignments:
+        session.execute(update(Product), [{"id": product_id, "category_id": category_id} for product_id, category_id in assignments])
+        # Invalida las respuestas de /products en caché, que muestran y filtran por categoría
+        session.execute(text(category_mapping.BUMP_VERSION_SQL))
+    session.commit()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Categoriza los productos sin categoría.")
+    parser.add_argument("--threshold", type=float, help="Confianza mínima del clasificador local (por defecto, la del modelo)")
+    parser.add_argument("--no-llm", action="store_true", help="Solo el clasificador local; el resto queda sin categoría")
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar cuántos se categorizarían sin escribir")
+    args = parser.parse_args()
 
-def main():
     session = SessionLocal()
     start_time = time.time()  # Iniciamos el cronómetro
     try:
         categories = get_categories(session)
         category_map = {c.name.lower(): c.id for c in categories}
-        total_applied = 0
-        batch_num = 1
+        category_names = {c.id: c.name for c in categories}
+        products = get_uncategorized_products(session)
+        print(f"🔍 Productos sin categoría: {len(products)}")
         summary_log = []
-
-        while True:
-            print(f"\n🚀 Procesando batch #{batch_num}...")
-            products = get_uncategorized_products(session)
-            if not products:
-                print("✅ No quedan más productos sin categorizar.")
-                break
-
-            titles = [normalize_text(p.title) for p in products]
-
-            try:
-                suggestions_raw = ask_deepseek(titles, list(category_map.keys()))
-            except Exception as e:
-                print(f"❌ Error en batch #{batch_num}: {e}")
-                break
-
-            # print("🔍 Respuesta raw:")
-            # print(suggestions_raw)
-
-            json_match = re.search(r"\[\s*{.*}\s*]", suggestions_raw, re.DOTALL)
-            if not json_match:
-                print("❌ No se encontró JSON válido en la respuesta. Saltando batch.")
-                break
-
-            try:
-                suggestions = json.loads(json_match.group(0))
-            except json.JSONDecodeError as e:
-                print("❗ Error al parsear JSON:")
-                print(json_match.group(0))
-                raise e
-
-            applied = []
-            for suggestion in suggestions:
-                title = suggestion["title"]
-                cat_name = suggestion["categoria"].lower()
-                product = next(
-                    (p for p in products if normalize_text(p.title) == normalize_text(title)),
-                    None
+        assigned = []
+
+        # Paso 1: clasificador local, todo el backlog de una vez
+        classifier = category_classifier.get_classifier()
+        if classifier is None:
+            print("⚠️ No hay modelo entrenado (python train-category-classifier.py): todo va a DeepSeek.")
+            pending = products
+        else:
+            threshold = args.threshold if args.threshold is not None else classifier.min_confidence
+            assigned, pending = classify_locally(products, classifier, threshold)
+            # Una categoría que se borró después de entrenar no se asigna
+            assigned = [(p, category_id, confidence) for p, category_id, confidence in assigned if category_id in category_names]
+            print(
+                f"🤖 Clasificador local (confianza ≥ {threshold}): {len(assigned)} categorizados, "
+                f"{len(pending)} con poca confianza en {time.time() - start_time:.2f} segundos."
+            )
+            if not args.dry_run:
+                save_categories(session, [(p.id, category_id) for p, category_id, _ in assigned])
+            summary_log.append(
+                "# Clasificador local\n\n"
+                + "\n".join(f"- `{p.title}` → **{category_names[category_id]}** ({confidence:.2f})" for p, category_id, confidence in assigned)
+            )
+
+        # Paso 2: DeepSeek solo para los de poca confianza. Los batches van en paralelo (llm.py
+        # limita las llamadas simultáneas y reintenta los 429)
+        total_llm = 0
+        if args.no_llm or args.dry_run:
+            print(f"💡 {len(pending)} productos quedan sin categoría (sin DeepSeek).")
+        else:
+            batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+            for group_start in range(0, len(batches), llm.MAX_CONCURRENCY):
+                group = batches[group_start:group_start + llm.MAX_CONCURRENCY]
+                print(f"\n🚀 Procesando batches #{group_start + 1} a #{group_start + len(group)} de {len(batches)}...")
+                results = await asyncio.gather(
+                    *(classify_with_llm(batch, category_map) for batch in group), return_exceptions=True
                 )
-                if product and cat_name in category_map:
-                    product.category_id = category_map[cat_name]                    
-                    # product.title = normalize_text(product.title)
-                    print(f"✔️ {title} → {cat_name}")
-                    applied.append((product.title, cat_name))
-
-            session.commit()
-            total_applied += len(applied)
-
-            batch_log = [f"- `{title}` → **{cat}**" for title, cat in applied]
-            summary_log.append(f"# Batch #{batch_num}\n\n" + "\n".join(batch_log))
-
-            # Calcular y mostrar el tiempo total de ejecución hasta este batch
-            elapsed_time = time.time() - start_time
-            print(f"⏱ Tiempo de ejecución total hasta el batch #{batch_num}: {elapsed_time:.2f} segundos.")
-
-            print(f"✅ Batch #{batch_num} completo: {len(applied)} sugerencias aplicadas.")
-            batch_num += 1
-            time.sleep(2)
+                for batch_num, result in enumerate(results, start=group_start + 1):
+                    if isinstance(result, llm.LLMError):
+                        print(f"❌ Error en batch #{batch_num}: {result}")
+                        continue
+                    if isinstance(result, BaseException):
+                        raise result
+                    save_categories(session, [(p.id, category_id) for p, category_id in result])
+                    total_llm += len(result)
+                    batch_log = [f"- `{p.title}` → **{category_names[category_id]}**" for p, category_id in result]
+                    summary_log.append(f"# Batch #{batch_num}\n\n" + "\n".join(batch_log))
+                    print(f"✅ Batch #{batch_num} completo: {len(result)} sugerencias aplicadas.")
+
+                # Calcular y mostrar el tiempo total de ejecución hasta este grupo
+                elapsed_time = time.time() - start_time
+                print(f"⏱ Tiempo de ejecución total: {elapsed_time:.2f} segundos.")
 
         # 🔽 Crear resumen final
         with open("deepseek_suggestions_summary.md", "w") as f:
-            f.write("# Resumen total de sugerencias aplicadas por DeepSeek\n\n")
+            f.write("# Resumen total de sugerencias aplicadas\n\n")
             f.write("\n\n".join(summary_log))
 
-        print(f"\n🎉 Proceso finalizado. Total de productos categorizados: {total_applied}")
+        total_local = len(assigned)
+        if args.dry_run:
+            print("💡 --dry-run: no se escribió nada")
+        print(f"\n🎉 Proceso finalizado. Productos categorizados: {total_local + total_llm} ({total_local} clasificador local, {total_llm} DeepSeek)")
+        print(f"⏱ {time.time() - start_time:.2f} segundos")
         print("📄 Resumen generado en: deepseek_suggestions_summary.md")
 
     finally:
         session.close()
+        await llm.deepseek.aclose()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
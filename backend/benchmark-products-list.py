@@ -0,0 +1,118 @@
+import argparse
+import json
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy.orm import joinedload
+
+import listing
+import models
+import schemas
+from database import SessionLocal
+
+# Compara el listado de /products como era antes (objetos del ORM con joinedload + ProductBase
+# validado con from_attributes) contra el de columnas proyectadas serializadas directo a JSON.
+# Solo la página de productos: el conteo, la caché y los facets son iguales en los dos caminos.
+
+
+class OrmListResponse(BaseModel):
+    data: List[schemas.ProductBase]
+
+
+def orm_page(db, limit):
+    products = (
+        db.query(models.Product)
+        .options(joinedload(models.Product.retailer), joinedload(models.Product.category_rel))
+        .filter(models.Product.out_of_stock == False)
+        .order_by(models.Product.updated_date.desc(), models.Product.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return OrmListResponse.model_validate({"data": products}).model_dump_json().encode()
+
+
+def projection_page(db, limit):
+    rows = (
+        listing.list_query(db)
+        .filter(models.Product.out_of_stock == False)
+        .order_by(models.Product.updated_date.desc(), models.Product.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return listing.dump_response({"data": [listing.row_to_item(row) for row in rows]})
+
+
+def measure(page_fn, limit, requests):
+    """CPU y tiempo por request (cada uno con su sesión, como get_db) y pico de memoria."""
+    cpu, wall = [], []
+    for _ in range(requests):
+        db = SessionLocal()
+        try:
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            page_fn(db, limit)
+            cpu.append(time.process_time() - cpu_start)
+            wall.append(time.perf_counter() - wall_start)
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        tracemalloc.start()
+        payload = page_fn(db, limit)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    cpu.sort()
+    wall.sort()
+    return {
+        "cpu_ms": sum(cpu) / len(cpu) * 1000,
+        "wall_p50_ms": wall[len(wall) // 2] * 1000,
+        "peak_kb": peak / 1024,
+        "bytes": len(payload),
+    }
+
+
+def same_items(limit):
+    """El camino nuevo devuelve lo mismo que el viejo, salvo ai_description (que el listado no usa)."""
+    db = SessionLocal()
+    try:
+        before = json.loads(orm_page(db, limit))["data"]
+        after = json.loads(projection_page(db, limit))["data"]
+    finally:
+        db.close()
+    for item in before:
+        item.pop("ai_description", None)
+    return before == after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU y memoria por request del listado de /products: ORM vs columnas.")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    if not same_items(args.limit):
+        raise SystemExit("❌ Los dos caminos no devuelven los mismos productos")
+
+    # Una pasada para calentar conexiones y cachés de compilación de SQLAlchemy
+    measure(orm_page, args.limit, 5)
+    measure(projection_page, args.limit, 5)
+
+    results = {
+        "ORM + Pydantic": measure(orm_page, args.limit, args.requests),
+        "columnas + json": measure(projection_page, args.limit, args.requests),
+    }
+    print(f"limit={args.limit}, {args.requests} requests")
+    print(f"{'camino':<18}{'CPU ms/req':>12}{'p50 ms':>10}{'pico KB':>10}{'bytes':>9}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['cpu_ms']:>12.2f}{r['wall_p50_ms']:>10.2f}{r['peak_kb']:>10.0f}{r['bytes']:>9}")
+    before, after = results.values()
+    print(f"\n⚡ CPU {before['cpu_ms'] / after['cpu_ms']:.1f}x menos, memoria pico {before['peak_kb'] / after['peak_kb']:.1f}x menos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import os
+import time
+import unicodedata
+from datetime import datetime
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_recall_fscore_support
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.pipeline import make_pipeline, make_union
+from sqlalchemy import text
+
+# Clasificador local de categorías: TF-IDF de palabras y de n-gramas de caracteres (aguantan
+# typos, modelos pegados y plurales) + un modelo lineal. Se entrena con los productos que ya
+# tienen categoría y con los mapeos de retailer_categories (train-category-classifier.py) y
+# predice miles de títulos por segundo. Las predicciones con poca confianza van a DeepSeek.
+MODEL_PATH = os.getenv(
+    "CATEGORY_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "category_model.joblib")
+)
+# Si no se define, se usa el umbral que eligió el entrenamiento sobre los datos de evaluación
+CONFIDENCE_THRESHOLD = os.getenv("CATEGORY_CONFIDENCE_THRESHOLD")
+# Umbral elegido: el más bajo con el que los productos que resuelve el modelo aciertan al menos
+# esto. Nunca menos de 0.5: por debajo el modelo duda entre dos o más categorías
+TARGET_ACCURACY = 0.95
+DEFAULT_THRESHOLD = 0.8
+REPORT_THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95)
+# Categorías con menos ejemplos no se pueden aprender (quedan para DeepSeek)
+MIN_EXAMPLES = 5
+
+# Cada ejemplo con su retailer (para agrupar la evaluación por categoría del retailer) y su
+# producto canónico (el mismo producto en otro retailer)
+TRAINING_SQL = """
+    SELECT p.title, p.retail_category, p.category_id, p.retailer_id, p.canonical_product_id
+    FROM products p
+    JOIN categories c ON c.id = p.category_id
+    UNION ALL
+    SELECT NULL, rc.name, rc.category_id, rc.retailer_id, NULL
+    FROM retailer_categories rc
+    JOIN categories c ON c.id = rc.category_id
+"""
+
+
+def normalize(value):
+    value = unicodedata.normalize("NFKD", value.lower())
+    return "".join(ch for ch in value if not unicodedata.combining(ch))
+
+
+def product_text(title, retail_category):
+    # La categoría del retailer ("Heladeras", "Celulares") pesa tanto como el título
+    return f"{title or ''} | {retail_category or ''}"
+
+
+def load_training_data(db):
+    """(textos, categorías, grupos, canónicos). El grupo es la categoría del retailer: los
+    productos sin categoría están casi siempre en categorías del retailer sin mapeo, que el
+    modelo no vio al entrenar, y la evaluación tiene que medir eso."""
+    rows = db.execute(text(TRAINING_SQL)).all()
+    texts = [product_text(title, retail_category) for title, retail_category, _, _, _ in rows]
+    labels = np.array([category_id for _, _, category_id, _, _ in rows])
+    groups = np.array([f"{retailer_id}|{retail_category or ''}" for _, retail_category, _, retailer_id, _ in rows])
+    canonical_ids = np.array([canonical_id or 0 for _, _, _, _, canonical_id in rows])
+
+    counts = dict(zip(*np.unique(labels, return_counts=True))) if len(labels) else {}
+    keep = np.array([counts[label] >= MIN_EXAMPLES for label in labels], dtype=bool)
+    return [t for t, k in zip(texts, keep) if k], labels[keep], groups[keep], canonical_ids[keep]
+
+
+def build_pipeline():
+    features = make_union(
+        TfidfVectorizer(preprocessor=normalize, ngram_range=(1, 2), min_df=2, sublinear_tf=True),
+        TfidfVectorizer(preprocessor=normalize, analyzer="char_wb", ngram_range=(3, 5), min_df=2,
+                        sublinear_tf=True, max_features=300000, dtype=np.float32),
+    )
+    model = SGDClassifier(loss="log_loss", alpha=1e-5, max_iter=15, tol=1e-3, random_state=42)
+    return make_pipeline(features, model)
+
+
+class CategoryClassifier:
+    def __init__(self, pipeline, threshold=DEFAULT_THRESHOLD, trained_at=None, examples=0, metrics=None):
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self.trained_at = trained_at
+        self.examples = examples
+        self.metrics = metrics or {}
+
+    @property
+    def min_confidence(self):
+        return float(CONFIDENCE_THRESHOLD) if CONFIDENCE_THRESHOLD else self.threshold
+
+    def predict(self, titles, retail_categories):
+        """[(category_id, confianza)] en el orden de `titles`."""
+        if not titles:
+            return []
+        probabilities = self.pipeline.predict_proba(
+            [product_text(title, rc) for title, rc in zip(titles, retail_categories)]
+        )
+        best = probabilities.argmax(axis=1)
+        classes = self.pipeline.classes_
+        return [(int(classes[i]), float(p[i])) for i, p in zip(best, probabilities)]
+
+    def save(self, path=MODEL_PATH):
+        joblib.dump(self, path, compress=3)
+
+    @staticmethod
+    def load(path=MODEL_PATH):
+        return joblib.load(path)
+
+
+def train(texts, labels, threshold=DEFAULT_THRESHOLD, metrics=None):
+    pipeline = build_pipeline()
+    pipeline.fit(texts, labels)
+    return CategoryClassifier(pipeline, threshold, datetime.now(), len(texts), metrics)
+
+
+def evaluate(texts, labels, groups, canonical_ids=None, test_size=0.2):
+    """Entrena con una parte de las categorías del retailer y mide sobre el resto, como si esas
+    categorías no tuvieran mapeo. Devuelve las métricas y el umbral de confianza sugerido.
+
+    También se sacan de la evaluación los productos cuyo canónico (el mismo producto en otro
+    retailer) quedó en el entrenamiento: el título casi igual inflaría la accuracy.
+    """
+    split = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=42)
+    train_idx, test_idx = next(split.split(texts, labels, groups))
+    if canonical_ids is not None:
+        seen = np.setdiff1d(canonical_ids[train_idx], [0])
+        test_idx = test_idx[~np.isin(canonical_ids[test_idx], seen)]
+
+    started = time.time()
+    classifier = train([texts[i] for i in train_idx], labels[train_idx])
+    train_seconds = time.time() - started
+
+    test_texts = [texts[i] for i in test_idx]
+    expected = labels[test_idx]
+    started = time.time()
+    probabilities = classifier.pipeline.predict_proba(test_texts)
+    predict_seconds = time.time() - started
+    predicted = classifier.pipeline.classes_[probabilities.argmax(axis=1)]
+    confidence = probabilities.max(axis=1)
+    correct = predicted == expected
+
+    by_threshold = []
+    for threshold in REPORT_THRESHOLDS:
+        covered = confidence >= threshold
+        by_threshold.append({
+            "threshold": threshold,
+            "coverage": float(covered.mean()),
+            "accuracy": float(correct[covered].mean()) if covered.any() else None,
+            "llm_items": int((~covered).sum()),
+        })
+    chosen = next(
+        (row["threshold"] for row in by_threshold if row["accuracy"] is not None and row["accuracy"] >= TARGET_ACCURACY),
+        DEFAULT_THRESHOLD,
+    )
+
+    categories = sorted(set(expected) | set(predicted))
+    precision, recall, f1, support = precision_recall_fscore_support(
+        expected, predicted, labels=categories, zero_division=0
+    )
+    return {
+        "train_examples": len(train_idx),
+        "test_examples": len(test_idx),
+        "test_groups": len(set(groups[test_idx])),
+        "train_seconds": round(train_seconds, 2),
+        "predict_seconds": round(predict_seconds, 3),
+        "accuracy": float(accuracy_score(expected, predicted)),
+        "macro_f1": float(f1_score(expected, predicted, average="macro", zero_division=0)),
+        "thresholds": by_threshold,
+        "threshold": chosen,
+        "categories": [
+            {"category_id": int(c), "precision": float(p), "recall": float(r), "f1": float(f), "support": int(s)}
+            for c, p, r, f, s in zip(categories, precision, recall, f1, support)
+        ],
+    }
+
+
+_loaded = {"mtime": None, "classifier": None}
+
+
+def get_classifier(path=MODEL_PATH):
+    """Modelo entrenado, o None si todavía no se corrió train-category-classifier.py. Se vuelve
+    a cargar si el archivo cambió (un reentrenamiento no requiere reiniciar la API)."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if _loaded["mtime"] != mtime:
+        _loaded["classifier"] = CategoryClassifier.load(path)
+        _loaded["mtime"] = mtime
+    return _loaded["classifier"]
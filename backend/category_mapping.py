@@ -0,0 +1,68 @@
+import time
+
+from sqlalchemy import text
+
+# Aplica los mapeos de retailer_categories (categoría del retailer -> categoría propia) a los
+# productos con un solo UPDATE ... FROM por (retailer_id, retail_category), en vez de cargar y
+# modificar cada producto. Lo usan PATCH /retailer-categories/{id}/map (solo ese mapeo) y
+# update-products-with-categories.py (todos). El mapeo pisa la categoría que tuviera el producto.
+PROPAGATE_SQL = """
+    UPDATE products p
+    SET category_id = rc.category_id
+    FROM retailer_categories rc
+    WHERE p.retailer_id = rc.retailer_id AND p.retail_category = rc.name
+      AND rc.category_id IS NOT NULL
+      AND p.category_id IS DISTINCT FROM rc.category_id
+      {only}
+"""
+
+# Cuántos productos cambiaría cada mapeo (--dry-run): las mismas condiciones que el UPDATE
+PREVIEW_SQL = """
+    SELECT rc.id, rc.name, r.name AS retailer, c.name AS category, count(*) AS products
+    FROM retailer_categories rc
+    JOIN retailers r ON r.id = rc.retailer_id
+    JOIN categories c ON c.id = rc.category_id
+    JOIN products p ON p.retailer_id = rc.retailer_id AND p.retail_category = rc.name
+    WHERE p.category_id IS DISTINCT FROM rc.category_id
+      {only}
+    GROUP BY rc.id, rc.name, r.name, c.name
+    ORDER BY count(*) DESC
+"""
+
+# Mismo contador que incrementan los scrapers: invalida las respuestas de /products en caché
+# (response_cache.py), que filtran por categoría
+BUMP_VERSION_SQL = """
+    INSERT INTO data_versions (name, version, updated_at) VALUES ('products', 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def _only(mapping_ids):
+    return ("AND rc.id = ANY(:ids)", {"ids": list(mapping_ids)}) if mapping_ids is not None else ("", {})
+
+
+def preview(db, mapping_ids=None):
+    """[{id, name, retailer, category, products}] de los mapeos que cambiarían algún producto."""
+    only, params = _only(mapping_ids)
+    return [dict(row._mapping) for row in db.execute(text(PREVIEW_SQL.format(only=only)), params)]
+
+
+def propagate(db, mapping_ids=None):
+    """Aplica los mapeos (todos, o solo `mapping_ids`) y devuelve cuántos productos cambiaron.
+    No hace commit: corre en la transacción de quien lo llama."""
+    only, params = _only(mapping_ids)
+    updated = db.execute(text(PROPAGATE_SQL.format(only=only)), params).rowcount
+    if updated:
+        db.execute(text(BUMP_VERSION_SQL))
+    return updated
+
+
+def run(db, dry_run=False):
+    started = time.time()
+    if dry_run:
+        changes = preview(db)
+        return {"mappings": len(changes), "products": sum(c["products"] for c in changes),
+                "changes": changes, "seconds": round(time.time() - started, 2)}
+    updated = propagate(db)
+    db.commit()
+    return {"products": updated, "seconds": round(time.time() - started, 2)}
@@ -0,0 +1,223 @@
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+
+import listing
+import models
+import pagination
+from database import SessionLocal
+from search import ProductSearch
+
+# Corre EXPLAIN sobre las consultas de los endpoints más usados y verifica que cada una pueda
+# usar el índice que le corresponde (ver las migraciones 0002, 0004, 0006, 0007, 0008 y 0009).
+# Las de /products y /arbitrage se arman con el mismo código que los endpoints (listing, search,
+# pagination), así que un cambio en ese código también se verifica acá.
+# Con enable_seqscan = off el planner elige el índice si le sirve: si no lo elige, el índice
+# no matchea la consulta y el check falla. El plan real (con las estadísticas de la base) se
+# muestra al lado, porque en tablas chicas un seq scan puede ser lo más barato.
+# También verifica que el historial reciente lea solo las particiones recientes de historical_prices.
+
+Product, HistoricalPrice, Stats = models.Product, models.HistoricalPrice, models.ProductPriceStats
+Opportunity = models.ArbitrageOpportunity
+
+
+def sample(db):
+    """Un producto con historial, modelo y categoría para armar las consultas con valores reales."""
+    product_id = db.query(HistoricalPrice.product_id).filter(HistoricalPrice.product_id != None).limit(1).scalar()
+    term = db.query(Product.searchable_term).filter(Product.searchable_term != None).limit(1).scalar()
+    category_id = db.query(Product.category_id).filter(Product.category_id != None).limit(1).scalar()
+    canonical_id = db.query(Product.canonical_product_id).filter(Product.canonical_product_id != None).limit(1).scalar()
+    retailer_id, retail_category = db.query(Product.retailer_id, Product.retail_category).first() or (1, "")
+    # Fila en la que termina una página, para las consultas con cursor
+    price, title, last_id = db.query(Product.final_price, Product.title, Product.id).filter(
+        Product.out_of_stock == False, Product.final_price != None, Product.title != None
+    ).first() or (0, "", 0)
+    return {
+        "product_id": product_id or 1, "term": term or "", "category_id": category_id or 1, "canonical_id": canonical_id or 1,
+        "retailer_id": retailer_id or 1, "retail_category": retail_category or "",
+        "price_cursor": [price, last_id], "title_cursor": [title, last_id], "search": (title or "heladera").split()[0],
+    }
+
+
+def products_page(db, sort="", query="", cursor=None, phase=0):
+    """Una página de /products armada con el mismo código que el endpoint (main.query_products),
+    sin filtros de retailer ni categoría. Con `cursor`, el tramo `phase` de la paginación."""
+    search = ProductSearch(query)
+    keys, descending = pagination.sort_keys(sort, search)
+    q = listing.ordered_query(listing.filtered_query(db, search, [], [], 0.0, 99999999.0), keys, descending)
+    if cursor is not None:
+        q = q.filter(pagination.product_cursor_phases(keys, descending, cursor)[phase])
+    return q.limit(21)
+
+
+def arbitrage_page(db, sort, min_spread=0.0, min_spread_pct=0.0, cursor=None):
+    """Una página de /arbitrage, con el orden y el cursor de pagination como en el endpoint."""
+    keys = pagination.ARBITRAGE_SORTS[sort]
+    q = (
+        db.query(Opportunity.canonical_product_id)
+        .filter(Opportunity.spread >= min_spread, Opportunity.spread_pct >= min_spread_pct)
+        .order_by(*pagination.order_by(keys, True))
+    )
+    if cursor is not None:
+        q = q.filter(pagination.after_cursor(keys, True, cursor))
+    return q.limit(21)
+
+
+CHECKS = [
+    ("/products (recientes)", "products_updated_id_idx", lambda db, s: products_page(db)),
+    ("/products?sort=price_asc", "products_price_id_idx", lambda db, s: products_page(db, "price_asc")),
+    ("/products?sort=price_asc (cursor)", "products_price_id_idx", lambda db, s: (
+        products_page(db, "price_asc", cursor=s["price_cursor"])
+    )),
+    ("/products?sort=name_asc (cursor)", "products_title_id_idx", lambda db, s: (
+        products_page(db, "name_asc", cursor=s["title_cursor"])
+    )),
+    ("/products?sort=name_asc (cursor, NULL)", "products_title_id_idx", lambda db, s: (
+        products_page(db, "name_asc", cursor=[None, s["title_cursor"][1]])
+    )),
+    # Menos de 3 letras: solo el full-text. Con más, el OR también usa el índice de trigramas
+    ("/products?query= (full-text)", "products_search_vector_idx", lambda db, s: products_page(db, "relevance", "tv")),
+    ("/products?query= (trigramas)", "products_title_trgm_idx", lambda db, s: products_page(db, "relevance", s["search"])),
+    ("/products/{id}/history", "historical_prices_product_date_idx", lambda db, s: (
+        db.query(HistoricalPrice)
+        .filter(HistoricalPrice.product_id == s["product_id"])
+        .order_by(HistoricalPrice.date_recorded.asc())
+    )),
+    ("/products/{id}/similar (mismo producto)", "products_canonical_price_idx", lambda db, s: (
+        db.query(Product)
+        .filter(Product.canonical_product_id == s["canonical_id"], Product.id != s["product_id"], Product.out_of_stock == False)
+        .order_by(Product.final_price.asc())
+        .limit(6)
+    )),
+    ("/products/{id}/similar (modelo)", "products_searchable_term_price_idx", lambda db, s: (
+        db.query(Product)
+        .filter(Product.searchable_term == s["term"], Product.id != s["product_id"], Product.out_of_stock == False)
+        .order_by(Product.final_price.asc())
+        .limit(6)
+    )),
+    ("/products/{id}/similar (categoría)", "products_category_price_idx", lambda db, s: (
+        db.query(Product)
+        .filter(Product.category_id == s["category_id"], Product.id != s["product_id"], Product.out_of_stock == False)
+        .order_by(Product.final_price.asc())
+        .limit(6)
+    )),
+    ("/tweets/weekly-drops", "product_price_stats_last_change_idx", lambda db, s: (
+        db.query(Stats.product_id)
+        .filter(Stats.last_change_at > datetime.utcnow() - timedelta(days=1), Stats.price_3d_ago > Stats.current_price)
+        .order_by((Stats.price_3d_ago - Stats.current_price).desc())
+        .limit(5)
+    )),
+    ("/tweets/historical-difference", "product_price_stats_max_discount_idx", lambda db, s: (
+        db.query(Stats.product_id).filter(Stats.max_discount > 0).order_by(Stats.max_discount.desc()).limit(1)
+    )),
+    ("/arbitrage", "arbitrage_opportunities_spread_pct_idx", lambda db, s: arbitrage_page(db, "spread_pct", min_spread_pct=10)),
+    ("/arbitrage (cursor)", "arbitrage_opportunities_spread_pct_idx", lambda db, s: (
+        arbitrage_page(db, "spread_pct", cursor=[50, s["canonical_id"]])
+    )),
+    ("/arbitrage?sort=spread", "arbitrage_opportunities_spread_idx", lambda db, s: arbitrage_page(db, "spread", min_spread=50000)),
+    ("/retailer-categories/{id}/map", "products_retailer_category_idx", lambda db, s: (
+        db.query(Product.id).filter(Product.retailer_id == s["retailer_id"], Product.retail_category == s["retail_category"])
+    )),
+    ("/products/uncategorized", "products_uncategorized_idx", lambda db, s: (
+        db.query(Product.id).filter(Product.category_id == None).order_by(Product.id.desc()).limit(50)
+    )),
+    ("/admin/stats (sin categoría)", "products_uncategorized_idx", lambda db, s: (
+        db.query(func.count()).select_from(Product).filter(Product.category_id == None)
+    )),
+    ("/admin/stats (sin stock)", "products_out_of_stock_idx", lambda db, s: (
+        db.query(func.count()).select_from(Product).filter(Product.out_of_stock == True)
+    )),
+]
+
+
+def parent_indexes(db):
+    """Índice de cada partición -> índice del padre (historical_prices está particionada)."""
+    rows = db.execute(text("""
+        SELECT child.relname, parent.relname
+        FROM pg_inherits i
+        JOIN pg_class child ON child.oid = i.inhrelid
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        WHERE child.relkind = 'i'
+    """)).all()
+    return dict(rows)
+
+
+def plan_nodes(node, key, found=None):
+    found = set() if found is None else found
+    if key in node:
+        found.add(node[key])
+    for child in node.get("Plans", []):
+        plan_nodes(child, key, found)
+    return found
+
+
+def explain(db, query, force_index=False):
+    """(índices, tablas) que usa el plan; los de las particiones se reportan con el nombre del padre."""
+    # Con los parámetros del driver y no literales: la búsqueda lleva un REGCONFIG
+    compiled = query.statement.compile(db.bind, compile_kwargs={"render_postcompile": True})
+    try:
+        if force_index:
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+        result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        parents = parent_indexes(db)
+    finally:
+        db.rollback()
+    plan = (result if isinstance(result, list) else json.loads(result))[0]["Plan"]
+    indexes = {parents.get(name, name) for name in plan_nodes(plan, "Index Name")}
+    return indexes, plan_nodes(plan, "Relation Name")
+
+
+def check_recent_partitions(db, days=1):
+    """Lo de los últimos días solo tiene que leer las particiones de esos meses (y la default)."""
+    query = (
+        db.query(HistoricalPrice.product_id, func.max(HistoricalPrice.date_recorded))
+        .filter(HistoricalPrice.date_recorded > datetime.utcnow() - timedelta(days=days))
+        .group_by(HistoricalPrice.product_id)
+    )
+    _, tables = explain(db, query)
+    if "historical_prices" in tables:
+        print("⚠️  historical_prices no está particionada (falta la migración 0005)")
+        return True
+    oldest = f"historical_prices_{datetime.utcnow() - timedelta(days=days):%Y_%m}"
+    old = sorted(t for t in tables if t.startswith("historical_prices_") and t != "historical_prices_default" and t < oldest)
+    status = "❌" if old else "✅"
+    print(f"{status} historial de los últimos {days} días lee: {', '.join(sorted(tables))}")
+    return not old
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica con EXPLAIN que cada endpoint use su índice.")
+    parser.add_argument("--verbose", action="store_true", help="Muestra todos los índices de cada plan")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failed = []
+    try:
+        values = sample(db)
+        for endpoint, index, build in CHECKS:
+            query = build(db, values)
+            usable = index in explain(db, query, force_index=True)[0]
+            planned = explain(db, query)[0]
+            status = "✅" if usable else "❌"
+            chosen = "lo usa" if index in planned else "hoy elige otro plan"
+            print(f"{status} {endpoint:<40} {index:<38} {chosen}")
+            if args.verbose:
+                print(f"    plan: {', '.join(sorted(planned)) or 'seq scan'}")
+            if not usable:
+                failed.append(endpoint)
+        if not check_recent_partitions(db):
+            failed.append("particiones de historical_prices")
+    finally:
+        db.close()
+
+    if failed:
+        print(f"\n❌ {len(failed)} consultas no usan su índice o sus particiones: ¿falta `alembic upgrade head`?")
+        sys.exit(1)
+    print("\n✅ Todas las consultas pueden usar su índice")
+
+
+if __name__ == "__main__":
+    main()
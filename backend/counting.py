@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func
+
+import models
+
+# Hasta acá se cuenta exacto; más allá alcanza con "10.000+" o la estimación del planner
+EXACT_COUNT_LIMIT = 10000
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 1000
+
+
+class CountCache:
+    """Totales por combinación de filtros, con TTL corto: el catálogo cambia con cada scraper."""
+
+    def __init__(self, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+count_cache = CountCache()
+
+
+def capped_count(db, q, cap):
+    """count(*) que deja de leer filas al pasar `cap`: devuelve como mucho cap + 1."""
+    ids = q.with_entities(models.Product.id).order_by(None).limit(cap + 1).subquery()
+    return db.query(func.count()).select_from(ids).scalar()
+
+
+def estimated_count(db, q):
+    """Filas que el planner espera para la consulta (EXPLAIN, sin ejecutarla)."""
+    statement = q.with_entities(models.Product.id).order_by(None).statement
+    compiled = statement.compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_products(db, q, key):
+    """(total, exacto) para los filtros de `q`.
+
+    Con hasta EXACT_COUNT_LIMIT resultados el total es exacto. Si hay más, se usa la estimación del
+    planner (nunca menos de EXACT_COUNT_LIMIT + 1, que ya se contaron) y se marca como no exacta.
+    """
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    total = capped_count(db, q, EXACT_COUNT_LIMIT)
+    if total <= EXACT_COUNT_LIMIT:
+        result = (total, True)
+    else:
+        result = (max(estimated_count(db, q), EXACT_COUNT_LIMIT + 1), False)
+    count_cache.set(key, result)
+    return result
@@ -0,0 +1,83 @@
+import json
+
+from sqlalchemy import Numeric, and_, cast, func, literal, select, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, array
+
+import models
+from response_cache import ResponseCache
+
+# Límites de los rangos de precio (ARS): el último rango queda abierto
+PRICE_BUCKETS = [0, 50000, 100000, 200000, 500000, 1000000, 2000000]
+
+# Facets del catálogo sin búsqueda: dependen solo de los filtros y de la versión de los datos,
+# así que se reusan hasta el próximo scrapeo
+catalog_facets_cache = ResponseCache("facets", max_entries=128)
+
+
+def facet_counts(db, search, retailer_list, category_list, min_price, max_price):
+    """Cantidad de productos por retailer, categoría y rango de precio, en una sola pasada.
+
+    Cada facet se cuenta con todos los filtros menos el propio (elegir un retailer no hace
+    desaparecer a los demás): la búsqueda y el stock filtran las filas, y cada filtro restante
+    es un `FILTER` del count que corresponde. `GROUPING SETS` agrupa por las tres cosas a la vez.
+    """
+    Product, Retailer, Category = models.Product, models.Retailer, models.Category
+    retailer_ok = Retailer.name.in_(retailer_list) if retailer_list else true()
+    category_ok = Category.name.in_(category_list) if category_list else true()
+    price_ok = and_(Product.final_price >= min_price, Product.final_price <= max_price)
+    # 1 = [PRICE_BUCKETS[0], PRICE_BUCKETS[1]), ..., len(PRICE_BUCKETS) = el último rango abierto
+    # Los límites como NUMERIC[], del mismo tipo que final_price: con un integer[] width_bucket
+    # depende de que el Postgres sepa unificar numeric con integer (anycompatiblearray, 14+)
+    bucket = func.width_bucket(Product.final_price, cast(array([literal(b) for b in PRICE_BUCKETS]), ARRAY(Numeric)))
+
+    statement = (
+        select(
+            func.grouping(Retailer.name, Category.name, bucket).label("grouping"),
+            Retailer.name,
+            Category.name,
+            bucket,
+            func.count().filter(and_(category_ok, price_ok)),
+            func.count().filter(and_(retailer_ok, price_ok)),
+            func.count().filter(and_(retailer_ok, category_ok)),
+        )
+        .select_from(Product)
+        .outerjoin(Retailer, Product.retailer_id == Retailer.id)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .where(Product.out_of_stock == False)
+        .group_by(func.grouping_sets(tuple_(Retailer.name), tuple_(Category.name), tuple_(bucket)))
+    )
+    if search:
+        statement = statement.where(search.condition())
+
+    retailers, categories = [], []
+    prices = [0] * len(PRICE_BUCKETS)
+    # grouping(): bit en 1 = columna no agrupada en esa fila (retailer es el bit más alto)
+    for grouping, retailer, category, price_bucket, by_retailer, by_category, by_price in db.execute(statement):
+        if grouping == 0b011 and retailer is not None:
+            retailers.append({"value": retailer, "count": by_retailer})
+        elif grouping == 0b101 and category is not None:
+            categories.append({"value": category, "count": by_category})
+        elif grouping == 0b110 and price_bucket:
+            prices[price_bucket - 1] = by_price
+
+    return {
+        "retailers": sorted(retailers, key=lambda f: (-f["count"], f["value"])),
+        "categories": sorted(categories, key=lambda f: (-f["count"], f["value"])),
+        "prices": [
+            {"min": low, "max": PRICE_BUCKETS[i + 1] if i + 1 < len(PRICE_BUCKETS) else None, "count": count}
+            for i, (low, count) in enumerate(zip(PRICE_BUCKETS, prices))
+        ],
+    }
+
+
+def product_facets(db, version, search, retailer_list, category_list, min_price, max_price):
+    if search:
+        return facet_counts(db, search, retailer_list, category_list, min_price, max_price)
+
+    key = json.dumps([sorted(retailer_list), sorted(category_list), min_price, max_price])
+    payload, _ = catalog_facets_cache.get(version, key)
+    if payload is not None:
+        return json.loads(payload)
+    facets = facet_counts(db, search, retailer_list, category_list, min_price, max_price)
+    catalog_facets_cache.set(version, key, json.dumps(facets).encode())
+    return facets
@@ -1,5 +1,4 @@
-import os
-import time
+import asyncio
 import html
 import httpx
 from bs4 import BeautifulSoup
@@ -7,10 +6,11 @@ from sqlalchemy.orm import Session
 from database import SessionLocal
 from models import Product, Retailer
 from dotenv import load_dotenv
+import llm
 
 load_dotenv()
 
-DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
+# Los productos de un batch se procesan en paralelo (llm limita las llamadas simultáneas)
 BATCH_SIZE = 10
 
 RETAILER_SELECTORS = {
@@ -109,30 +109,21 @@ def build_prompt(product, page_content):
         f"Generá una descripción breve, clara, vendedora y sin repetir el título."
     )
 
-def get_deepseek_description(prompt):
+async def get_deepseek_description(prompt):
     try:
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": "Sos un copywriter experto en ecommerce."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
+        description = await llm.deepseek.chat(
+            prompt, "Sos un copywriter experto en ecommerce.", timeout=60.0, endpoint="generate_ai_description_for_products"
         )
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
-    except Exception as e:
+        return description.strip()
+    except llm.LLMError as e:
         print("❌ DeepSeek falló:", e)
         return None
 
+async def describe(product):
+    print(f"🔎 Generando descripción para: {product.title}")
+    page_content = await asyncio.to_thread(get_clean_text_from_url, product.url)
+    return await get_deepseek_description(build_prompt(product, page_content))
+
 def get_products_missing_ai_description(session):
     return (
         session.query(Product)
@@ -142,7 +133,7 @@ def get_products_missing_ai_description(session):
         .all()
     )
 
-def main():
+async def main():
     session = SessionLocal()
     total_completed = 0
     batch_num = 1
@@ -156,13 +147,11 @@ def main():
                 break
 
             for product in products:
-                print(f"🔎 Generando descripción para: {product.title}")
                 product.retailer = session.query(Retailer).get(product.retailer_id)
 
-                page_content = get_clean_text_from_url(product.url)
-                prompt = build_prompt(product, page_content)
-                description = get_deepseek_description(prompt)
+            descriptions = await asyncio.gather(*(describe(product) for product in products))
 
+            for product, description in zip(products, descriptions):
                 if description:
                     product.ai_description = description
                     print(f"✅ Descripción generada y asignada.")
@@ -173,11 +162,12 @@ def main():
             session.commit()
             print(f"✅ Batch #{batch_num} completo.")
             batch_num += 1
-            time.sleep(1)
+            await asyncio.sleep(1)
 
     finally:
         session.close()
+        await llm.deepseek.aclose()
         print(f"\n🎉 Proceso finalizado. Total de productos actualizados: {total_completed}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import models
+import pagination
+
+# Lo único que muestra el listado (ver schemas.ProductListItem): sin ai_description ni
+# searchable_term, y sin armar objetos del ORM ni validarlos uno por uno con Pydantic
+LIST_COLUMNS = [
+    models.Product.id,
+    models.Product.title,
+    models.Product.original_price,
+    models.Product.final_price,
+    models.Product.url,
+    models.Product.image,
+    models.Product.retail_category,
+    models.Product.added_date,
+    models.Product.updated_date,
+    models.Product.category_id,
+    models.Retailer.id,
+    models.Retailer.name,
+    models.Category.name,
+]
+
+
+def list_query(db):
+    return (
+        db.query(*LIST_COLUMNS)
+        .select_from(models.Product)
+        .join(models.Retailer, models.Product.retailer_id == models.Retailer.id)
+        .outerjoin(models.Category, models.Product.category_id == models.Category.id)
+    )
+
+
+def filtered_query(db, search, retailer_list, category_list, min_price, max_price):
+    """El listado de /products con sus filtros, sin orden ni página (también lo usan el conteo
+    y check-query-plans.py). Retailer y categoría ya vienen joineados: los filtros los usan directo."""
+    q = list_query(db)
+    if search:
+        q = q.filter(search.condition())
+    if retailer_list:
+        q = q.filter(models.Retailer.name.in_(retailer_list))
+    if category_list:
+        q = q.filter(models.Category.name.in_(category_list))
+    return q.filter(
+        models.Product.final_price >= min_price,
+        models.Product.final_price <= max_price,
+        models.Product.out_of_stock == False
+    )
+
+
+def ordered_query(q, keys, descending):
+    """Ordena por `keys` y agrega esas columnas a cada fila para armar el próximo cursor."""
+    return q.order_by(*pagination.order_by(keys, descending)).add_columns(*keys)
+
+
+def row_to_item(row):
+    (product_id, title, original_price, final_price, url, image, retail_category,
+     added_date, updated_date, category_id, retailer_id, retailer_name, category_name) = row[:len(LIST_COLUMNS)]
+    return {
+        "id": product_id,
+        "title": title,
+        "original_price": original_price,
+        "final_price": final_price,
+        "url": url,
+        "image": image,
+        "retail_category": retail_category,
+        "added_date": added_date,
+        "updated_date": updated_date,
+        "retailer": {"id": retailer_id, "name": retailer_name},
+        "category_id": category_id,
+        "category_name": category_name,
+    }
+
+
+def _json_default(value):
+    # Mismo formato que usa Pydantic para los datetime sin zona horaria
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} no es serializable")
+
+
+def dump_response(result):
+    return json.dumps(result, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
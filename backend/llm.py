@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+import httpx
+
+from llm_cache import cache_key, llm_cache
+
+# Cliente de DeepSeek compartido por los endpoints (main.py) y los scripts batch.
+# Una sola conexión persistente (sin handshake TLS por llamada), un tope de llamadas
+# simultáneas y reintentos con backoff dentro del tiempo total que da cada llamada.
+# Las respuestas pasan por la caché de llm_cache.py.
+DEEPSEEK_URL = "https://api.deepseek.com/v1/chat/completions"
+MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+MAX_CONCURRENCY = int(os.getenv("DEEPSEEK_MAX_CONCURRENCY", "4"))
+MAX_RETRIES = 3
+# 429 y errores del lado de DeepSeek: vale la pena reintentar
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_SECONDS = 1.0
+
+FENCE_START_RE = re.compile(r"^\s*```(?:json)?\s*")
+FENCE_END_RE = re.compile(r"\s*```\s*$")
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMNotConfigured(LLMError):
+    pass
+
+
+def parse_json(raw):
+    """Contenido de la respuesta -> JSON, sin los ```json que a veces agrega el modelo."""
+    cleaned = FENCE_END_RE.sub("", FENCE_START_RE.sub("", raw))
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        # Texto antes o después del JSON: se queda con la primera lista u objeto completo
+        match = re.search(r"(\[.*\]|\{.*\})", cleaned, re.DOTALL)
+        if not match:
+            raise LLMError(f"La respuesta no es JSON: {raw[:200]}")
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError as e:
+            raise LLMError(f"La respuesta no es JSON: {e}")
+
+
+class DeepSeekClient:
+    """Pool de conexiones asíncrono. Se crea en el primer uso dentro de cada event loop
+    (los scripts corren su propio asyncio.run); el del loop anterior se cierra al cambiar.
+    La caché (sqlite3, con espera si está bloqueada) se consulta en un thread, fuera del loop."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES, cache=llm_cache):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.cache = cache
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    async def _ensure_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            await self._close_previous(self._client, self._loop)
+            self._client = None
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+                headers={"Content-Type": "application/json"},
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    async def _close_previous(client, loop):
+        # Si su loop sigue corriendo (en otro thread) se cierra ahí; si ya terminó, desde este
+        try:
+            if loop is not None and loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            else:
+                await client.aclose()
+        except Exception as e:
+            print(f"⚠️ No se pudo cerrar el cliente anterior de DeepSeek: {e}")
+
+    async def chat(self, prompt, system, temperature=0.7, timeout=60.0, endpoint="otro", cache_ttl=None, parse=None):
+        """Texto de la respuesta (o `parse(texto)`). `timeout` es el total, incluida la espera
+        de los reintentos. `endpoint` agrupa las estadísticas de la caché; `cache_ttl` en segundos."""
+        key = cache_key(MODEL, system, prompt, temperature)
+        cached = await asyncio.to_thread(self.cache.get, key, endpoint) if self.cache else None
+        if cached is not None:
+            return parse(cached) if parse else cached
+
+        started = time.monotonic()
+        content, tokens = await self._complete(prompt, system, temperature, timeout)
+        result = parse(content) if parse else content
+        # Solo se guarda lo que se pudo usar (un JSON roto se vuelve a pedir)
+        if self.cache:
+            await asyncio.to_thread(
+                self.cache.set, key, endpoint, content, tokens, (time.monotonic() - started) * 1000, ttl=cache_ttl
+            )
+        return result
+
+    async def chat_json(self, prompt, system, temperature=0.7, timeout=60.0, endpoint="otro", cache_ttl=None):
+        return await self.chat(prompt, system, temperature, timeout, endpoint, cache_ttl, parse=parse_json)
+
+    async def _complete(self, prompt, system, temperature, timeout):
+        """(texto, tokens usados) de una llamada a la API, con reintentos."""
+        api_key = os.getenv("DEEPSEEK_API_KEY")
+        if not api_key:
+            raise LLMNotConfigured("DEEPSEEK_API_KEY not set")
+
+        client = await self._ensure_client()
+        payload = {
+            "model": MODEL,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": temperature,
+        }
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMError(f"DeepSeek no respondió en {timeout:.0f} segundos")
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    response = await client.post(
+                        DEEPSEEK_URL,
+                        headers={"Authorization": f"Bearer {api_key}"},
+                        json=payload,
+                        timeout=remaining,
+                    )
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    data = response.json()
+                    return data["choices"][0]["message"]["content"], data.get("usage", {}).get("total_tokens", 0)
+                error = LLMError(f"DeepSeek respondió {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
+            except httpx.TimeoutException:
+                raise LLMError(f"DeepSeek no respondió en {timeout:.0f} segundos")
+            except httpx.TransportError as e:
+                error = LLMError(f"Error de conexión con DeepSeek: {e}")
+            except (httpx.HTTPStatusError, KeyError, IndexError, ValueError) as e:
+                raise LLMError(f"Respuesta inválida de DeepSeek: {e}")
+
+            attempt += 1
+            delay = BACKOFF_SECONDS * 2 ** (attempt - 1) + random.uniform(0, BACKOFF_SECONDS)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                raise error
+            print(f"⚠️ {error}: reintento {attempt}/{self.max_retries} en {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+deepseek = DeepSeekClient()
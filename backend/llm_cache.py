@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Respuestas de DeepSeek guardadas por hash de (modelo, system, prompt, temperatura), en un
+# SQLite local compartido por la API y los scripts batch. Un prompt repetido (la misma
+# categorización para el mismo título, el mismo tweet educativo) no vuelve a pagar tokens
+# ni latencia. Las entradas vencen a los `ttl` segundos y, pasado el tope, se descartan las
+# menos usadas recientemente.
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"))
+DEFAULT_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+# Cada cuántas escrituras se borran las vencidas y las que sobran
+EVICT_EVERY = 50
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        endpoint TEXT,
+        content TEXT NOT NULL,
+        tokens INTEGER NOT NULL DEFAULT 0,
+        latency_ms REAL NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS responses_last_used_idx ON responses (last_used_at);
+    CREATE TABLE IF NOT EXISTS endpoint_stats (
+        endpoint TEXT PRIMARY KEY,
+        hits INTEGER NOT NULL DEFAULT 0,
+        misses INTEGER NOT NULL DEFAULT 0,
+        tokens_spent INTEGER NOT NULL DEFAULT 0,
+        tokens_saved INTEGER NOT NULL DEFAULT 0,
+        latency_spent_ms REAL NOT NULL DEFAULT 0,
+        latency_saved_ms REAL NOT NULL DEFAULT 0
+    );
+"""
+
+
+def cache_key(model, system, prompt, temperature):
+    # Espacios repetidos o al final no cambian el prompt
+    normalized = [model, " ".join(system.split()), " ".join(prompt.split()), round(float(temperature), 3)]
+    return hashlib.sha256(json.dumps(normalized, ensure_ascii=False).encode()).hexdigest()
+
+
+class LLMCache:
+    """Caché persistente; si el archivo no se puede usar, las llamadas siguen sin caché."""
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            # WAL: la API y un script batch pueden leer y escribir a la vez
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA_SQL)
+            self._conn = conn
+        return self._conn
+
+    def _failed(self, error):
+        logging.warning(f"Caché de LLM no disponible ({self.path}): {error}")
+
+    def get(self, key, endpoint):
+        """Contenido guardado o None. Un hit suma los tokens y la latencia que se ahorraron."""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT content, tokens, latency_ms FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                content, tokens, latency_ms = row
+                conn.execute("UPDATE responses SET hits = hits + 1, last_used_at = ? WHERE key = ?", (now, key))
+                self._record(conn, endpoint, hit=True, tokens=tokens, latency_ms=latency_ms)
+                return content
+        except sqlite3.Error as e:
+            self._failed(e)
+            return None
+
+    def set(self, key, endpoint, content, tokens, latency_ms, ttl=None):
+        now = time.time()
+        ttl = DEFAULT_TTL_SECONDS if ttl is None else ttl
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    """
+                    INSERT INTO responses (key, endpoint, content, tokens, latency_ms, created_at, expires_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET
+                        content = excluded.content, tokens = excluded.tokens, latency_ms = excluded.latency_ms,
+                        created_at = excluded.created_at, expires_at = excluded.expires_at, last_used_at = excluded.last_used_at
+                    """,
+                    (key, endpoint, content, tokens, latency_ms, now, now + ttl, now),
+                )
+                self._record(conn, endpoint, hit=False, tokens=tokens, latency_ms=latency_ms)
+                self._writes += 1
+                if self._writes % EVICT_EVERY == 0:
+                    self._evict(conn, now)
+        except sqlite3.Error as e:
+            self._failed(e)
+
+    def _record(self, conn, endpoint, hit, tokens, latency_ms):
+        conn.execute(
+            """
+            INSERT INTO endpoint_stats (endpoint, hits, misses, tokens_spent, tokens_saved, latency_spent_ms, latency_saved_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (endpoint) DO UPDATE SET
+                hits = hits + excluded.hits,
+                misses = misses + excluded.misses,
+                tokens_spent = tokens_spent + excluded.tokens_spent,
+                tokens_saved = tokens_saved + excluded.tokens_saved,
+                latency_spent_ms = latency_spent_ms + excluded.latency_spent_ms,
+                latency_saved_ms = latency_saved_ms + excluded.latency_saved_ms
+            """,
+            (endpoint, int(hit), int(not hit), 0 if hit else tokens, tokens if hit else 0,
+             0 if hit else latency_ms, latency_ms if hit else 0),
+        )
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def stats(self):
+        try:
+            with self._lock:
+                conn = self._connection()
+                entries, size = conn.execute(
+                    "SELECT count(*), coalesce(sum(length(content)), 0) FROM responses WHERE expires_at > ?", (time.time(),)
+                ).fetchone()
+                rows = conn.execute(
+                    "SELECT endpoint, hits, misses, tokens_spent, tokens_saved, latency_spent_ms, latency_saved_ms "
+                    "FROM endpoint_stats ORDER BY hits + misses DESC"
+                ).fetchall()
+        except sqlite3.Error as e:
+            self._failed(e)
+            entries, size, rows = 0, 0, []
+
+        endpoints = [
+            {
+                "endpoint": endpoint,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "tokens_spent": tokens_spent,
+                "tokens_saved": tokens_saved,
+                "latency_spent_ms": round(latency_spent_ms, 1),
+                "latency_saved_ms": round(latency_saved_ms, 1),
+            }
+            for endpoint, hits, misses, tokens_spent, tokens_saved, latency_spent_ms, latency_saved_ms in rows
+        ]
+        hits = sum(e["hits"] for e in endpoints)
+        requests = hits + sum(e["misses"] for e in endpoints)
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_bytes": size,
+            "max_entries": self.max_entries,
+            "requests": requests,
+            "hits": hits,
+            "hit_ratio": round(hits / requests, 4) if requests else 0.0,
+            "tokens_saved": sum(e["tokens_saved"] for e in endpoints),
+            "latency_saved_ms": round(sum(e["latency_saved_ms"] for e in endpoints), 1),
+            "endpoints": endpoints,
+        }
+
+
+llm_cache = LLMCache()
@@ -4,13 +4,23 @@ from database import SessionLocal, engine, Base
 from models import Base, Category, RetailerCategory
 import models
 import schemas
+from search import ProductSearch
+import pagination
+import counting
+import response_cache
+from facets import product_facets
+import listing
+import llm
+from llm_cache import llm_cache
+import category_classifier
+import category_mapping
 from typing import List
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
-from sqlalchemy import func
+from sqlalchemy import func, text
 import logging
 from sqlalchemy.orm import joinedload
 import time
@@ -19,10 +29,12 @@ from datetime import datetime, timedelta
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi import Request
 from functools import wraps
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 import inspect
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -40,17 +52,25 @@ logging.basicConfig()
 # Cargar las variables de entorno desde el archivo .env
 load_dotenv()
 
+# Clientes HTTP compartidos: se crean al arrancar la app y se cierran al apagarla
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Páginas de los retailers para las descripciones de /products/{id}: un pool para todos los requests
+    app.state.page_client = httpx.AsyncClient(timeout=10.0)
+    try:
+        yield
+    finally:
+        await app.state.page_client.aclose()
+        await llm.deepseek.aclose()
+
 # Cargar las variables de entorno desde el archivo .env
-app = FastAPI(debug=False)
+app = FastAPI(debug=False, lifespan=lifespan)
 
 # Configurar rate limiting
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(429, _rate_limit_exceeded_handler)
 
-# Crear las tablas en la base de datos (si no existen)
-Base.metadata.create_all(bind=engine)
-
 # Configurar CORS para desarrollo (ajusta en producción)
 app.add_middleware(
     CORSMiddleware,
@@ -125,6 +145,22 @@ app.add_middleware(ExceptionHandlerMiddleware)
 app.add_middleware(FixProtoHeaderMiddleware)
 app.add_middleware(SecureHeadersMiddleware)
 
+# Los tweets se regeneran más seguido que las clasificaciones (ver llm_cache.py)
+TWEETS_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Llamada a DeepSeek desde un endpoint: los errores del cliente pasan a HTTPException
+async def ask_deepseek(prompt, system, endpoint, temperature=0.7, timeout=60.0, as_json=True,
+                       cache_ttl=TWEETS_CACHE_TTL_SECONDS, error_detail="Error al consultar DeepSeek"):
+    try:
+        if as_json:
+            return await llm.deepseek.chat_json(prompt, system, temperature, timeout, endpoint, cache_ttl)
+        return await llm.deepseek.chat(prompt, system, temperature, timeout, endpoint, cache_ttl)
+    except llm.LLMNotConfigured as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except llm.LLMError as e:
+        print("❌ Error al consultar DeepSeek:", e)
+        raise HTTPException(status_code=500, detail=error_detail)
+
 
 # Endpoint para obtener productos, con opción de búsqueda por título
 @app.get("/products", response_model=schemas.ProductListResponse)
@@ -137,66 +173,67 @@ def read_products(
     maxPrice: float = 99999999.0,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str = "",
+    facets: bool = False,
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
     print(f"Request a /products - query: {query}, page: {page}, limit: {limit}")
     print("sort:", sort)    
 
     start_time = time.perf_counter()
-    q = db.query(models.Product).options(
-        joinedload(models.Product.retailer),
-        joinedload(models.Product.category_rel)
-    )
+    cache_key = response_cache.products_key(query, sort, retailers, categories, minPrice, maxPrice, page, limit, cursor, facets)
+    version = response_cache.products_version.current(db)
+    payload, source = response_cache.products_cache.get(version, cache_key)
+    if payload is None:
+        result = query_products(db, version, query, sort, retailers, categories, minPrice, maxPrice, page, limit, cursor, facets)
+        payload = listing.dump_response(result)
+        response_cache.products_cache.set(version, cache_key, payload)
 
-    if query:
-        q = q.filter(models.Product.title.ilike(f"%{query}%"))
+    duration = time.perf_counter() - start_time
+    response_cache.products_cache.record(cache_key, source is not None, duration * 1000)
+    print(f"⏱️ Tiempo total de ejecución /products: {duration:.4f} segundos ({source or 'sin caché'})")
 
-    if retailers:
-        retailer_list = [r.strip() for r in retailers.split(",")]
-        q = q.join(models.Retailer).filter(models.Retailer.name.in_(retailer_list))
+    return Response(content=payload, media_type="application/json", headers={"X-Cache": source.upper() if source else "MISS"})
 
-    if categories:
-        category_list = [c.strip() for c in categories.split("|")]
-        q = q.join(models.Category, isouter=True).filter(models.Category.name.in_(category_list))
 
-    q = q.filter(
-        models.Product.final_price >= minPrice, 
-        models.Product.final_price <= maxPrice,
-        models.Product.out_of_stock == False
-    )
-
-    if sort == "price_asc":
-        q = q.order_by(models.Product.final_price.asc())
-    elif sort == "price_desc":
-        q = q.order_by(models.Product.final_price.desc())
-    elif sort == "name_asc":
-        q = q.order_by(models.Product.title.asc())
-    elif sort == "name_desc":
-        q = q.order_by(models.Product.title.desc())
-    elif sort == "retailer_asc":
-        q = q.join(models.Retailer).order_by(models.Retailer.name.asc())
-    elif sort == "retailer_desc":
-        q = q.join(models.Retailer).order_by(models.Retailer.name.desc())
-    elif sort == "date_asc":
-        q = q.order_by(models.Product.added_date.asc())
-    elif sort == "date_desc":
-        q = q.order_by(models.Product.added_date.desc())
-    else:
-        q = q.order_by(models.Product.updated_date.desc(), models.Product.id.desc())
+def query_products(db, version, query, sort, retailers, categories, minPrice, maxPrice, page, limit, cursor, with_facets=False):
+    offset = (page - 1) * limit
+    search = ProductSearch(query)
+    retailer_list = [r.strip() for r in retailers.split(",")] if retailers else []
+    category_list = [c.strip() for c in categories.split("|")] if categories else []
+    q = listing.filtered_query(db, search, retailer_list, category_list, minPrice, maxPrice)
 
-    total = q.count()
+    total, total_exact = counting.count_products(db, q, (version, search.query, retailers, categories, minPrice, maxPrice))
 
-    products = q.offset(offset).limit(limit).all()
+    keys, descending = pagination.sort_keys(sort, search)
+    q = listing.ordered_query(q, keys, descending)
 
-    duration = time.perf_counter() - start_time
-    print(f"⏱️ Tiempo total de ejecución /products: {duration:.4f} segundos")
+    # Con cursor se sigue desde la última fila de la página anterior (no se recorren las salteadas);
+    # `page` queda solo como dato para el cliente
+    if cursor:
+        try:
+            values = pagination.decode_cursor(cursor, sort, keys)
+        except pagination.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Un rango por tramo (valores, NULL): solo se pasa al siguiente si la página no se llenó
+        rows = []
+        for condition in pagination.product_cursor_phases(keys, descending, values):
+            rows += q.filter(condition).limit(limit + 1 - len(rows)).all()
+            if len(rows) > limit:
+                break
+    else:
+        rows = q.offset(offset).limit(limit + 1).all()
+    products = [listing.row_to_item(row) for row in rows[:limit]]
+    next_cursor = pagination.encode_cursor(sort, rows[limit - 1][len(listing.LIST_COLUMNS):]) if len(rows) > limit else None
 
     return {
         "data": products,
         "total": total,
+        "total_exact": total_exact,
         "page": page,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "facets": product_facets(db, version, search, retailer_list, category_list, minPrice, maxPrice) if with_facets else None
     }
 
 
@@ -222,15 +259,20 @@ def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_
 def get_unmapped_retailer_categories(request: Request, db: Session = Depends(get_db)):
     return db.query(RetailerCategory).filter(RetailerCategory.category_id == None).all()
 
-@app.patch("/retailer-categories/{rc_id}/map", response_model=schemas.SimpleMessageResponse)
+@app.patch("/retailer-categories/{rc_id}/map", response_model=schemas.MapCategoryResponse)
 @admin_required
 def map_retailer_category(request: Request, rc_id: int, data: schemas.MapCategoryRequest, db: Session = Depends(get_db)):
     rc = db.query(RetailerCategory).filter(RetailerCategory.id == rc_id).first()
     if not rc:
         raise HTTPException(status_code=404, detail="Retailer category not found")
+    if not db.query(Category.id).filter(Category.id == data.category_id).first():
+        raise HTTPException(status_code=404, detail="Category not found")
     rc.category_id = data.category_id
+    db.flush()
+    # Los productos de esa categoría del retailer pasan a la nueva, en la misma transacción
+    updated = category_mapping.propagate(db, [rc.id])
     db.commit()
-    return {"message": "Mapped successfully"}
+    return {"message": "Mapped successfully", "updated_products": updated}
 
 @app.get("/products/uncategorized", response_model=List[schemas.ProductBase])
 @admin_required
@@ -261,13 +303,16 @@ def assign_product_category(request: Request, product_id: int, data: schemas.Map
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    product.category_id = data.category_id
+    if product.category_id != data.category_id:
+        product.category_id = data.category_id
+        # Invalida las respuestas de /products en caché, que muestran y filtran por categoría
+        db.execute(text(category_mapping.BUMP_VERSION_SQL))
     db.commit()
     return {"message": "Category assigned successfully"}
 
 @app.post("/products/{product_id}/suggest-category", response_model=schemas.SuggestedCategoryResponse)
 @admin_required
-def suggest_category(request: Request, product_id: int, db: Session = Depends(get_db)):
+async def suggest_category(request: Request, product_id: int, db: Session = Depends(get_db)):
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -275,6 +320,14 @@ def suggest_category(request: Request, product_id: int, db: Session = Depends(ge
     categories = db.query(models.Category).all()
     category_names = [c.name for c in categories]
 
+    # Primero el clasificador local (train-category-classifier.py); DeepSeek solo si no está
+    # entrenado o no está seguro
+    classifier = category_classifier.get_classifier()
+    if classifier is not None:
+        [(category_id, confidence)] = classifier.predict([product.title], [product.retail_category])
+        if confidence >= classifier.min_confidence and any(c.id == category_id for c in categories):
+            return {"suggested_category_id": category_id, "confidence": round(confidence, 4), "source": "classifier"}
+
     prompt = (
         f"Dado el siguiente producto:\n\n"
         f"Título: {product.title}\n"
@@ -282,41 +335,19 @@ def suggest_category(request: Request, product_id: int, db: Session = Depends(ge
         f"¿A cuál de estas categorías pertenece mejor este producto? Respondé solo con el nombre exacto de la categoría."
     )
 
-    deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not deepseek_api_key:
-        raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-    try:
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": "Sos un clasificador de productos."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.2
-            },
-            timeout=15.0
-        )
-        response.raise_for_status()
-        result = response.json()
-        answer = result["choices"][0]["message"]["content"].strip()
-
-    except Exception as e:
-        print("Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
+    answer = await ask_deepseek(
+        prompt, "Sos un clasificador de productos.", "/products/{id}/suggest-category",
+        # cache_ttl=None: el vencimiento por defecto de la caché, la categoría de un título no cambia
+        temperature=0.2, timeout=15.0, as_json=False, cache_ttl=None,
+    )
+    answer = answer.strip()
 
     matched_category = next((c for c in categories if c.name.lower() == answer.lower()), None)
 
     if matched_category:
-        return {"suggested_category_id": matched_category.id}
+        return {"suggested_category_id": matched_category.id, "source": "deepseek"}
     else:
-        return {"suggested_category_id": None, "suggested_category_name": answer}
+        return {"suggested_category_id": None, "suggested_category_name": answer, "source": "deepseek"}
     
 @app.get("/retailers/", response_model=list[schemas.RetailerBase])
 def get_retailers(db: Session = Depends(get_db)):
@@ -326,84 +357,40 @@ from sqlalchemy import distinct
 
 @app.get("/tweets/suggestions")
 @admin_required
-def get_tweet_suggestions(request: Request, db: Session = Depends(get_db)):
-    from collections import defaultdict
-    import os
-    import httpx
-    import json
+async def get_tweet_suggestions(request: Request, db: Session = Depends(get_db)):
     import random
-    import re
-
-    # SELECT title AS match_key
-    # FROM products
-    # GROUP BY title
-    # HAVING COUNT(DISTINCT retailer_id) > 1;
-     # Subquery 1: títulos exactos repetidos entre retailers
-    subquery_titles = (
-        db.query(models.Product.title.label("match_key"))
-        .group_by(models.Product.title)
-        .having(func.count(distinct(models.Product.retailer_id)) > 1)
-    )
-
-    # select searchable_term, count(*) from products where searchable_term is not null group by searchable_term having count(distinct(retailer_id)) > 1
-    # Subquery 2: searchable_terms repetidos entre retailers
-    subquery_terms = (
-        db.query(models.Product.searchable_term.label("match_key"))
-        .filter(models.Product.searchable_term != None)
-        .group_by(models.Product.searchable_term)
-        .having(func.count(distinct(models.Product.retailer_id)) > 1)
-    )
 
-    # Unión de ambas subqueries (simulada en Python ya que SQLAlchemy no lo hace directo)
-    union_keys = (
-        subquery_titles.union(subquery_terms)
-        .order_by(func.random())
-        .limit(20)
-        .subquery()
-    )
-
-     # Traer productos que coincidan por match_key
-    productos = (
-        db.query(models.Product)
-        .filter(models.Product.out_of_stock == False)
-        .join(union_keys, (models.Product.title == union_keys.c.match_key) | (models.Product.searchable_term == union_keys.c.match_key))
-        .options(joinedload(models.Product.retailer))
-        .order_by(models.Product.searchable_term.asc().nulls_last(), models.Product.title.asc(), models.Product.final_price.asc())
+    # Paso 1: las oportunidades con más diferencia porcentual (arbitrage_opportunities, las
+    # mantienen los scrapers) y de esas, 3 al azar para que los tweets varíen
+    Opportunity = models.ArbitrageOpportunity
+    oportunidades = (
+        db.query(Opportunity)
+        .options(
+            joinedload(Opportunity.cheapest).joinedload(models.Product.retailer),
+            joinedload(Opportunity.most_expensive).joinedload(models.Product.retailer),
+        )
+        .filter(Opportunity.spread >= 5000)
+        .order_by(Opportunity.spread_pct.desc(), Opportunity.canonical_product_id.desc())
+        .limit(30)
         .all()
     )
 
-    # Agrupar por match_key (title o searchable_term)
-    grouped = defaultdict(list)
-    for p in productos:
-        key = p.searchable_term or p.title
-        grouped[key].append(p)
-
     casos = []
-    for match_key, items in grouped.items():
-        if len(items) < 2:
-            continue
-        sorted_items = sorted(items, key=lambda x: x.final_price)
-        barato = sorted_items[0]
-        caro = sorted_items[-1]
-        diff = caro.final_price - barato.final_price
-        if diff < 5000:
-            continue
-
+    for oportunidad in random.sample(oportunidades, min(3, len(oportunidades))):
+        barato = oportunidad.cheapest
+        caro = oportunidad.most_expensive
         casos.append({
             "case": len(casos)+1,
-            "match_key": match_key,
+            "match_key": oportunidad.match_key,
             "title": barato.title,
             "retailer_barato": barato.retailer.name,
             "precio_barato": int(barato.final_price),
             "retailer_caro": caro.retailer.name,
             "precio_caro": int(caro.final_price),
-            "diff": int(diff),
+            "diff": int(oportunidad.spread),
             "url": barato.url  # ✅ agregar la URL del más barato
         })
 
-        if len(casos) >= 3:
-            break
-
     if not casos:
         return []
 
@@ -434,41 +421,7 @@ def get_tweet_suggestions(request: Request, db: Session = Depends(get_db)):
 
     print("Prompt para DeepSeek:", prompt)
 
-    deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not deepseek_api_key:
-        raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-    try:
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager experto en ofertas de productos." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-
-        print("Respuesta de DeepSeek:", raw)
-
-        # Eliminar backticks si vienen
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
+    parsed = await ask_deepseek(prompt, "Sos un community manager experto en ofertas de productos.", "/tweets/suggestions")
 
     # Paso 3: combinar metadata del caso con tweets
     resultados = []
@@ -485,12 +438,7 @@ def get_tweet_suggestions(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/tweets/discounts")
 @admin_required
-def get_discount_tweets(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-
+async def get_discount_tweets(request: Request, db: Session = Depends(get_db)):
     # Buscar productos con al menos 25% de descuento (ajustable)
     productos = (
         db.query(models.Product)
@@ -542,39 +490,7 @@ def get_discount_tweets(request: Request, db: Session = Depends(get_db)):
             "url": p.url  # ✅ Agregado
         })
 
-    try:
-        deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not deepseek_api_key:
-            raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer " + deepseek_api_key,
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager experto en ofertas de productos." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-
-        # limpiar markdown
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
+    parsed = await ask_deepseek(prompt, "Sos un community manager experto en ofertas de productos.", "/tweets/discounts")
 
     # combinar datos de producto con los tweets
     resultados = []
@@ -591,12 +507,7 @@ def get_discount_tweets(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/tweets/top-discounts")
 @admin_required
-def get_top_discount_tweets(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-
+async def get_top_discount_tweets(request: Request, db: Session = Depends(get_db)):
     productos = (
         db.query(models.Product)
         .join(models.Retailer)
@@ -630,53 +541,17 @@ def get_top_discount_tweets(request: Request, db: Session = Depends(get_db)):
         pct = round(100 * (1 - float(p.final_price) / float(p.original_price)))
         prompt += f"- {p.title} -{pct}%\n  URL: {p.url}\n"
 
-    deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not deepseek_api_key:
-        raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-    try:
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager experto en ecommerce y descuentos." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
-
-    return parsed
+    return await ask_deepseek(prompt, "Sos un community manager experto en ecommerce y descuentos.", "/tweets/top-discounts")
 
 
 @app.get("/tweets/historical-difference")
 @admin_required
-def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-    from sqlalchemy import desc
-
-    # Encontrar el producto con mayor diferencia absoluta histórica (original - final)
+async def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(get_db)):
+    # Encontrar el producto con mayor diferencia absoluta histórica (original - final),
+    # ya calculada por producto en product_price_stats
     best = (
         db.query(
-            models.HistoricalPrice,
+            models.ProductPriceStats,
             models.Product.title,
             models.Product.url,
             models.Product.image,
@@ -684,15 +559,13 @@ def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(ge
             models.Product.original_price,
             models.Product.final_price
         )
-        .join(models.Product, models.Product.id == models.HistoricalPrice.product_id)
+        .join(models.Product, models.Product.id == models.ProductPriceStats.product_id)
         .join(models.Retailer, models.Retailer.id == models.Product.retailer_id)
         .filter(
-            models.HistoricalPrice.original_price != None,
-            models.HistoricalPrice.final_price != None,
-            models.HistoricalPrice.original_price > models.HistoricalPrice.final_price,
+            models.ProductPriceStats.max_discount > 0,
             models.Product.out_of_stock == False
         )
-        .order_by((models.HistoricalPrice.original_price - models.HistoricalPrice.final_price).desc())
+        .order_by(models.ProductPriceStats.max_discount.desc())
         .limit(1)
         .first()
     )
@@ -700,9 +573,10 @@ def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(ge
     if not best:
         return []
 
-    h, title, url, image, retailer, orig, final = best
-    diff = round(h.original_price - h.final_price)
-    pct = round(100 * (1 - h.final_price / h.original_price))
+    stats, title, url, image, retailer, orig, final = best
+    best_original, best_final = stats.max_discount_original_price, stats.max_discount_final_price
+    diff = round(best_original - best_final)
+    pct = round(100 * (1 - best_final / best_original))
 
     prompt = (
         "Generá 3 tweets creativos sobre un producto con el mayor descuento histórico registrado en nuestra base de datos. "
@@ -711,51 +585,20 @@ def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(ge
         "Respondé en JSON con formato: {\"tweets\": [\"...\", \"...\", \"...\"]}\n\n"
         f"Producto: {title}\n"
         f"Retailer: {retailer}\n"
-        f"Precio original: ${int(h.original_price)}\n"
-        f"Precio más bajo registrado: ${int(h.final_price)}\n"
+        f"Precio original: ${int(best_original)}\n"
+        f"Precio más bajo registrado: ${int(best_final)}\n"
         f"Diferencia: ${diff}\n"
         f"Descuento: {pct}%\n"
         f"URL: {url}\n"  # ✅ Agregado
     )
 
-    try:
-        deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not deepseek_api_key:
-            raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager que crea contenido viral." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
+    parsed = await ask_deepseek(prompt, "Sos un community manager que crea contenido viral.", "/tweets/historical-difference")
 
     return {
         "title": title,
         "retailer": retailer,
-        "original_price": int(h.original_price),
-        "final_price": int(h.final_price),
+        "original_price": int(best_original),
+        "final_price": int(best_final),
         "diff": diff,
         "discount_pct": pct,
         "url": url,  # ✅ Agregado a la respuesta por si lo querés mostrar también en frontend
@@ -765,63 +608,29 @@ def get_biggest_historical_drop_tweet(request: Request, db: Session = Depends(ge
 
 @app.get("/tweets/weekly-drops")
 @admin_required
-def get_weekly_drop_tweets(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-
-    three_days_ago = datetime.utcnow() - timedelta(days=3)
+async def get_weekly_drop_tweets(request: Request, db: Session = Depends(get_db)):
     one_day_ago = datetime.utcnow() - timedelta(days=1)
 
-    old_prices_subq = (
-        db.query(
-            models.HistoricalPrice.product_id,
-            func.max(models.HistoricalPrice.date_recorded).label("old_date")
-        )
-        .filter(models.HistoricalPrice.date_recorded < three_days_ago)
-        .group_by(models.HistoricalPrice.product_id)
-        .subquery()
-    )
-
-    new_prices_subq = (
-        db.query(
-            models.HistoricalPrice.product_id,
-            func.max(models.HistoricalPrice.date_recorded).label("new_date")
-        )
-        .filter(models.HistoricalPrice.date_recorded > one_day_ago)
-        .group_by(models.HistoricalPrice.product_id)
-        .subquery()
-    )
-
-    old_prices = (
-        db.query(models.HistoricalPrice)
-        .join(old_prices_subq, (models.HistoricalPrice.product_id == old_prices_subq.c.product_id) & (models.HistoricalPrice.date_recorded == old_prices_subq.c.old_date))
-        .subquery()
-    )
-
-    new_prices = (
-        db.query(models.HistoricalPrice)
-        .join(new_prices_subq, (models.HistoricalPrice.product_id == new_prices_subq.c.product_id) & (models.HistoricalPrice.date_recorded == new_prices_subq.c.new_date))
-        .subquery()
-    )
+    # Productos que cambiaron en el último día y hoy están más baratos que hace 3 días.
+    # Solo lee product_price_stats: los precios de hace N días los actualiza refresh-price-windows.py
 
+    stats = models.ProductPriceStats
     drops = (
         db.query(
             models.Product.title,
             models.Product.retailer_id,
             models.Product.url,  # ✅ Agregamos la URL
-            old_prices.c.final_price.label("old_price"),
-            new_prices.c.final_price.label("new_price"),
-            (old_prices.c.final_price - new_prices.c.final_price).label("diff"),
+            stats.price_3d_ago.label("old_price"),
+            stats.current_price.label("new_price"),
+            (stats.price_3d_ago - stats.current_price).label("diff"),
             models.Retailer.name.label("retailer")
         )
-        .join(old_prices, models.Product.id == old_prices.c.product_id)
-        .join(new_prices, models.Product.id == new_prices.c.product_id)
+        .join(stats, stats.product_id == models.Product.id)
         .join(models.Retailer, models.Retailer.id == models.Product.retailer_id)
-        .filter(old_prices.c.final_price > new_prices.c.final_price)
+        .filter(stats.last_change_at > one_day_ago)
+        .filter(stats.price_3d_ago > stats.current_price)
         .filter(models.Product.out_of_stock == False)
-        .order_by((old_prices.c.final_price - new_prices.c.final_price).desc())
+        .order_by((stats.price_3d_ago - stats.current_price).desc())
         .limit(5)
         .all()
     )
@@ -855,38 +664,10 @@ def get_weekly_drop_tweets(request: Request, db: Session = Depends(get_db)):
             "url": d.url  # ✅ también la mantenemos en la respuesta
         })
 
-    try:
-        deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not deepseek_api_key:
-            raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager especializado en ecommerce." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error consultando DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al generar tweets con DeepSeek")
+    parsed = await ask_deepseek(
+        prompt, "Sos un community manager especializado en ecommerce.", "/tweets/weekly-drops",
+        error_detail="Error al generar tweets con DeepSeek",
+    )
 
     resultados = []
     for item in result_data:
@@ -901,12 +682,7 @@ def get_weekly_drop_tweets(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/tweets/educational")
 @admin_required
-def get_educational_tweets(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-
+async def get_educational_tweets(request: Request, db: Session = Depends(get_db)):
     prompt = (
         "Generá 2 tweets educativos sobre el concepto de arbitraje de precios entre retailers. "
         "El objetivo es que el usuario aprenda que si un producto está más barato en otro retailer, puede aprovechar la diferencia. "
@@ -915,46 +691,14 @@ def get_educational_tweets(request: Request, db: Session = Depends(get_db)):
         "[\"tweet 1\", \"tweet 2\"]\n\n"
     )
 
-    try:
-        deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not deepseek_api_key:
-            raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un educador financiero con enfoque en ecommerce." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-        tweets = json.loads(raw)
-        return tweets
-
-    except Exception as e:
-        print("❌ Error al consultar DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al generar tweets educativos")
+    return await ask_deepseek(
+        prompt, "Sos un educador financiero con enfoque en ecommerce.", "/tweets/educational",
+        error_detail="Error al generar tweets educativos",
+    )
 
 @app.get("/tweets/polls")
 @admin_required
-def get_poll_tweet_ideas(request: Request, db: Session = Depends(get_db)):
-    import os
-    import httpx
-    import json
-    import re
-
+async def get_poll_tweet_ideas(request: Request, db: Session = Depends(get_db)):
     # Obtener 4 productos con descuento (como opciones del poll)
     productos = (
         db.query(models.Product)
@@ -988,39 +732,7 @@ def get_poll_tweet_ideas(request: Request, db: Session = Depends(get_db)):
         prompt += f"- {p.title} ({p.retailer.name}): ${int(p.final_price)} (-{pct}%)\n"
         opciones.append(p.title)
 
-    try:
-        deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not deepseek_api_key:
-            raise HTTPException(status_code=500, detail="DEEPSEEK_API_KEY not set")
-
-        response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {deepseek_api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    { "role": "system", "content": "Sos un community manager creativo especializado en ecommerce." },
-                    { "role": "user", "content": prompt }
-                ],
-                "temperature": 0.7
-            },
-            timeout=60.0
-        )
-        response.raise_for_status()
-        raw = response.json()["choices"][0]["message"]["content"]
-
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-        parsed = json.loads(raw)
-
-    except Exception as e:
-        print("❌ Error al generar encuesta con DeepSeek:", e)
-        raise HTTPException(status_code=500, detail="Error al consultar DeepSeek")
-
-    return parsed
+    return await ask_deepseek(prompt, "Sos un community manager creativo especializado en ecommerce.", "/tweets/polls")
 
 @app.post("/tweets/post")
 @admin_required
@@ -1059,15 +771,30 @@ def post_tweet(request: Request, payload: dict):
 
 from bs4 import BeautifulSoup
 
-@app.get("/products/{product_id}", response_model=schemas.ProductBase)
-def get_product_with_description(product_id: int, db: Session = Depends(get_db)):
-    product = (
+def load_product_detail(db, product_id):
+    return (
         db.query(models.Product)
-        .options(joinedload(models.Product.retailer), joinedload(models.Product.category_rel))
+        .options(
+            joinedload(models.Product.retailer),
+            joinedload(models.Product.category_rel),
+            joinedload(models.Product.price_stats),
+        )
         .filter(models.Product.id == product_id)
         .first()
     )
 
+def save_ai_description(db, product, description):
+    product.ai_description = description
+    db.commit()
+    # El commit expira el producto: se arma la respuesta acá, donde se puede volver a leer
+    return schemas.ProductDetail.model_validate(product)
+
+# Async por la página del retailer y DeepSeek; la Session (sincrónica) corre en el threadpool
+# para no frenar el event loop mientras tanto
+@app.get("/products/{product_id}", response_model=schemas.ProductDetail)
+async def get_product_with_description(request: Request, product_id: int, db: Session = Depends(get_db)):
+    product = await run_in_threadpool(load_product_detail, db, product_id)
+
     if not product:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
 
@@ -1077,7 +804,7 @@ def get_product_with_description(product_id: int, db: Session = Depends(get_db))
     # Intentar obtener HTML de la página del retailer
     page_content = ""
     try:
-        response = httpx.get(product.url, timeout=10.0)
+        response = await request.app.state.page_client.get(product.url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
         page_content = soup.get_text(separator=" ", strip=True)
@@ -1096,27 +823,11 @@ def get_product_with_description(product_id: int, db: Session = Depends(get_db))
     )
 
     try:
-        ds_response = httpx.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {os.getenv('DEEPSEEK_API_KEY')}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": "Sos un copywriter experto en ecommerce."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7
-            },
-            timeout=20.0
+        description = await llm.deepseek.chat(
+            prompt, "Sos un copywriter experto en ecommerce.", timeout=20.0, endpoint="/products/{id}"
         )
-        ds_response.raise_for_status()
-        description = ds_response.json()["choices"][0]["message"]["content"].strip()
-        product.ai_description = html.escape(description)
-        db.commit()
-    except Exception as e:
+        return await run_in_threadpool(save_ai_description, db, product, html.escape(description.strip()))
+    except llm.LLMError as e:
         print("❌ DeepSeek falló:", e)
 
     return product
@@ -1148,7 +859,7 @@ def get_admin_stats(request: Request, db: Session = Depends(get_db)):
     return {
         "total_products": db.query(models.Product).count(),
         "uncategorized_products": db.query(models.Product).filter(models.Product.category_id == None).count(),
-        "products_with_history": db.query(models.HistoricalPrice.product_id).distinct().count(),
+        "products_with_history": db.query(models.ProductPriceStats).filter(models.ProductPriceStats.last_change_at != None).count(),
         "products_with_searchable_term": db.query(models.Product).filter(models.Product.searchable_term != None).count(),
         "total_retailers": db.query(models.Retailer).count(),
         "total_categories": db.query(models.Category).count(),
@@ -1171,6 +882,19 @@ def get_admin_stats(request: Request, db: Session = Depends(get_db)):
             ).count(),
     }
 
+@app.get("/admin/cache-stats", response_model=schemas.CacheStats)
+@admin_required
+def get_cache_stats(request: Request, db: Session = Depends(get_db)):
+    return {
+        "data_version": response_cache.products_version.current(db),
+        **response_cache.products_cache.stats(),
+    }
+
+@app.get("/admin/llm-cache-stats", response_model=schemas.LLMCacheStats)
+@admin_required
+def get_llm_cache_stats(request: Request):
+    return llm_cache.stats()
+
 @app.get("/products/{product_id}/similar", response_model=List[schemas.ProductBase])
 def get_similar_products(product_id: int, db: Session = Depends(get_db)):
     product = (
@@ -1185,9 +909,23 @@ def get_similar_products(product_id: int, db: Session = Depends(get_db)):
 
     similares = []
 
-    # 1. Buscar por searchable_term
-    if product.searchable_term:
+    # 1. El mismo producto en otros retailers (matching.py)
+    if product.canonical_product_id is not None:
         similares = (
+            db.query(models.Product)
+            .filter(
+                models.Product.canonical_product_id == product.canonical_product_id,
+                models.Product.id != product.id,
+                models.Product.out_of_stock == False
+            )
+            .order_by(models.Product.final_price.asc())
+            .limit(6)
+            .all()
+        )
+
+    # 2. Buscar por searchable_term
+    if len(similares) < 6 and product.searchable_term:
+        por_termino = (
             db.query(models.Product)
             .filter(
                 models.Product.searchable_term == product.searchable_term,
@@ -1198,8 +936,10 @@ def get_similar_products(product_id: int, db: Session = Depends(get_db)):
             .limit(6)
             .all()
         )
+        ids_ya_incluidos = {p.id for p in similares}
+        similares += [p for p in por_termino if p.id not in ids_ya_incluidos][:6 - len(similares)]
 
-    # 2. Si no hay suficientes, usar la categoría
+    # 3. Si no hay suficientes, usar la categoría
     if len(similares) < 6 and product.category_id is not None:
         categoria_similares = (
             db.query(models.Product)
@@ -1219,6 +959,42 @@ def get_similar_products(product_id: int, db: Session = Depends(get_db)):
 
     return similares
 
+# Mismo producto más barato en un retailer que en otro (tabla arbitrage_opportunities)
+@app.get("/arbitrage", response_model=schemas.ArbitrageResponse)
+def read_arbitrage(
+    sort: str = Query("spread_pct", pattern="^(spread|spread_pct)$"),
+    min_spread: float = Query(0.0, ge=0),
+    min_spread_pct: float = Query(0.0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = "",
+    db: Session = Depends(get_db)
+):
+    Opportunity = models.ArbitrageOpportunity
+    keys = pagination.ARBITRAGE_SORTS[sort]
+    q = (
+        db.query(Opportunity)
+        .options(
+            joinedload(Opportunity.cheapest).joinedload(models.Product.retailer),
+            joinedload(Opportunity.most_expensive).joinedload(models.Product.retailer),
+        )
+        .filter(Opportunity.spread >= min_spread, Opportunity.spread_pct >= min_spread_pct)
+        .order_by(*pagination.order_by(keys, True))
+    )
+    if cursor:
+        try:
+            values = pagination.decode_cursor(cursor, sort, keys)
+        except pagination.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        q = q.filter(pagination.after_cursor(keys, True, values))
+
+    rows = q.limit(limit + 1).all()
+    last = rows[limit - 1] if len(rows) > limit else None
+    return {
+        "data": rows[:limit],
+        "limit": limit,
+        "next_cursor": pagination.encode_cursor(sort, [getattr(last, key.key) for key in keys]) if last else None,
+    }
+
 @app.post("/admin/login-check", response_model=schemas.SimpleOKResponse)
 @limiter.limit("5/minute")
 def check_admin_login(data: schemas.AdminLoginRequest, request: Request = None):
@@ -0,0 +1,102 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+
+from database import engine
+
+# Particiones mensuales de historical_prices (migración 0005).
+#   list                     meses, filas estimadas y tamaño de cada partición
+#   ensure [--months-ahead]  crea las de este mes y los siguientes (corre todos los días en
+#                            .github/workflows/maintain-price-tables.yml)
+#   archive --keep-months N  saca de la tabla los meses más viejos que N: pasan al schema `archive`
+#                            (para hacer pg_dump y borrarlos cuando se quiera) o se borran con --drop
+ARCHIVE_SCHEMA = "archive"
+# ensure y archive hacen DDL sobre historical_prices: dos a la vez se esperan en vez de chocar
+LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('historical_prices_partitions'))"
+
+PARTITIONS_SQL = """
+    SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid)
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'historical_prices'::regclass
+    ORDER BY c.relname
+"""
+
+
+def partition_month(name):
+    """historical_prices_2025_03 -> date(2025, 3, 1); None para la default."""
+    try:
+        year, month = name.rsplit("_", 2)[-2:]
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def months_before(day, months):
+    index = day.year * 12 + day.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def list_partitions(conn):
+    rows = conn.execute(text(PARTITIONS_SQL)).all()
+    print(f"{'partición':<30}{'filas (est.)':>14}{'tamaño':>12}")
+    for name, tuples, size in rows:
+        print(f"{name:<30}{max(tuples, 0):>14}{size / 1024 / 1024:>10.1f}MB")
+
+
+def ensure(conn, months_ahead):
+    names = conn.execute(text("SELECT historical_prices_ensure_partitions(:months)"), {"months": months_ahead}).scalars().all()
+    print(f"✅ Particiones hasta {names[-1] if names else '-'}")
+
+
+def archive(conn, keep_months, drop, dry_run):
+    cutoff = months_before(date.today().replace(day=1), keep_months)
+    old = [
+        name for name, _, _ in conn.execute(text(PARTITIONS_SQL))
+        if partition_month(name) is not None and partition_month(name) < cutoff
+    ]
+    if not old:
+        print(f"✅ No hay particiones anteriores a {cutoff:%Y-%m}")
+        return
+
+    action = "Borrar" if drop else f"Mover a {ARCHIVE_SCHEMA}"
+    for name in old:
+        print(f"{'🔎' if dry_run else '📦'} {action}: {name}")
+        if dry_run:
+            continue
+        conn.execute(text(f'ALTER TABLE historical_prices DETACH PARTITION "{name}"'))
+        if drop:
+            conn.execute(text(f'DROP TABLE "{name}"'))
+        else:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            conn.execute(text(f'ALTER TABLE "{name}" SET SCHEMA {ARCHIVE_SCHEMA}'))
+    if not dry_run and not drop:
+        print(f"💡 Para guardarlas afuera: pg_dump -t '{ARCHIVE_SCHEMA}.historical_prices_*' y después DROP TABLE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Particiones mensuales de historical_prices.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    ensure_parser = commands.add_parser("ensure")
+    ensure_parser.add_argument("--months-ahead", type=int, default=2)
+    archive_parser = commands.add_parser("archive")
+    archive_parser.add_argument("--keep-months", type=int, required=True, help="Meses completos a conservar además del actual")
+    archive_parser.add_argument("--drop", action="store_true", help="Borrar en vez de mover al schema archive")
+    archive_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command != "list":
+            conn.execute(text(LOCK_SQL))
+        if args.command == "list":
+            list_partitions(conn)
+        elif args.command == "ensure":
+            ensure(conn, args.months_ahead)
+        else:
+            archive(conn, args.keep_months, args.drop, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+
+import matching
+from database import SessionLocal
+
+# Agrupa los productos de distintos retailers que son el mismo (products.canonical_product_id).
+# Por defecto solo procesa los que todavía no tienen grupo (los que agregaron los scrapers desde
+# la última corrida); --full reagrupa todo el catálogo, por ejemplo después de cambiar las reglas.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matching de productos entre retailers.")
+    parser.add_argument("--full", action="store_true", help="Reagrupar todo el catálogo")
+    parser.add_argument("--dry-run", action="store_true", help="Calcular y mostrar el resultado sin escribir")
+    parser.add_argument("--threshold", type=float, default=matching.MATCH_THRESHOLD)
+    parser.add_argument("--max-block-size", type=int, default=matching.MAX_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    matcher = matching.Matcher(args.threshold, args.max_block_size)
+    db = SessionLocal()
+    try:
+        run = matching.run_full if args.full else matching.run_incremental
+        result = run(db, dry_run=args.dry_run, matcher=matcher)
+    finally:
+        db.close()
+
+    print(f"🔎 Productos procesados: {result['listings']}" + (f" (candidatos existentes: {result['candidates']})" if "candidates" in result else ""))
+    print(f"🧱 Bloques: {result['blocks']} ({result['skipped_blocks']} descartados por tamaño)")
+    print(f"⚖️  Comparaciones: {result['comparisons']} de {result['all_pairs']} pares posibles")
+    print(f"🔗 Pares que coinciden: {result['matches']}")
+    print(f"📦 Grupos: {result['groups']} ({result['multi_retailer_groups']} con más de un retailer, {result['new_groups']} nuevos)")
+    if args.dry_run:
+        print("💡 --dry-run: no se escribió nada")
+    else:
+        print(f"✅ Productos actualizados: {result['updated']}" + (f", canónicos borrados: {result['deleted']}" if "deleted" in result else ""))
+    print(f"⏱ {result['seconds']} segundos")
+
+
+if __name__ == "__main__":
+    main()
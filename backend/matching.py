@@ -0,0 +1,378 @@
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, insert, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+import models
+
+# Agrupa las publicaciones del mismo producto en distintos retailers (canonical_products).
+# Bloqueo: solo se comparan productos que comparten un token de modelo ("rt38k5930sl", "a15"),
+# así que el costo depende del tamaño de los bloques y no de todos los pares del catálogo.
+# Dentro de un bloque, un par es el mismo producto si no tiene contradicciones (marca, categoría,
+# capacidades, accesorio vs producto, precio) y los títulos se parecen lo suficiente.
+
+# Score mínimo: compartir el modelo vale 0.5 y el resto es la similitud de los títulos
+MATCH_THRESHOLD = 0.6
+# Un token que aparece en más productos que esto no identifica a ninguno
+MAX_BLOCK_SIZE = 200
+# Más de 3 veces de diferencia es otro producto (o un accesorio del mismo modelo)
+MAX_PRICE_RATIO = 3.0
+
+KNOWN_BRANDS = {
+    "acer", "apple", "asus", "atma", "bgh", "bosch", "briket", "candy", "coventry", "dell",
+    "drean", "electrolux", "enxuta", "escorial", "gafa", "hisense", "hp", "huawei", "jbl", "kelvinator",
+    "lenovo", "lg", "liliana", "longvie", "mabe", "microsoft", "midea", "motorola", "newsan", "nintendo",
+    "noblex", "oster", "panasonic", "patrick", "peabody", "philco", "philips", "punktal", "rca", "samsung",
+    "sansei", "siam", "smartlife", "sony", "surrey", "tcl", "tedge", "whirlpool", "xiaomi", "yelmo",
+}
+STOPWORDS = {"a", "c", "con", "de", "del", "el", "en", "la", "las", "los", "para", "por", "s", "sin", "un", "una", "x", "y"}
+ACCESSORY_WORDS = {
+    "adaptador", "cable", "cargador", "correa", "estuche", "film", "filtro", "funda", "malla",
+    "mica", "protector", "repuesto", "soporte", "templado", "vidrio",
+}
+# Tienen letras y números pero no son modelos
+GENERIC_MODELS = {"ddr4", "ddr5", "mp3", "mp4", "ps4", "ps5", "usb3", "wifi6", "4k", "8k", "uhd4k", "4kuhd"}
+# Tampoco lo son la resolución ("1080p", "2160p") ni el procesador ("1235u", "i71260p", "12th",
+# "13va"): los comparten productos distintos
+GENERIC_MODEL_RE = re.compile(r"^(?:\d{3,4}p|\d{4,5}[uhkpg]|i[3-9]\d{4,5}[a-z]{0,2}|\d{1,2}(?:th|va|ma|gen))$")
+# Desde este largo un código de modelo identifica un producto ("un32t4300agczb", "15iau7"): si las
+# dos publicaciones tienen alguno y ninguno coincide, son productos distintos
+MIN_SPECIFIC_MODEL_LENGTH = 6
+
+UNITS = {
+    "gb": "gb", "tb": "tb", "mb": "mb", "kg": "kg", "g": "g", "gr": "g", "w": "w", "hz": "hz",
+    "mah": "mah", "l": "l", "lt": "l", "lts": "l", "litros": "l", "cm": "cm", "mm": "mm",
+    "pulgadas": "pulgadas", "pulg": "pulgadas", "btu": "btu", "fg": "frig", "frig": "frig",
+    "frigorias": "frig", "rpm": "rpm", "mp": "mp", "mpx": "mp", "v": "v", "k": "k", "hp": "hp", "kw": "kw",
+}
+UNIT_RE = re.compile(r"^(\d+(?:\.\d+)?)(" + "|".join(sorted(UNITS, key=len, reverse=True)) + r")$")
+SPACED_UNIT_RE = re.compile(r"(\d+(?:\.\d+)?)\s+(" + "|".join(sorted(UNITS, key=len, reverse=True)) + r")\b")
+INCHES_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:\"|''|”|pulgadas|pulg)")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+
+def normalize_title(title):
+    title = unicodedata.normalize("NFKD", title or "")
+    title = "".join(c for c in title if not unicodedata.combining(c)).lower()
+    title = INCHES_RE.sub(r"\1pulgadas", title)
+    # "RT38K-5930SL" y "RT38K5930SL" son el mismo modelo; "1,5 kg" es "1.5kg"
+    title = re.sub(r"(?<=[a-z0-9])-(?=[a-z0-9])", "", title)
+    title = re.sub(r"(?<=\d),(?=\d)", ".", title)
+    return SPACED_UNIT_RE.sub(r"\1\2", title)
+
+
+@dataclass
+class Listing:
+    id: int
+    title: str
+    retailer_id: int
+    category_id: int | None
+    price: float | None
+    canonical_id: int | None
+    brand: str | None = None
+    models: set = field(default_factory=set)
+    words: set = field(default_factory=set)
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def keys(self):
+        return sorted(self.models)
+
+
+def is_generic_model(token):
+    return token in GENERIC_MODELS or GENERIC_MODEL_RE.match(token) is not None
+
+
+def specific_models(listing):
+    return {m for m in listing.models if len(m) >= MIN_SPECIFIC_MODEL_LENGTH}
+
+
+def parse_listing(product_id, title, retailer_id, category_id, price, canonical_id, retailer_name=None):
+    listing = Listing(product_id, title or "", retailer_id, category_id, float(price) if price else None, canonical_id)
+    tokens = TOKEN_RE.findall(normalize_title(title))
+    for token in tokens:
+        unit = UNIT_RE.match(token)
+        if unit:
+            listing.attributes.setdefault(UNITS[unit.group(2)], set()).add(float(unit.group(1)))
+        elif (len(token) >= 3 and not is_generic_model(token)
+              and any(c.isdigit() for c in token) and any(c.isalpha() for c in token)):
+            listing.models.add(token)
+        if listing.brand is None and token in KNOWN_BRANDS:
+            listing.brand = token
+    # Las tiendas oficiales (Samsung, Philco, Whirlpool...) no repiten la marca en el título
+    if listing.brand is None and retailer_name:
+        first = TOKEN_RE.findall(normalize_title(retailer_name))[:1]
+        if first and first[0] in KNOWN_BRANDS:
+            listing.brand = first[0]
+    listing.words = {t for t in tokens if t not in STOPWORDS}
+    return listing
+
+
+def similarity(a, b):
+    """Score entre 0 y 1 de que dos publicaciones sean el mismo producto (0 = se contradicen)."""
+    if a.retailer_id == b.retailer_id or not (a.models & b.models):
+        return 0.0
+    a_specific, b_specific = specific_models(a), specific_models(b)
+    if a_specific and b_specific and a_specific.isdisjoint(b_specific):
+        return 0.0
+    if a.brand and b.brand and a.brand != b.brand:
+        return 0.0
+    if a.category_id and b.category_id and a.category_id != b.category_id:
+        return 0.0
+    if bool(a.words & ACCESSORY_WORDS) != bool(b.words & ACCESSORY_WORDS):
+        return 0.0
+    for unit in a.attributes.keys() & b.attributes.keys():
+        if a.attributes[unit].isdisjoint(b.attributes[unit]):
+            return 0.0
+    if a.price and b.price and max(a.price, b.price) / min(a.price, b.price) > MAX_PRICE_RATIO:
+        return 0.0
+    jaccard = len(a.words & b.words) / len(a.words | b.words)
+    return 0.5 + 0.5 * jaccard
+
+
+class Matcher:
+    """Pares que superan el umbral dentro de cada bloque, con contadores para el reporte."""
+
+    def __init__(self, threshold=MATCH_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.blocks = 0
+        self.skipped_blocks = 0
+        self.comparisons = 0
+        self.matches = 0
+
+    def pairs(self, listings, only=None):
+        """Con `only` (ids), solo los pares donde al menos uno está en `only`."""
+        blocks = defaultdict(list)
+        for listing in listings:
+            for key in listing.keys:
+                blocks[key].append(listing)
+
+        seen = set()
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                self.skipped_blocks += 1
+                continue
+            self.blocks += 1
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if only is not None and a.id not in only and b.id not in only:
+                        continue
+                    pair = (a.id, b.id) if a.id < b.id else (b.id, a.id)
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                    self.comparisons += 1
+                    if similarity(a, b) >= self.threshold:
+                        self.matches += 1
+                        yield a, b
+
+
+class UnionFind:
+    def __init__(self, ids):
+        self.parent = {i: i for i in ids}
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def groups(self):
+        groups = defaultdict(list)
+        for i in self.parent:
+            groups[self.find(i)].append(i)
+        return list(groups.values())
+
+
+LISTINGS_SQL = """
+    SELECT p.id, p.title, p.retailer_id, p.category_id, p.final_price, p.canonical_product_id, r.name
+    FROM products p
+    LEFT JOIN retailers r ON r.id = p.retailer_id
+"""
+
+match_results = Table(
+    "match_results", MetaData(),
+    Column("product_id", Integer, primary_key=True),
+    Column("canonical_id", Integer),
+    Column("match_keys", ARRAY(Text)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def load_listings(db, where, params=None):
+    rows = db.execute(text(f"{LISTINGS_SQL} WHERE {where}"), params or {})
+    return [parse_listing(*row) for row in rows]
+
+
+def canonical_row(canonical_id, members):
+    """Título más corto del grupo (el menos adornado), y marca y modelo más comunes."""
+    brands = Counter(m.brand for m in members if m.brand)
+    model_counts = Counter(model for m in members for model in m.models)
+    return {
+        "id": canonical_id,
+        "title": min((m.title for m in members), key=len),
+        "brand": brands.most_common(1)[0][0] if brands else None,
+        "model": model_counts.most_common(1)[0][0] if model_counts else None,
+    }
+
+
+def reserve_ids(db, count):
+    if not count:
+        return []
+    return db.execute(
+        text("SELECT nextval('canonical_products_id_seq') FROM generate_series(1, :n)"), {"n": count}
+    ).scalars().all()
+
+
+def save(db, groups, new_ids, full):
+    """groups: [(canonical_id, [Listing])]. Escribe los canónicos y el grupo de cada producto."""
+    canonical = models.CanonicalProduct.__table__
+    rows = [canonical_row(canonical_id, members) for canonical_id, members in groups
+            if full or canonical_id in new_ids]
+    if rows:
+        statement = pg_insert(canonical)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[canonical.c.id],
+            set_={"title": statement.excluded.title, "brand": statement.excluded.brand, "model": statement.excluded.model},
+        ), rows)
+
+    match_results.create(db.connection())
+    db.execute(insert(match_results), [
+        {"product_id": m.id, "canonical_id": canonical_id, "match_keys": m.keys}
+        for canonical_id, members in groups for m in members
+    ])
+    updated = db.execute(text("""
+        UPDATE products p SET canonical_product_id = r.canonical_id, match_keys = r.match_keys
+        FROM match_results r
+        WHERE p.id = r.product_id
+          AND (p.canonical_product_id IS DISTINCT FROM r.canonical_id OR p.match_keys IS DISTINCT FROM r.match_keys)
+    """)).rowcount
+    db.execute(text("""
+        UPDATE canonical_products c
+        SET product_count = s.products, retailer_count = s.retailers, updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT canonical_product_id, count(*) AS products, count(DISTINCT retailer_id) AS retailers
+            FROM products
+            WHERE canonical_product_id IN (SELECT DISTINCT canonical_id FROM match_results)
+            GROUP BY canonical_product_id
+        ) s
+        WHERE c.id = s.canonical_product_id
+          AND (c.product_count, c.retailer_count) IS DISTINCT FROM (s.products, s.retailers)
+    """))
+    deleted = 0
+    if full:
+        deleted = db.execute(text("""
+            DELETE FROM canonical_products c
+            WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.canonical_product_id = c.id)
+        """)).rowcount
+    # Oportunidades de arbitraje de los grupos que cambiaron (todas si se reagrupó el catálogo)
+    canonical_ids = None if full else sorted({canonical_id for canonical_id, _ in groups})
+    db.execute(text("SELECT refresh_arbitrage_opportunities(:ids)"), {"ids": canonical_ids})
+    return updated, deleted
+
+
+def summary(matcher, listings, groups, started, **extra):
+    multi = sum(1 for _, members in groups if len({m.retailer_id for m in members}) > 1)
+    return {
+        "listings": len(listings),
+        "blocks": matcher.blocks,
+        "skipped_blocks": matcher.skipped_blocks,
+        "comparisons": matcher.comparisons,
+        "all_pairs": len(listings) * (len(listings) - 1) // 2,
+        "matches": matcher.matches,
+        "groups": len(groups),
+        "multi_retailer_groups": multi,
+        "seconds": round(time.perf_counter() - started, 2),
+        **extra,
+    }
+
+
+def run_full(db, dry_run=False, matcher=None):
+    """Reagrupa todo el catálogo. Cada grupo conserva el canónico que ya tenía la mayoría."""
+    started = time.perf_counter()
+    matcher = matcher or Matcher()
+    listings = load_listings(db, "TRUE")
+    by_id = {listing.id: listing for listing in listings}
+    uf = UnionFind(by_id)
+    for a, b in matcher.pairs(listings):
+        uf.union(a.id, b.id)
+
+    groups, pending, used = [], [], set()
+    # Los grupos grandes eligen primero: un canónico no puede quedar en dos grupos
+    for ids in sorted(uf.groups(), key=len, reverse=True):
+        members = [by_id[i] for i in ids]
+        counts = Counter(m.canonical_id for m in members if m.canonical_id)
+        canonical_id = next((cid for cid, _ in counts.most_common() if cid not in used), None)
+        if canonical_id is None:
+            pending.append(members)
+        else:
+            used.add(canonical_id)
+            groups.append((canonical_id, members))
+    new_ids = reserve_ids(db, len(pending)) if not dry_run else [None] * len(pending)
+    groups += list(zip(new_ids, pending))
+
+    updated = deleted = 0
+    if dry_run:
+        db.rollback()
+    else:
+        updated, deleted = save(db, groups, set(new_ids), full=True)
+        db.commit()
+    return summary(matcher, listings, groups, started, new_groups=len(pending), updated=updated, deleted=deleted)
+
+
+def run_incremental(db, dry_run=False, matcher=None):
+    """Agrupa solo los productos sin canónico, contra los existentes que comparten una clave."""
+    started = time.perf_counter()
+    matcher = matcher or Matcher()
+    new = load_listings(db, "p.canonical_product_id IS NULL")
+    keys = sorted({key for listing in new for key in listing.keys})
+    candidates = load_listings(db, "p.canonical_product_id IS NOT NULL AND p.match_keys && :keys", {"keys": keys}) if keys else []
+    new_by_id = {listing.id: listing for listing in new}
+    by_id = {listing.id: listing for listing in candidates}
+    by_id.update(new_by_id)
+
+    uf = UnionFind(by_id)
+    for a, b in matcher.pairs(list(by_id.values()), only=new_by_id):
+        uf.union(a.id, b.id)
+
+    groups, pending, multi = [], [], 0
+    for ids in uf.groups():
+        members = [new_by_id[i] for i in ids if i in new_by_id]
+        if not members:
+            continue
+        multi += len({by_id[i].retailer_id for i in ids}) > 1
+        # Se suman al canónico con más publicaciones del componente; los existentes no se tocan
+        counts = Counter(by_id[i].canonical_id for i in ids if i not in new_by_id)
+        if counts:
+            groups.append((counts.most_common(1)[0][0], members))
+        else:
+            pending.append(members)
+    new_ids = reserve_ids(db, len(pending)) if not dry_run else [None] * len(pending)
+    groups += list(zip(new_ids, pending))
+
+    updated = 0
+    if dry_run:
+        db.rollback()
+    elif groups:
+        updated, _ = save(db, groups, set(new_ids), full=False)
+        db.commit()
+    return summary(
+        matcher, new, groups, started,
+        candidates=len(candidates), new_groups=len(pending), updated=updated, multi_retailer_groups=multi,
+    )
@@ -0,0 +1,32 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+import models  # noqa: F401 (registra las tablas en Base.metadata)
+from database import Base, engine
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    # `alembic upgrade head --sql`: genera el SQL sin conectarse
+    context.configure(url=engine.url, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
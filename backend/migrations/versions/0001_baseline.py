@@ -0,0 +1,80 @@
+"""Esquema base: tablas de productos, precios, retailers y categorías
+
+Lo que antes armaban a mano `db/schema.sql` y los scripts sueltos de `db/`. Con `IF NOT EXISTS`
+para poder correrlo sobre una base ya existente (o marcarla con `alembic stamp 0001`).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+CATEGORIES = [
+    "Tecnología", "Celulares y Telefonía", "Informática", "Electrodomésticos", "Audio, TV y Video",
+    "Gaming", "Herramientas y Construcción", "Hogar y Deco", "Muebles", "Cocina",
+    "Lavado y Planchado", "Climatización", "Iluminación", "Salud y Belleza", "Cuidado Personal",
+    "Deportes y Fitness", "Aire Libre y Camping", "Bebés y Niños", "Juguetes", "Moda y Accesorios",
+    "Mascotas", "Movilidad y Rodados", "Librería y Arte", "Seguridad para el Hogar",
+    "Equipaje y Viajes", "Domótica", "Otros",
+]
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS retailers (
+            id SERIAL PRIMARY KEY,
+            name TEXT NOT NULL,
+            url TEXT NOT NULL CONSTRAINT unique_retailer_url UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS categories (
+            id SERIAL PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS products (
+            id SERIAL PRIMARY KEY,
+            title TEXT,
+            url TEXT UNIQUE,
+            image TEXT,
+            retail_category TEXT,
+            added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            original_price NUMERIC(10,2),
+            final_price NUMERIC(10,2),
+            retailer_id INTEGER REFERENCES retailers(id),
+            category_id INTEGER,
+            searchable_term TEXT,
+            ai_description TEXT
+        );
+        -- out_of_stock lo agregaron los scrapers después del último dump del esquema
+        ALTER TABLE products ADD COLUMN IF NOT EXISTS out_of_stock BOOLEAN DEFAULT FALSE;
+
+        CREATE TABLE IF NOT EXISTS retailer_categories (
+            id SERIAL PRIMARY KEY,
+            retailer_id INTEGER NOT NULL REFERENCES retailers(id),
+            name TEXT NOT NULL,
+            category_id INTEGER REFERENCES categories(id),
+            UNIQUE (retailer_id, name)
+        );
+
+        CREATE TABLE IF NOT EXISTS historical_prices (
+            id SERIAL PRIMARY KEY,
+            product_id INTEGER REFERENCES products(id),
+            original_price NUMERIC,
+            final_price NUMERIC,
+            date_recorded TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    for name in CATEGORIES:
+        op.execute(f"INSERT INTO categories (name) VALUES ('{name}') ON CONFLICT (name) DO NOTHING")
+
+
+def downgrade():
+    # El esquema base no se baja: borraría todos los productos y su historial
+    raise NotImplementedError("0001 es el esquema base")
@@ -0,0 +1,63 @@
+"""Búsqueda de productos: full-text en español sin tildes + trigramas
+
+Requiere las extensiones de contrib `unaccent` y `pg_trgm` (disponibles en RDS, Supabase, Neon, etc.).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() es STABLE (depende del search_path): este wrapper fija el diccionario y se puede indexar
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.immutable_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+
+    # Configuración "spanish" que además saca tildes: "camara" encuentra "Cámara" y viceversa
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION public.es_unaccent (COPY = pg_catalog.spanish);
+                ALTER TEXT SEARCH CONFIGURATION public.es_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH public.unaccent, pg_catalog.spanish_stem;
+            END IF;
+        END
+        $$
+    """)
+
+    # El título pesa más que el searchable_term (modelo) en el ranking. Reescribe la tabla una vez.
+    op.execute("""
+        ALTER TABLE products
+        ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('public.es_unaccent'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('public.es_unaccent'::regconfig, coalesce(searchable_term, '')), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS products_search_vector_idx ON products USING gin (search_vector)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS products_title_trgm_idx "
+        "ON products USING gin (public.immutable_unaccent(lower(title)) gin_trgm_ops)"
+    )
+    op.execute("ANALYZE products")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS products_title_trgm_idx")
+    op.execute("DROP INDEX IF EXISTS products_search_vector_idx")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS public.es_unaccent")
+    op.execute("DROP FUNCTION IF EXISTS public.immutable_unaccent(text)")
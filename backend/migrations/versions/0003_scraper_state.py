@@ -0,0 +1,73 @@
+"""Estado de los scrapers: corridas, checkpoints, fingerprints de páginas y versión de los datos
+
+Los scrapers igual crean estas tablas si faltan (ver scrapers/scraper_runtime), con la misma definición.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_runs (
+            id SERIAL PRIMARY KEY,
+            retailer_id INTEGER REFERENCES retailers(id),
+            status TEXT NOT NULL DEFAULT 'running',
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS scrape_runs_retailer_started_idx ON scrape_runs (retailer_id, started_at DESC);
+
+        CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+            run_id INTEGER REFERENCES scrape_runs(id) ON DELETE CASCADE,
+            category TEXT NOT NULL,
+            last_page INTEGER NOT NULL DEFAULT 0,
+            done BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, category)
+        );
+
+        CREATE TABLE IF NOT EXISTS page_fingerprints (
+            retailer_id INTEGER REFERENCES retailers(id),
+            category TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            written_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (retailer_id, category, page)
+        );
+
+        CREATE TABLE IF NOT EXISTS category_revisits (
+            retailer_id INTEGER REFERENCES retailers(id),
+            category TEXT NOT NULL,
+            unchanged_runs INTEGER NOT NULL DEFAULT 0,
+            last_visited_at TIMESTAMP,
+            next_visit_at TIMESTAMP,
+            PRIMARY KEY (retailer_id, category)
+        );
+
+        -- Los scrapers la incrementan en cada commit de productos y el backend la usa para
+        -- invalidar la caché de /products
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO data_versions (name, version) VALUES ('products', 0) ON CONFLICT (name) DO NOTHING;
+    """)
+
+
+def downgrade():
+    op.execute("""
+        DROP TABLE IF EXISTS data_versions;
+        DROP TABLE IF EXISTS category_revisits;
+        DROP TABLE IF EXISTS page_fingerprints;
+        DROP TABLE IF EXISTS scrape_checkpoints;
+        DROP TABLE IF EXISTS scrape_runs;
+    """)
@@ -0,0 +1,63 @@
+"""Índices para las consultas más usadas de la API
+
+Uno por patrón de consulta (ver check-query-plans.py, que verifica que cada endpoint los use).
+Los de `products` son parciales sobre `out_of_stock = false` porque todo lo público filtra así;
+la columna no va al principio del índice porque el predicado ya la fija.
+Se crean con CONCURRENTLY para no bloquear las escrituras de los scrapers.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+from sqlalchemy import text
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    # /products paginado por cursor: uno por orden, con `id` de desempate
+    "products_updated_id_idx": "products (updated_date DESC, id DESC) WHERE out_of_stock = false",
+    "products_price_id_idx": "products (final_price, id) WHERE out_of_stock = false",
+    "products_title_id_idx": "products (title, id) WHERE out_of_stock = false",
+    "products_added_id_idx": "products (added_date, id) WHERE out_of_stock = false",
+    # /products/{id}/similar: mismo modelo o misma categoría, los más baratos primero
+    "products_searchable_term_price_idx": "products (searchable_term, final_price) WHERE out_of_stock = false",
+    "products_category_price_idx": "products (category_id, final_price) WHERE out_of_stock = false",
+    # /products/uncategorized y /admin/stats
+    "products_uncategorized_idx": "products (id DESC) WHERE category_id IS NULL",
+    "products_out_of_stock_idx": "products (id) WHERE out_of_stock",
+    # Join de casi todos los endpoints y de los filtros por retailer
+    "products_retailer_id_idx": "products (retailer_id)",
+    # /products/{id}/history y la vuelta de /tweets/weekly-drops al precio de cada fecha
+    "historical_prices_product_date_idx": "historical_prices (product_id, date_recorded)",
+    # /tweets/weekly-drops: cambios de precio de los últimos días
+    "historical_prices_date_product_idx": "historical_prices (date_recorded, product_id)",
+    # /tweets/historical-difference: la mayor baja registrada
+    "historical_prices_drop_idx": "historical_prices ((original_price - final_price) DESC) WHERE original_price > final_price",
+}
+
+
+def upgrade():
+    context = op.get_context()
+    with context.autocommit_block():
+        for name, definition in INDEXES.items():
+            # Un CREATE INDEX CONCURRENTLY cortado deja el índice inválido: se rehace
+            # (con --sql no hay conexión para mirarlo)
+            invalid = not context.as_sql and op.get_bind().execute(text("""
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """), {"name": name}).first()
+            if invalid:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+    op.execute("ANALYZE products")
+    op.execute("ANALYZE historical_prices")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
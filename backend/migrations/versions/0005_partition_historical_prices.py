@@ -0,0 +1,139 @@
+"""historical_prices particionada por mes según date_recorded
+
+Las consultas por fecha (weekly-drops, el historial reciente) solo leen las particiones del
+rango que piden. Las particiones nuevas las crea `historical_prices_ensure_partitions()`, que
+llama `manage-price-partitions.py ensure` todos los días (.github/workflows/maintain-price-tables.yml;
+los scrapers no crean particiones). Lo que caiga en un mes sin partición va a la partición
+default y se mueve a la suya cuando se crea. `manage-price-partitions.py archive` archiva los
+meses viejos.
+
+Reescribe la tabla completa: correrla en una ventana sin scrapers.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Meses por delante que se dejan creados
+MONTHS_AHEAD = 2
+
+INDEXES = {
+    "historical_prices_product_date_idx": "(product_id, date_recorded)",
+    "historical_prices_date_product_idx": "(date_recorded, product_id)",
+    "historical_prices_drop_idx": "((original_price - final_price) DESC) WHERE original_price > final_price",
+}
+
+
+def upgrade():
+    op.execute("ALTER TABLE historical_prices RENAME TO historical_prices_legacy")
+    # La secuencia de los ids sigue siendo la misma: que no se borre con la tabla vieja
+    op.execute("ALTER SEQUENCE historical_prices_id_seq OWNED BY NONE")
+
+    # La clave de partición tiene que estar en la PK y no puede ser NULL
+    op.execute("""
+        CREATE TABLE historical_prices (
+            id INTEGER NOT NULL DEFAULT nextval('historical_prices_id_seq'),
+            product_id INTEGER REFERENCES products(id),
+            original_price NUMERIC,
+            final_price NUMERIC,
+            date_recorded TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) PARTITION BY RANGE (date_recorded)
+    """)
+    op.execute("CREATE TABLE historical_prices_default PARTITION OF historical_prices DEFAULT")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION historical_prices_create_partition(month DATE)
+        RETURNS TEXT
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            start_date DATE := date_trunc('month', month);
+            end_date DATE := start_date + INTERVAL '1 month';
+            partition_name TEXT := 'historical_prices_' || to_char(start_date, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN partition_name;
+            END IF;
+            -- Se arma suelta y se adjunta: las filas de ese mes que hayan caído en la default
+            -- se mueven antes, porque si no el ATTACH falla
+            EXECUTE format('CREATE TABLE %I (LIKE historical_prices INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM historical_prices_default WHERE date_recorded >= %L AND date_recorded < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                start_date, end_date, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE historical_prices ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_date, end_date
+            );
+            RETURN partition_name;
+        END
+        $$
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION historical_prices_ensure_partitions(months_ahead INTEGER DEFAULT {MONTHS_AHEAD})
+        RETURNS SETOF TEXT
+        LANGUAGE sql
+        AS $$
+            SELECT historical_prices_create_partition(month::date)
+            FROM generate_series(
+                date_trunc('month', CURRENT_TIMESTAMP),
+                date_trunc('month', CURRENT_TIMESTAMP) + make_interval(months => months_ahead),
+                INTERVAL '1 month'
+            ) AS month
+        $$
+    """)
+
+    # Una partición por cada mes con historial, más los que vienen
+    op.execute("""
+        SELECT historical_prices_create_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min(date_recorded) FROM historical_prices_legacy), CURRENT_TIMESTAMP)),
+            date_trunc('month', CURRENT_TIMESTAMP),
+            INTERVAL '1 month'
+        ) AS month
+    """)
+    op.execute(f"SELECT historical_prices_ensure_partitions({MONTHS_AHEAD})")
+
+    # Las filas sin fecha (no debería haber: la columna tenía default) quedan en la default
+    op.execute("""
+        INSERT INTO historical_prices (id, product_id, original_price, final_price, date_recorded)
+        SELECT id, product_id, original_price, final_price, COALESCE(date_recorded, 'epoch'::timestamp)
+        FROM historical_prices_legacy
+    """)
+    op.execute("DROP TABLE historical_prices_legacy")
+    op.execute("ALTER SEQUENCE historical_prices_id_seq OWNED BY historical_prices.id")
+
+    # Definidos en el padre: cada partición (también las que se creen después) tiene los suyos
+    op.execute("ALTER TABLE historical_prices ADD PRIMARY KEY (id, date_recorded)")
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON historical_prices {definition}")
+    op.execute("ANALYZE historical_prices")
+
+
+def downgrade():
+    op.execute("ALTER TABLE historical_prices RENAME TO historical_prices_partitioned")
+    op.execute("ALTER SEQUENCE historical_prices_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE historical_prices (
+            id INTEGER NOT NULL DEFAULT nextval('historical_prices_id_seq'),
+            product_id INTEGER REFERENCES products(id),
+            original_price NUMERIC,
+            final_price NUMERIC,
+            date_recorded TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("INSERT INTO historical_prices SELECT * FROM historical_prices_partitioned")
+    op.execute("DROP TABLE historical_prices_partitioned")
+    op.execute("ALTER SEQUENCE historical_prices_id_seq OWNED BY historical_prices.id")
+    op.execute("DROP FUNCTION historical_prices_ensure_partitions(INTEGER)")
+    op.execute("DROP FUNCTION historical_prices_create_partition(DATE)")
+    op.execute("ALTER TABLE historical_prices ADD PRIMARY KEY (id)")
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON historical_prices {definition}")
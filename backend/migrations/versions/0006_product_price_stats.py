@@ -0,0 +1,163 @@
+"""product_price_stats: resumen de precios por producto
+
+Una fila por producto con mínimo, máximo y promedio del precio final, la mayor diferencia
+original - final registrada, la fecha del último cambio y el precio de hace 1, 3, 7 y 30 días.
+Los scrapers la actualizan en el mismo statement que el upsert de productos (ver
+scrapers/scraper_runtime/persistence.py), así que los endpoints leen una fila por producto en
+vez de recorrer historical_prices.
+
+`historical_prices` guarda el precio que se reemplaza cuando cambia: el precio vigente en un
+momento es el de la primera fila posterior a ese momento o, si no hay, el actual. Los precios
+de hace N días se mueven con el tiempo aunque no haya cambios: `refresh_product_price_windows()`
+recalcula solo los productos que cambiaron (o aparecieron) en los últimos 31 días.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE product_price_stats (
+            product_id INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+            current_price NUMERIC,
+            min_final_price NUMERIC,
+            max_final_price NUMERIC,
+            -- Para el promedio incremental: una observación por cada cambio de precio más el vigente
+            price_sum NUMERIC NOT NULL DEFAULT 0,
+            price_count INTEGER NOT NULL DEFAULT 0,
+            avg_final_price NUMERIC GENERATED ALWAYS AS (price_sum / NULLIF(price_count, 0)) STORED,
+            is_all_time_low BOOLEAN NOT NULL DEFAULT FALSE,
+            max_discount NUMERIC,
+            max_discount_original_price NUMERIC,
+            max_discount_final_price NUMERIC,
+            max_discount_at TIMESTAMP,
+            last_change_at TIMESTAMP,
+            price_1d_ago NUMERIC,
+            price_3d_ago NUMERIC,
+            price_7d_ago NUMERIC,
+            price_30d_ago NUMERIC,
+            windows_refreshed_at TIMESTAMP
+        )
+    """)
+    # /tweets/historical-difference y /tweets/weekly-drops
+    op.execute("CREATE INDEX product_price_stats_max_discount_idx ON product_price_stats (max_discount DESC) WHERE max_discount > 0")
+    op.execute("CREATE INDEX product_price_stats_last_change_idx ON product_price_stats (last_change_at)")
+    # La mayor diferencia ahora sale de product_price_stats
+    op.execute("DROP INDEX IF EXISTS historical_prices_drop_idx")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_price_at(product INTEGER, at TIMESTAMP)
+        RETURNS NUMERIC
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT CASE WHEN p.added_date > at THEN NULL ELSE COALESCE(
+                (SELECT h.final_price FROM historical_prices h
+                 WHERE h.product_id = p.id AND h.date_recorded > at
+                 ORDER BY h.date_recorded LIMIT 1),
+                p.final_price
+            ) END
+            FROM products p
+            WHERE p.id = product
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_product_price_windows(max_age INTERVAL DEFAULT INTERVAL '1 hour')
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            refreshed INTEGER;
+        BEGIN
+            -- Pasados 31 días del último cambio los cuatro valores quedan iguales al precio actual
+            UPDATE product_price_stats s SET
+                price_1d_ago = product_price_at(s.product_id, CURRENT_TIMESTAMP::timestamp - INTERVAL '1 day'),
+                price_3d_ago = product_price_at(s.product_id, CURRENT_TIMESTAMP::timestamp - INTERVAL '3 days'),
+                price_7d_ago = product_price_at(s.product_id, CURRENT_TIMESTAMP::timestamp - INTERVAL '7 days'),
+                price_30d_ago = product_price_at(s.product_id, CURRENT_TIMESTAMP::timestamp - INTERVAL '30 days'),
+                windows_refreshed_at = CURRENT_TIMESTAMP
+            FROM products p
+            WHERE p.id = s.product_id
+              AND (
+                  s.windows_refreshed_at IS NULL
+                  OR (s.windows_refreshed_at < CURRENT_TIMESTAMP - max_age
+                      AND s.windows_refreshed_at < GREATEST(s.last_change_at, p.added_date) + INTERVAL '31 days')
+              );
+            GET DIAGNOSTICS refreshed = ROW_COUNT;
+            RETURN refreshed;
+        END
+        $$
+    """)
+
+    # Estado inicial desde todo el historial: cada fila es un precio que estuvo vigente
+    op.execute("""
+        WITH history AS (
+            SELECT product_id,
+                   min(final_price) AS min_price,
+                   max(final_price) AS max_price,
+                   sum(final_price) AS price_sum,
+                   count(final_price) AS price_count,
+                   max(date_recorded) AS last_change_at
+            FROM historical_prices
+            GROUP BY product_id
+        ),
+        best_discount AS (
+            SELECT DISTINCT ON (product_id)
+                   product_id, original_price - final_price AS discount, original_price, final_price, date_recorded
+            FROM historical_prices
+            WHERE original_price > final_price
+            ORDER BY product_id, original_price - final_price DESC
+        ),
+        merged AS (
+            SELECT p.id,
+                   p.final_price,
+                   LEAST(h.min_price, p.final_price) AS min_price,
+                   GREATEST(h.max_price, p.final_price) AS max_price,
+                   COALESCE(h.price_sum, 0) + COALESCE(p.final_price, 0) AS price_sum,
+                   COALESCE(h.price_count, 0) + (p.final_price IS NOT NULL)::int AS price_count,
+                   h.last_change_at,
+                   CASE WHEN p.original_price > p.final_price
+                             AND p.original_price - p.final_price > COALESCE(d.discount, 0)
+                        THEN p.original_price - p.final_price ELSE d.discount END AS discount,
+                   CASE WHEN p.original_price > p.final_price
+                             AND p.original_price - p.final_price > COALESCE(d.discount, 0)
+                        THEN TRUE ELSE FALSE END AS discount_is_current,
+                   d.original_price AS discount_original, d.final_price AS discount_final, d.date_recorded AS discount_at,
+                   p.original_price, p.updated_date
+            FROM products p
+            LEFT JOIN history h ON h.product_id = p.id
+            LEFT JOIN best_discount d ON d.product_id = p.id
+        )
+        INSERT INTO product_price_stats (
+            product_id, current_price, min_final_price, max_final_price, price_sum, price_count,
+            is_all_time_low, max_discount, max_discount_original_price, max_discount_final_price,
+            max_discount_at, last_change_at
+        )
+        SELECT id, final_price, min_price, max_price, price_sum, price_count,
+               price_count > 1 AND final_price <= min_price,
+               discount,
+               CASE WHEN discount_is_current THEN original_price ELSE discount_original END,
+               CASE WHEN discount_is_current THEN final_price ELSE discount_final END,
+               CASE WHEN discount_is_current THEN updated_date ELSE discount_at END,
+               last_change_at
+        FROM merged
+    """)
+    op.execute("SELECT refresh_product_price_windows()")
+    op.execute("ANALYZE product_price_stats")
+
+
+def downgrade():
+    op.execute("DROP FUNCTION refresh_product_price_windows(INTERVAL)")
+    op.execute("DROP FUNCTION product_price_at(INTEGER, TIMESTAMP)")
+    op.execute("DROP TABLE product_price_stats")
+    op.execute(
+        "CREATE INDEX historical_prices_drop_idx ON historical_prices "
+        "((original_price - final_price) DESC) WHERE original_price > final_price"
+    )
@@ -0,0 +1,60 @@
+"""canonical_products: el mismo producto publicado por distintos retailers
+
+match-products.py agrupa los productos por modelo y similitud del título (ver matching.py) y
+guarda el grupo en `products.canonical_product_id`. `match_keys` son las claves de bloqueo de
+cada producto: las corridas incrementales solo comparan los nuevos contra los que comparten una.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    # /products/{id}/similar: el mismo producto en otros retailers, los más baratos primero.
+    # Sin WHERE: también lo usan el ON DELETE SET NULL y el borrado de canónicos huérfanos
+    "products_canonical_price_idx": "products (canonical_product_id, final_price)",
+    # Candidatos de las corridas incrementales
+    "products_match_keys_idx": "products USING gin (match_keys)",
+    # Productos que todavía no pasaron por el matching
+    "products_unmatched_idx": "products (id) WHERE canonical_product_id IS NULL",
+}
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE canonical_products (
+            id SERIAL PRIMARY KEY,
+            title TEXT,
+            brand TEXT,
+            model TEXT,
+            product_count INTEGER NOT NULL DEFAULT 0,
+            retailer_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # /tweets/suggestions: productos que venden varios retailers
+    op.execute("CREATE INDEX canonical_products_multi_retailer_idx ON canonical_products (id) WHERE retailer_count > 1")
+    # Columnas nulas sin default: no reescribe la tabla
+    op.execute("""
+        ALTER TABLE products
+            ADD COLUMN IF NOT EXISTS canonical_product_id INTEGER REFERENCES canonical_products(id) ON DELETE SET NULL,
+            ADD COLUMN IF NOT EXISTS match_keys TEXT[]
+    """)
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS match_keys, DROP COLUMN IF EXISTS canonical_product_id")
+    op.execute("DROP TABLE canonical_products")
@@ -0,0 +1,135 @@
+"""arbitrage_opportunities: diferencia de precio del mismo producto entre retailers
+
+Una fila por producto canónico (migración 0007) que está en stock en más de un retailer con
+precios distintos: la publicación más barata, la más cara de otro retailer y la diferencia
+absoluta y porcentual.
+`refresh_arbitrage_opportunities(ids)` recalcula solo esos canónicos (NULL = todos). Los scrapers
+la llaman en la misma transacción que el upsert de productos, con los canónicos de los productos
+que cambiaron de precio o de stock (ver scrapers/scraper_runtime/persistence.py), y
+match-products.py con los grupos que tocó. GET /arbitrage y /tweets/suggestions leen la tabla
+por los índices de la diferencia.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE arbitrage_opportunities (
+            canonical_product_id INTEGER PRIMARY KEY REFERENCES canonical_products(id) ON DELETE CASCADE,
+            match_key TEXT,
+            cheapest_product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+            most_expensive_product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+            min_price NUMERIC NOT NULL,
+            max_price NUMERIC NOT NULL,
+            spread NUMERIC NOT NULL,
+            spread_pct NUMERIC NOT NULL,
+            retailer_count INTEGER NOT NULL,
+            listing_count INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # GET /arbitrage?sort=spread|spread_pct (con min_spread / min_spread_pct como rango)
+    op.execute("CREATE INDEX arbitrage_opportunities_spread_idx ON arbitrage_opportunities (spread DESC, canonical_product_id DESC)")
+    op.execute("CREATE INDEX arbitrage_opportunities_spread_pct_idx ON arbitrage_opportunities (spread_pct DESC, canonical_product_id DESC)")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_arbitrage_opportunities(canonical_ids INTEGER[] DEFAULT NULL)
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            refreshed INTEGER;
+        BEGIN
+            -- Upsert + delete en vez de borrar y reinsertar: dos scrapers pueden refrescar el
+            -- mismo canónico a la vez. Las filas se insertan (y se bloquean) en orden de
+            -- canónico, así dos refrescos que se superponen no se bloquean en cruz
+            WITH in_stock AS (
+                SELECT p.id, p.canonical_product_id, p.retailer_id, p.final_price
+                FROM products p
+                WHERE (p.canonical_product_id = ANY(canonical_ids)
+                       OR (canonical_ids IS NULL AND p.canonical_product_id IS NOT NULL))
+                  AND p.out_of_stock = false AND p.final_price > 0
+            ),
+            cheapest AS (
+                SELECT DISTINCT ON (canonical_product_id) *
+                FROM in_stock
+                ORDER BY canonical_product_id, final_price, id
+            ),
+            -- La más cara de otro retailer: dos publicaciones del mismo retailer no son arbitraje
+            most_expensive AS (
+                SELECT DISTINCT ON (s.canonical_product_id) s.*
+                FROM in_stock s
+                JOIN cheapest c ON c.canonical_product_id = s.canonical_product_id AND s.retailer_id <> c.retailer_id
+                ORDER BY s.canonical_product_id, s.final_price DESC, s.id
+            ),
+            counts AS (
+                SELECT canonical_product_id, count(*) AS listing_count, count(DISTINCT retailer_id) AS retailer_count
+                FROM in_stock
+                GROUP BY canonical_product_id
+            ),
+            computed AS (
+                SELECT c.canonical_product_id, cp.title AS match_key,
+                       c.id AS cheapest_product_id, e.id AS most_expensive_product_id,
+                       c.final_price AS min_price, e.final_price AS max_price,
+                       e.final_price - c.final_price AS spread,
+                       round((e.final_price - c.final_price) * 100 / c.final_price, 2) AS spread_pct,
+                       n.retailer_count, n.listing_count
+                FROM cheapest c
+                JOIN most_expensive e ON e.canonical_product_id = c.canonical_product_id
+                JOIN counts n ON n.canonical_product_id = c.canonical_product_id
+                JOIN canonical_products cp ON cp.id = c.canonical_product_id
+                WHERE e.final_price > c.final_price
+            ),
+            upserted AS (
+                INSERT INTO arbitrage_opportunities AS a (
+                    canonical_product_id, match_key, cheapest_product_id, most_expensive_product_id,
+                    min_price, max_price, spread, spread_pct, retailer_count, listing_count, updated_at
+                )
+                SELECT *, CURRENT_TIMESTAMP FROM computed
+                ORDER BY canonical_product_id
+                ON CONFLICT (canonical_product_id) DO UPDATE SET
+                    match_key = EXCLUDED.match_key,
+                    cheapest_product_id = EXCLUDED.cheapest_product_id,
+                    most_expensive_product_id = EXCLUDED.most_expensive_product_id,
+                    min_price = EXCLUDED.min_price,
+                    max_price = EXCLUDED.max_price,
+                    spread = EXCLUDED.spread,
+                    spread_pct = EXCLUDED.spread_pct,
+                    retailer_count = EXCLUDED.retailer_count,
+                    listing_count = EXCLUDED.listing_count,
+                    updated_at = EXCLUDED.updated_at
+                -- updated_at es la fecha desde la que la oportunidad está así
+                WHERE (a.match_key, a.cheapest_product_id, a.most_expensive_product_id, a.min_price,
+                       a.max_price, a.retailer_count, a.listing_count)
+                      IS DISTINCT FROM
+                      (EXCLUDED.match_key, EXCLUDED.cheapest_product_id, EXCLUDED.most_expensive_product_id,
+                       EXCLUDED.min_price, EXCLUDED.max_price, EXCLUDED.retailer_count, EXCLUDED.listing_count)
+                RETURNING 1
+            ),
+            removed AS (
+                DELETE FROM arbitrage_opportunities a
+                WHERE (canonical_ids IS NULL OR a.canonical_product_id = ANY(canonical_ids))
+                  AND NOT EXISTS (SELECT 1 FROM computed c WHERE c.canonical_product_id = a.canonical_product_id)
+                RETURNING 1
+            )
+            SELECT (SELECT count(*) FROM upserted) + (SELECT count(*) FROM removed) INTO refreshed;
+            RETURN refreshed;
+        END
+        $$
+    """)
+    op.execute("SELECT refresh_arbitrage_opportunities()")
+    op.execute("ANALYZE arbitrage_opportunities")
+
+
+def downgrade():
+    op.execute("DROP FUNCTION refresh_arbitrage_opportunities(INTEGER[])")
+    op.execute("DROP TABLE arbitrage_opportunities")
@@ -0,0 +1,33 @@
+"""Índice de products por categoría del retailer
+
+PATCH /retailer-categories/{id}/map y update-products-with-categories.py aplican los mapeos con
+un UPDATE que une products con retailer_categories por (retailer_id, retail_category), ver
+category_mapping.py. Con este índice, mapear una categoría solo lee los productos de esa
+categoría. Se crea con CONCURRENTLY para no bloquear las escrituras de los scrapers.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "products_retailer_category_idx": "products (retailer_id, retail_category)",
+}
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -1,6 +1,13 @@
-from sqlalchemy import Column, Integer, Numeric, String, Float, DateTime, ForeignKey, func, Text, Boolean
+from sqlalchemy import Column, Integer, Numeric, String, Float, DateTime, ForeignKey, func, Text, Boolean, Computed
 from database import Base
-from sqlalchemy.orm import relationship, foreign
+from sqlalchemy.orm import relationship, foreign, deferred
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+
+# Columna generada de la migración 0002_product_search (ver search.py)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('public.es_unaccent'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('public.es_unaccent'::regconfig, coalesce(searchable_term, '')), 'B')"
+)
 
 class Product(Base):
     __tablename__ = "products"
@@ -19,9 +26,15 @@ class Product(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     category_rel = relationship("Category", backref="products")
     historical_prices = relationship("HistoricalPrice", back_populates="product")
+    price_stats = relationship("ProductPriceStats", uselist=False, back_populates="product")
+    # Mismo producto en otros retailers (ver matching.py)
+    canonical_product_id = Column(Integer, ForeignKey("canonical_products.id"), nullable=True)
+    match_keys = deferred(Column(ARRAY(Text)))
     searchable_term = Column(Text)
     ai_description = Column(Text, nullable=True)
     out_of_stock = Column(Boolean, default=False)
+    # Solo para filtrar y rankear: no se trae en los SELECT
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
 
 
     @property
@@ -41,6 +54,37 @@ class Category(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
 
+class CanonicalProduct(Base):
+    __tablename__ = "canonical_products"
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String)
+    brand = Column(String)
+    model = Column(String)
+    product_count = Column(Integer, default=0)
+    retailer_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+
+class ArbitrageOpportunity(Base):
+    # Una fila por canónico con precios distintos en más de un retailer (migración 0008): la
+    # mantienen los scrapers y match-products.py con refresh_arbitrage_opportunities()
+    __tablename__ = "arbitrage_opportunities"
+    canonical_product_id = Column(Integer, ForeignKey("canonical_products.id"), primary_key=True)
+    match_key = Column(String)
+    cheapest_product_id = Column(Integer, ForeignKey("products.id"))
+    most_expensive_product_id = Column(Integer, ForeignKey("products.id"))
+    # Float como en Product: el cursor de paginación los serializa a JSON
+    min_price = Column(Float)
+    max_price = Column(Float)
+    spread = Column(Float)
+    spread_pct = Column(Float)
+    retailer_count = Column(Integer)
+    listing_count = Column(Integer)
+    updated_at = Column(DateTime)
+
+    cheapest = relationship("Product", foreign_keys=[cheapest_product_id])
+    most_expensive = relationship("Product", foreign_keys=[most_expensive_product_id])
+
 class RetailerCategory(Base):
     __tablename__ = 'retailer_categories'
     id = Column(Integer, primary_key=True, index=True)
@@ -52,12 +96,41 @@ class RetailerCategory(Base):
     category = relationship("Category")
 
 class HistoricalPrice(Base):
+    # Particionada por mes según date_recorded (migración 0005): la PK de la tabla es
+    # (id, date_recorded), pero id sigue siendo único y alcanza para el ORM
     __tablename__ = "historical_prices"
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
     original_price = Column(Numeric)
     final_price = Column(Numeric)
-    date_recorded = Column(DateTime, default=func.now())
+    date_recorded = Column(DateTime, default=func.now(), nullable=False)
 
     product = relationship("Product", back_populates="historical_prices")
+
+
+class ProductPriceStats(Base):
+    # Resumen por producto que mantienen los scrapers (migración 0006): se lee en vez de
+    # recorrer historical_prices
+    __tablename__ = "product_price_stats"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    current_price = Column(Numeric)
+    min_final_price = Column(Numeric)
+    max_final_price = Column(Numeric)
+    price_sum = Column(Numeric)
+    price_count = Column(Integer)
+    avg_final_price = Column(Numeric, Computed("price_sum / NULLIF(price_count, 0)", persisted=True))
+    is_all_time_low = Column(Boolean)
+    max_discount = Column(Numeric)
+    max_discount_original_price = Column(Numeric)
+    max_discount_final_price = Column(Numeric)
+    max_discount_at = Column(DateTime)
+    last_change_at = Column(DateTime)
+    price_1d_ago = Column(Numeric)
+    price_3d_ago = Column(Numeric)
+    price_7d_ago = Column(Numeric)
+    price_30d_ago = Column(Numeric)
+    windows_refreshed_at = Column(DateTime)
+
+    product = relationship("Product", back_populates="price_stats")
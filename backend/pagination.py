@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_, tuple_
+
+import models
+
+# Columnas de orden de cada `sort` de /products. Todas terminan en `id` para que el orden sea
+# total y el cursor apunte a una fila exacta; la dirección es la misma para todas las columnas.
+SORTS = {
+    "price_asc": ([models.Product.final_price], False),
+    "price_desc": ([models.Product.final_price], True),
+    "name_asc": ([models.Product.title], False),
+    "name_desc": ([models.Product.title], True),
+    "retailer_asc": ([models.Retailer.name], False),
+    "retailer_desc": ([models.Retailer.name], True),
+    "date_asc": ([models.Product.added_date], False),
+    "date_desc": ([models.Product.added_date], True),
+}
+DEFAULT_SORT = ([models.Product.updated_date], True)
+
+# GET /arbitrage: de mayor a menor diferencia, absoluta o porcentual
+ARBITRAGE_SORTS = {
+    "spread": [models.ArbitrageOpportunity.spread, models.ArbitrageOpportunity.canonical_product_id],
+    "spread_pct": [models.ArbitrageOpportunity.spread_pct, models.ArbitrageOpportunity.canonical_product_id],
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_keys(sort, search=None):
+    """(columnas, descendente) del orden pedido; `relevance` solo aplica si hay búsqueda."""
+    if sort == "relevance" and search:
+        return [search.rank(), models.Product.updated_date, models.Product.id], True
+    columns, descending = SORTS.get(sort, DEFAULT_SORT)
+    return columns + [models.Product.id], descending
+
+
+def order_by(keys, descending):
+    return [key.desc() if descending else key.asc() for key in keys]
+
+
+def encode_cursor(sort, values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps({"s": sort, "k": payload}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort, keys):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values = data["k"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Cursor inválido")
+    if data.get("s") != sort or len(values) != len(keys):
+        raise InvalidCursor("El cursor corresponde a otro orden")
+    # Las fechas viajan como ISO
+    return [
+        datetime.fromisoformat(value) if isinstance(value, str) and _is_datetime(key) else value
+        for key, value in zip(keys, values)
+    ]
+
+
+def _is_datetime(key):
+    try:
+        return key.type.python_type is datetime
+    except (AttributeError, NotImplementedError):
+        return False
+
+
+def is_nullable(key):
+    """False si la columna no admite NULL; las expresiones (el rank de la búsqueda) nunca lo son."""
+    columns = getattr(getattr(key, "property", None), "columns", None)
+    return bool(columns) and columns[0].nullable
+
+
+def after_cursor(keys, descending, values):
+    """Filas que vienen después de `values` cuando ninguna es NULL: una comparación de filas
+    `(a, id) > (x, z)` que se resuelve como un rango sobre el índice del orden."""
+    row, cursor_row = tuple_(*keys), tuple_(*values)
+    return row < cursor_row if descending else row > cursor_row
+
+
+def cursor_phases(keys, descending, values, nullable=True):
+    """Filtros para seguir después de `values`, uno por tramo y en el orden en que se leen.
+
+    Postgres ordena los NULL de la primera columna últimos en ASC y primeros en DESC. En vez de un
+    OR (que no se puede resolver con el índice y obliga a recorrer todo lo anterior al cursor),
+    cada tramo es un rango: primero los valores y después los NULL (ASC), o al revés (DESC).
+    Con `nullable=False` (la columna no admite NULL o la consulta ya los filtra) hay un solo tramo.
+    """
+    leading, rest = values[0], values[1:]
+    if None in rest:
+        # Solo el orden por relevancia tiene una columna nullable en el medio: caso raro
+        return [_after_with_nulls(keys, descending, values)]
+    if leading is not None:
+        phases = [after_cursor(keys, descending, values)]
+        if nullable and not descending:
+            phases.append(keys[0].is_(None))
+        return phases
+    # El cursor ya está en el tramo de los NULL
+    phases = [and_(keys[0].is_(None), after_cursor(keys[1:], descending, rest))]
+    if descending:
+        phases.append(keys[0].is_not(None))
+    return phases
+
+
+def product_cursor_phases(keys, descending, values):
+    """cursor_phases de /products: minPrice/maxPrice ya descartan los precios NULL."""
+    nullable = is_nullable(keys[0]) and keys[0] is not models.Product.final_price
+    return cursor_phases(keys, descending, values, nullable)
+
+
+def _after_with_nulls(keys, descending, values):
+    conditions = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        equal = [k.is_(None) if v is None else k == v for k, v in zip(keys[:i], values[:i])]
+        if value is None:
+            after = key.is_not(None) if descending else None
+        else:
+            after = key < value if descending else or_(key > value, key.is_(None))
+        if after is not None:
+            conditions.append(and_(*equal, after))
+    return or_(*conditions)
@@ -0,0 +1,29 @@
+import argparse
+import time
+
+from sqlalchemy import text
+
+from database import engine
+
+# Pone al día los precios de hace 1, 3, 7 y 30 días de product_price_stats (migración 0006):
+# se mueven con el tiempo aunque el precio no cambie, así que no alcanza con lo que escriben los
+# scrapers. Corre cada hora en .github/workflows/refresh-price-windows.yml; los endpoints solo leen.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula los precios de hace N días de product_price_stats.")
+    parser.add_argument("--max-age-minutes", type=int, default=60,
+                        help="Solo los productos actualizados hace más de esto")
+    args = parser.parse_args()
+
+    started = time.time()
+    with engine.begin() as conn:
+        refreshed = conn.execute(
+            text("SELECT refresh_product_price_windows(make_interval(mins => :minutes))"),
+            {"minutes": args.max_age_minutes},
+        ).scalar()
+    print(f"✅ {refreshed} productos actualizados en {time.time() - started:.1f} segundos")
+
+
+if __name__ == "__main__":
+    main()
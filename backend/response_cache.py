@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+try:
+    import redis
+except ImportError:  # Redis es opcional: sin el paquete (o sin REDIS_URL) queda solo la caché local
+    redis = None
+
+# Respuestas de /products ya serializadas, por parámetros normalizados y versión de los datos.
+# La versión la incrementan los scrapers en cada commit (tabla `data_versions`), así que una
+# entrada nunca sirve datos de antes del último scrapeo: las viejas simplemente dejan de pedirse.
+LOCAL_MAX_ENTRIES = int(os.getenv("PRODUCTS_CACHE_SIZE", "512"))
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_TTL_SECONDS = 24 * 60 * 60
+# Cada cuánto se relee la versión de la DB: es lo máximo que una respuesta puede quedar vieja
+VERSION_CHECK_SECONDS = 5
+# Claves con estadísticas propias (las menos usadas se descartan)
+MAX_TRACKED_KEYS = 200
+
+
+def normalize_text(value):
+    """La búsqueda ignora mayúsculas, tildes y espacios repetidos: la clave también."""
+    value = unicodedata.normalize("NFKD", value.lower())
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.split())
+
+
+def normalize_list(value, separator):
+    return sorted({item.strip() for item in value.split(separator) if item.strip()})
+
+
+def products_key(query, sort, retailers, categories, min_price, max_price, page, limit, cursor, facets=False):
+    return json.dumps({
+        "q": normalize_text(query),
+        "sort": sort,
+        "retailers": normalize_list(retailers, ","),
+        "categories": normalize_list(categories, "|"),
+        "min": min_price,
+        "max": max_price,
+        "page": page,
+        "limit": limit,
+        "cursor": cursor,
+        "facets": facets,
+    }, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class DataVersion:
+    """Versión de `data_versions` para un nombre, releída como mucho cada VERSION_CHECK_SECONDS."""
+
+    def __init__(self, name="products", check_seconds=VERSION_CHECK_SECONDS):
+        self.name = name
+        self.check_seconds = check_seconds
+        self.version = 0
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current(self, db):
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return self.version
+        try:
+            row = db.execute(text("SELECT version FROM data_versions WHERE name = :name"), {"name": self.name}).first()
+            version = row[0] if row else 0
+        except SQLAlchemyError as e:
+            # Sin la tabla (migración 0003) se cachea igual, invalidando solo por LRU
+            db.rollback()
+            logging.warning(f"No se pudo leer data_versions: {e}")
+            version = self.version
+        with self._lock:
+            self.version = version
+            self._checked_at = time.monotonic()
+        return version
+
+
+class KeyStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.hit_ms = 0.0
+        self.miss_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, hit, ms):
+        if hit:
+            self.hits += 1
+            self.hit_ms += ms
+        else:
+            self.misses += 1
+            self.miss_ms += ms
+        self.last_ms = ms
+
+    def as_dict(self, key):
+        return {
+            "key": key,
+            "hits": self.hits,
+            "misses": self.misses,
+            "avg_hit_ms": round(self.hit_ms / self.hits, 3) if self.hits else None,
+            "avg_miss_ms": round(self.miss_ms / self.misses, 3) if self.misses else None,
+            "last_ms": round(self.last_ms, 3),
+        }
+
+
+class ResponseCache:
+    """LRU en memoria delante de un Redis opcional, con hit ratio y latencia por clave."""
+
+    def __init__(self, prefix, max_entries=LOCAL_MAX_ENTRIES, redis_url=REDIS_URL):
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self._local = OrderedDict()
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+        self._redis = None
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        elif redis_url:
+            logging.warning("REDIS_URL definido pero el paquete redis no está instalado: solo caché local")
+
+    def _storage_key(self, version, key):
+        return f"{self.prefix}:v{version}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def get(self, version, key):
+        """(payload, origen) con origen "local" o "redis"; (None, None) si no está."""
+        storage_key = self._storage_key(version, key)
+        with self._lock:
+            payload = self._local.get(storage_key)
+            if payload is not None:
+                self._local.move_to_end(storage_key)
+                self.local_hits += 1
+                return payload, "local"
+
+        if self._redis is not None:
+            try:
+                payload = self._redis.get(storage_key)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+                payload = None
+            if payload is not None:
+                with self._lock:
+                    self.redis_hits += 1
+                    self._store_local(storage_key, payload)
+                return payload, "redis"
+
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def set(self, version, key, payload):
+        storage_key = self._storage_key(version, key)
+        with self._lock:
+            self._store_local(storage_key, payload)
+        if self._redis is not None:
+            try:
+                self._redis.set(storage_key, payload, ex=REDIS_TTL_SECONDS)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def _store_local(self, storage_key, payload):
+        self._local[storage_key] = payload
+        self._local.move_to_end(storage_key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def _redis_failed(self, error):
+        with self._lock:
+            self.redis_errors += 1
+        logging.warning(f"Redis no disponible para la caché de {self.prefix}: {error}")
+
+    def record(self, key, hit, ms):
+        with self._lock:
+            stats = self._keys.get(key)
+            if stats is None:
+                stats = self._keys[key] = KeyStats()
+            self._keys.move_to_end(key)
+            while len(self._keys) > MAX_TRACKED_KEYS:
+                self._keys.popitem(last=False)
+            stats.record(hit, ms)
+
+    def stats(self, top=20):
+        with self._lock:
+            requests = self.local_hits + self.redis_hits + self.misses
+            keys = sorted(self._keys.items(), key=lambda item: item[1].hits + item[1].misses, reverse=True)
+            return {
+                "requests": requests,
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.local_hits + self.redis_hits) / requests, 4) if requests else 0.0,
+                "local_entries": len(self._local),
+                "redis_enabled": self._redis is not None,
+                "redis_errors": self.redis_errors,
+                "top_keys": [stats.as_dict(key) for key, stats in keys[:top]],
+            }
+
+
+products_version = DataVersion("products")
+products_cache = ResponseCache("products")
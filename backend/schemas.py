@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional, List
 
@@ -27,6 +27,23 @@ class ProductBase(BaseModel):
     class Config:
         from_attributes = True
 
+class ProductPriceStats(BaseModel):
+    min_final_price: Optional[float]
+    max_final_price: Optional[float]
+    avg_final_price: Optional[float]
+    is_all_time_low: bool
+    last_change_at: Optional[datetime]
+    price_1d_ago: Optional[float]
+    price_3d_ago: Optional[float]
+    price_7d_ago: Optional[float]
+    price_30d_ago: Optional[float]
+
+    class Config:
+        from_attributes = True
+
+class ProductDetail(ProductBase):
+    price_stats: Optional[ProductPriceStats] = None
+
 class CategoryBase(BaseModel):
     name: str
 
@@ -48,11 +65,95 @@ class RetailerCategory(RetailerCategoryBase):
     class Config:
         orm_mode = True
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class PriceBucket(BaseModel):
+    min: float
+    max: Optional[float]
+    count: int
+
+class ProductFacets(BaseModel):
+    retailers: List[FacetCount]
+    categories: List[FacetCount]
+    prices: List[PriceBucket]
+
+# Lo que devuelve /products por producto (se arma desde columnas, ver listing.py)
+class ProductListItem(BaseModel):
+    id: int
+    title: str
+    original_price: Optional[float]
+    final_price: Optional[float]
+    url: str
+    image: str | None = None
+    retail_category: str
+    added_date: datetime
+    updated_date: datetime
+    retailer: RetailerBase
+    category_id: Optional[int]
+    category_name: Optional[str] = None
+
 class ProductListResponse(BaseModel):
-    data: List[ProductBase]
+    data: List[ProductListItem]
     total: int
+    # False: `total` es una estimación (o el tope de conteo exacto) porque hay demasiados resultados
+    total_exact: bool = True
     page: int
     limit: int
+    # Pasarlo como `cursor` para pedir la página siguiente; None si no hay más
+    next_cursor: Optional[str] = None
+    # Solo con `facets=true`: cantidad de resultados por cada opción de los filtros
+    facets: Optional[ProductFacets] = None
+
+class LLMCacheEndpointStats(BaseModel):
+    endpoint: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    tokens_spent: int
+    tokens_saved: int
+    latency_spent_ms: float
+    latency_saved_ms: float
+
+class LLMCacheStats(BaseModel):
+    path: str
+    entries: int
+    size_bytes: int
+    max_entries: int
+    requests: int
+    hits: int
+    hit_ratio: float
+    tokens_saved: int
+    latency_saved_ms: float
+    endpoints: List[LLMCacheEndpointStats]
+
+class ArbitrageListing(BaseModel):
+    id: int
+    title: str
+    final_price: Optional[float]
+    url: str
+    image: str | None = None
+    retailer: RetailerBase
+    model_config = ConfigDict(from_attributes=True)
+
+class ArbitrageOpportunity(BaseModel):
+    canonical_product_id: int
+    match_key: Optional[str]
+    cheapest: ArbitrageListing
+    most_expensive: ArbitrageListing
+    spread: float
+    spread_pct: float
+    retailer_count: int
+    listing_count: int
+    updated_at: Optional[datetime]
+    model_config = ConfigDict(from_attributes=True)
+
+class ArbitrageResponse(BaseModel):
+    data: List[ArbitrageOpportunity]
+    limit: int
+    # Pasarlo como `cursor` para pedir la página siguiente; None si no hay más
+    next_cursor: Optional[str] = None
 
 class AdminLoginRequest(BaseModel):
     username: str
@@ -67,9 +168,16 @@ class SimpleMessageResponse(BaseModel):
 class MapCategoryRequest(BaseModel):
     category_id: int
 
+class MapCategoryResponse(BaseModel):
+    message: str
+    updated_products: int
+
 class SuggestedCategoryResponse(BaseModel):
     suggested_category_id: Optional[int]
     suggested_category_name: Optional[str] = None
+    # Confianza del clasificador local; None si respondió DeepSeek
+    confidence: Optional[float] = None
+    source: Optional[str] = None  # "classifier" o "deepseek"
 
 class CountResponse(BaseModel):
     count: int
@@ -90,4 +198,24 @@ class AdminStats(BaseModel):
     products_with_ai_description: int
     invalid_price_products: int
     out_of_stock_products: int
-    suspicious_discount_products: int
\ No newline at end of file
+    suspicious_discount_products: int
+
+class CacheKeyStats(BaseModel):
+    key: str
+    hits: int
+    misses: int
+    avg_hit_ms: Optional[float]
+    avg_miss_ms: Optional[float]
+    last_ms: float
+
+class CacheStats(BaseModel):
+    data_version: int
+    requests: int
+    local_hits: int
+    redis_hits: int
+    misses: int
+    hit_ratio: float
+    local_entries: int
+    redis_enabled: bool
+    redis_errors: int
+    top_keys: List[CacheKeyStats]
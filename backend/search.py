@@ -0,0 +1,61 @@
+import re
+
+from sqlalchemy import func, literal, or_
+
+import models
+
+# Definidos en migrations/versions/0002_product_search.py
+SEARCH_CONFIG = "public.es_unaccent"
+# Debajo de 3 letras no hay trigramas útiles: solo se busca por prefijo en el full-text
+MIN_TRIGRAM_LENGTH = 3
+
+WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def prefix_tsquery(query):
+    """'heladera no fro' -> 'heladera & no & fro:*': la última palabra puede estar a medio tipear."""
+    words = WORD_RE.findall(query)
+    if not words:
+        return None
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+
+def normalized(expression):
+    return func.immutable_unaccent(func.lower(expression))
+
+
+class ProductSearch:
+    """Condición de búsqueda y ranking para /products.
+
+    Un producto matchea si el full-text (título + searchable_term, español sin tildes) contiene
+    todas las palabras, o si la búsqueda se parece lo suficiente a una parte del título
+    (`pg_trgm.word_similarity_threshold`, cubre typos y pedazos de palabras). Las dos condiciones
+    usan índices GIN, así que el costo depende de cuántos productos matchean y no del catálogo.
+    """
+
+    def __init__(self, query):
+        self.query = query.strip()
+        tsquery = prefix_tsquery(self.query)
+        self.tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery) if tsquery else None
+        self.use_trigrams = len(self.query) >= MIN_TRIGRAM_LENGTH
+
+    def __bool__(self):
+        return self.tsquery is not None or self.use_trigrams
+
+    def condition(self):
+        conditions = []
+        if self.tsquery is not None:
+            conditions.append(models.Product.search_vector.op("@@")(self.tsquery))
+        if self.use_trigrams:
+            # `titulo %> búsqueda` es la forma que puede usar products_title_trgm_idx
+            conditions.append(normalized(models.Product.title).op("%>")(normalized(literal(self.query))))
+        return or_(*conditions)
+
+    def rank(self):
+        rank = literal(0.0)
+        if self.tsquery is not None:
+            # 32: normaliza a 0..1 para que sea comparable con la similitud
+            rank = rank + func.ts_rank_cd(models.Product.search_vector, self.tsquery, 32)
+        if self.use_trigrams:
+            rank = rank + func.word_similarity(normalized(literal(self.query)), normalized(models.Product.title))
+        return rank
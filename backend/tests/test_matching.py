@@ -0,0 +1,45 @@
+import os
+import unittest
+
+# matching importa models -> database, que arma el engine (sin conectarse) con DATABASE_URL
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/test")
+
+from matching import parse_listing, similarity, MATCH_THRESHOLD  # noqa: E402
+
+
+def listing(product_id, title, retailer_id, price=None):
+    return parse_listing(product_id, title, retailer_id, None, price, None)
+
+
+class SimilarityTest(unittest.TestCase):
+    def test_same_model_in_two_retailers_matches(self):
+        a = listing(1, 'Smart TV Samsung 32" UN32T4300AGCZB HD 1080p', 1, 250000)
+        b = listing(2, 'Samsung Smart TV 32 pulgadas UN32T4300AGCZB HD', 2, 260000)
+        self.assertGreaterEqual(similarity(a, b), MATCH_THRESHOLD)
+
+    def test_shared_resolution_is_not_a_model(self):
+        a = listing(1, 'Smart TV Samsung 32" UN32T4300AGCZB HD 1080p', 1)
+        b = listing(2, 'Smart TV Samsung 32" UN32T5300AGCZB HD 1080p', 2)
+        self.assertNotIn("1080p", a.models)
+        self.assertEqual(similarity(a, b), 0.0)
+
+    def test_shared_cpu_is_not_a_model(self):
+        a = listing(1, "Notebook Lenovo IdeaPad 3 15IAU7 Intel Core i5 1235U 8GB 512GB", 1)
+        b = listing(2, "Notebook Lenovo IdeaPad 3 15IRU8 Intel Core i5 1235U 8GB 512GB", 2)
+        self.assertNotIn("1235u", a.models)
+        self.assertEqual(similarity(a, b), 0.0)
+
+    def test_cpu_with_generation_is_not_a_model(self):
+        a = listing(1, "Notebook Dell Vostro V3520 Core i7-1255U 12th Gen 16GB", 1)
+        self.assertEqual(a.models, {"v3520"})
+
+    def test_conflicting_specific_models_veto(self):
+        # Comparten un código corto ("a15") pero el modelo completo es otro
+        a = listing(1, "Celular Samsung Galaxy A15 SMA155M 128GB", 1)
+        b = listing(2, "Celular Samsung Galaxy A15 SMA156M 128GB", 2)
+        self.assertTrue(a.models & b.models)
+        self.assertEqual(similarity(a, b), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import argparse
+import time
+
+import category_classifier
+from database import SessionLocal
+from models import Category
+
+# Entrena el clasificador local de categorías (category_classifier.py). Primero lo evalúa con
+# los productos de una parte de las categorías de retailer, que deja afuera del entrenamiento, y
+# escribe el reporte; después lo entrena con todo y lo guarda para la API y
+# autosuggest-product-categories.py.
+
+
+def write_report(path, metrics, names, total_seconds):
+    lines = [
+        "# Evaluación del clasificador de categorías\n",
+        f"- Entrenamiento: {metrics['train_examples']} ejemplos en {metrics['train_seconds']} segundos",
+        f"- Evaluación: {metrics['test_examples']} ejemplos de {metrics['test_groups']} categorías de retailer "
+        f"que el modelo no vio, en {metrics['predict_seconds']} segundos",
+        f"- Accuracy: {metrics['accuracy']:.4f}",
+        f"- Macro F1: {metrics['macro_f1']:.4f}",
+        f"- Umbral elegido: {metrics['threshold']} (el más bajo con accuracy ≥ {category_classifier.TARGET_ACCURACY} en lo que resuelve el modelo)",
+        f"- Tiempo total: {total_seconds:.1f} segundos\n",
+        "## Confianza mínima\n",
+        "| Umbral | Resuelve el modelo | Accuracy | Van a DeepSeek |",
+        "|---|---|---|---|",
+    ]
+    for row in metrics["thresholds"]:
+        accuracy = f"{row['accuracy']:.4f}" if row["accuracy"] is not None else "-"
+        lines.append(f"| {row['threshold']} | {row['coverage']:.1%} | {accuracy} | {row['llm_items']} |")
+    lines += [
+        "\n## Por categoría\n",
+        "| Categoría | Precision | Recall | F1 | Ejemplos |",
+        "|---|---|---|---|---|",
+    ]
+    for row in sorted(metrics["categories"], key=lambda r: r["f1"]):
+        name = names.get(row["category_id"], row["category_id"])
+        lines.append(f"| {name} | {row['precision']:.3f} | {row['recall']:.3f} | {row['f1']:.3f} | {row['support']} |")
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrena y evalúa el clasificador local de categorías.")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Fracción de categorías de retailer que se deja para evaluar")
+    parser.add_argument("--report", default="category_classifier_report.md")
+    parser.add_argument("--output", default=category_classifier.MODEL_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Solo evaluar, sin guardar el modelo")
+    args = parser.parse_args()
+
+    started = time.time()
+    db = SessionLocal()
+    try:
+        texts, labels, groups, canonical_ids = category_classifier.load_training_data(db)
+        names = {c.id: c.name for c in db.query(Category).all()}
+    finally:
+        db.close()
+
+    if len(set(labels)) < 2:
+        print("❌ Hacen falta productos categorizados en al menos dos categorías para entrenar.")
+        return
+    print(f"📚 {len(texts)} ejemplos en {len(set(labels))} categorías")
+
+    metrics = category_classifier.evaluate(texts, labels, groups, canonical_ids, args.test_size)
+    print(f"🎯 Accuracy: {metrics['accuracy']:.4f} - Macro F1: {metrics['macro_f1']:.4f}")
+    for row in metrics["thresholds"]:
+        if row["threshold"] == metrics["threshold"] and row["accuracy"] is not None:
+            print(f"⚖️  Umbral {row['threshold']}: el modelo resuelve {row['coverage']:.1%} con accuracy {row['accuracy']:.4f}")
+
+    if not args.dry_run:
+        classifier = category_classifier.train(texts, labels, metrics["threshold"], metrics)
+        classifier.save(args.output)
+        print(f"💾 Modelo guardado en: {args.output}")
+
+    total_seconds = time.time() - started
+    write_report(args.report, metrics, names, total_seconds)
+    print(f"📄 Reporte generado en: {args.report}")
+    print(f"⏱ {total_seconds:.1f} segundos")
+
+
+if __name__ == "__main__":
+    main()
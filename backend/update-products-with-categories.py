@@ -1,33 +1,32 @@
-from sqlalchemy.orm import Session
+import argparse
+
+import category_mapping
 from database import SessionLocal
-from models import Product, RetailerCategory
 
-def update_products_category_ids(db: Session):
-    updated_count = 0
+# Aplica todos los mapeos de retailer_categories a los productos (ver category_mapping.py).
+# PATCH /retailer-categories/{id}/map ya aplica el mapeo que cambia; esto sirve para los mapeos
+# cargados a mano en la base o para los productos nuevos de categorías ya mapeadas.
 
-    # Tomamos todas las retailer_categories que ya tienen un category_id
-    mappings = db.query(RetailerCategory).filter(RetailerCategory.category_id != None).all()
-    mappings_count = len(mappings)
-    current_mapping = 0
 
-    for rc in mappings:
-        print(f"🟢 Procesando retailer_category: {rc.name} - category_id: {rc.category_id}")
-        print(f"Actualizando productos para retailer_category {current_mapping + 1} de {mappings_count}")
-        # Para cada mapeo aplicamos la categoría al producto correspondiente
-        products_to_update = db.query(Product).filter(
-            Product.retailer_id == rc.retailer_id,
-            Product.retail_category == rc.name
-        ).all()
+def main():
+    parser = argparse.ArgumentParser(description="Aplica los mapeos de categorías de los retailers a los productos.")
+    parser.add_argument("--dry-run", action="store_true", help="Contar los productos que cambiarían sin escribir")
+    args = parser.parse_args()
 
-        for product in products_to_update:
-            product.category_id = rc.category_id
-            updated_count += 1
+    db = SessionLocal()
+    try:
+        result = category_mapping.run(db, dry_run=args.dry_run)
+    finally:
+        db.close()
 
-        db.commit()
-        current_mapping += 1
+    if args.dry_run:
+        for change in result["changes"]:
+            print(f"🟢 {change['retailer']} / {change['name']} → {change['category']}: {change['products']} productos")
+        print(f"💡 --dry-run: {result['products']} productos cambiarían con {result['mappings']} mapeos (no se escribió nada)")
+    else:
+        print(f"✅ Se actualizaron {result['products']} productos con su category_id correspondiente.")
+    print(f"⏱ {result['seconds']} segundos")
 
-    print(f"✅ Se actualizaron {updated_count} productos con su category_id correspondiente.")
 
 if __name__ == "__main__":
-    db = SessionLocal()
-    update_products_category_ids(db)
+    main()
@@ -1,2 +0,0 @@
-ALTER TABLE products
-ADD COLUMN ai_description TEXT
\ No newline at end of file
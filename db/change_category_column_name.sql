@@ -1,2 +0,0 @@
-ALTER TABLE public.products
-RENAME COLUMN category TO retail_category;
@@ -1,5 +0,0 @@
-CREATE TABLE retailers (
-    id SERIAL PRIMARY KEY,
-    name TEXT NOT NULL,
-    url TEXT NOT NULL
-);
@@ -1 +0,0 @@
-pg_dump -s -h localhost -U postgres -d shops_arbitrage > schema.sql
\ No newline at end of file
@@ -1,352 +0,0 @@
---
--- PostgreSQL database dump
---
-
--- Dumped from database version 14.17 (Homebrew)
--- Dumped by pg_dump version 14.17 (Homebrew)
-
-SET statement_timeout = 0;
-SET lock_timeout = 0;
-SET idle_in_transaction_session_timeout = 0;
-SET client_encoding = 'UTF8';
-SET standard_conforming_strings = on;
-SELECT pg_catalog.set_config('search_path', '', false);
-SET check_function_bodies = false;
-SET xmloption = content;
-SET client_min_messages = warning;
-SET row_security = off;
-
-SET default_tablespace = '';
-
-SET default_table_access_method = heap;
-
---
--- Name: categories; Type: TABLE; Schema: public; Owner: postgres
---
-
-CREATE TABLE public.categories (
-    id integer NOT NULL,
-    name text NOT NULL
-);
-
-
-ALTER TABLE public.categories OWNER TO postgres;
-
---
--- Name: categories_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
---
-
-CREATE SEQUENCE public.categories_id_seq
-    AS integer
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-
-ALTER TABLE public.categories_id_seq OWNER TO postgres;
-
---
--- Name: categories_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
---
-
-ALTER SEQUENCE public.categories_id_seq OWNED BY public.categories.id;
-
-
---
--- Name: historical_prices; Type: TABLE; Schema: public; Owner: postgres
---
-
-CREATE TABLE public.historical_prices (
-    id integer NOT NULL,
-    product_id integer,
-    original_price numeric,
-    final_price numeric,
-    date_recorded timestamp without time zone DEFAULT CURRENT_TIMESTAMP
-);
-
-
-ALTER TABLE public.historical_prices OWNER TO postgres;
-
---
--- Name: historical_prices_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
---
-
-CREATE SEQUENCE public.historical_prices_id_seq
-    AS integer
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-
-ALTER TABLE public.historical_prices_id_seq OWNER TO postgres;
-
---
--- Name: historical_prices_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
---
-
-ALTER SEQUENCE public.historical_prices_id_seq OWNED BY public.historical_prices.id;
-
-
---
--- Name: products; Type: TABLE; Schema: public; Owner: postgres
---
-
-CREATE TABLE public.products (
-    id integer NOT NULL,
-    title text,
-    url text,
-    image text,
-    retail_category text,
-    added_date timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
-    updated_date timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
-    original_price numeric(10,2),
-    final_price numeric(10,2),
-    retailer_id integer,
-    category_id integer,
-    searchable_term text,
-    ai_description text
-);
-
-
-ALTER TABLE public.products OWNER TO postgres;
-
---
--- Name: products_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
---
-
-CREATE SEQUENCE public.products_id_seq
-    AS integer
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-
-ALTER TABLE public.products_id_seq OWNER TO postgres;
-
---
--- Name: products_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
---
-
-ALTER SEQUENCE public.products_id_seq OWNED BY public.products.id;
-
-
---
--- Name: retailer_categories; Type: TABLE; Schema: public; Owner: postgres
---
-
-CREATE TABLE public.retailer_categories (
-    id integer NOT NULL,
-    retailer_id integer NOT NULL,
-    name text NOT NULL,
-    category_id integer
-);
-
-
-ALTER TABLE public.retailer_categories OWNER TO postgres;
-
---
--- Name: retailer_categories_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
---
-
-CREATE SEQUENCE public.retailer_categories_id_seq
-    AS integer
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-
-ALTER TABLE public.retailer_categories_id_seq OWNER TO postgres;
-
---
--- Name: retailer_categories_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
---
-
-ALTER SEQUENCE public.retailer_categories_id_seq OWNED BY public.retailer_categories.id;
-
-
---
--- Name: retailers; Type: TABLE; Schema: public; Owner: postgres
---
-
-CREATE TABLE public.retailers (
-    id integer NOT NULL,
-    name text NOT NULL,
-    url text NOT NULL
-);
-
-
-ALTER TABLE public.retailers OWNER TO postgres;
-
---
--- Name: retailers_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
---
-
-CREATE SEQUENCE public.retailers_id_seq
-    AS integer
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-
-ALTER TABLE public.retailers_id_seq OWNER TO postgres;
-
---
--- Name: retailers_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
---
-
-ALTER SEQUENCE public.retailers_id_seq OWNED BY public.retailers.id;
-
-
---
--- Name: categories id; Type: DEFAULT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.categories ALTER COLUMN id SET DEFAULT nextval('public.categories_id_seq'::regclass);
-
-
---
--- Name: historical_prices id; Type: DEFAULT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.historical_prices ALTER COLUMN id SET DEFAULT nextval('public.historical_prices_id_seq'::regclass);
-
-
---
--- Name: products id; Type: DEFAULT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.products ALTER COLUMN id SET DEFAULT nextval('public.products_id_seq'::regclass);
-
-
---
--- Name: retailer_categories id; Type: DEFAULT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailer_categories ALTER COLUMN id SET DEFAULT nextval('public.retailer_categories_id_seq'::regclass);
-
-
---
--- Name: retailers id; Type: DEFAULT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailers ALTER COLUMN id SET DEFAULT nextval('public.retailers_id_seq'::regclass);
-
-
---
--- Name: categories categories_name_key; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.categories
-    ADD CONSTRAINT categories_name_key UNIQUE (name);
-
-
---
--- Name: categories categories_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.categories
-    ADD CONSTRAINT categories_pkey PRIMARY KEY (id);
-
-
---
--- Name: historical_prices historical_prices_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.historical_prices
-    ADD CONSTRAINT historical_prices_pkey PRIMARY KEY (id);
-
-
---
--- Name: products products_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.products
-    ADD CONSTRAINT products_pkey PRIMARY KEY (id);
-
-
---
--- Name: products products_url_key; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.products
-    ADD CONSTRAINT products_url_key UNIQUE (url);
-
-
---
--- Name: retailer_categories retailer_categories_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailer_categories
-    ADD CONSTRAINT retailer_categories_pkey PRIMARY KEY (id);
-
-
---
--- Name: retailer_categories retailer_categories_retailer_id_name_key; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailer_categories
-    ADD CONSTRAINT retailer_categories_retailer_id_name_key UNIQUE (retailer_id, name);
-
-
---
--- Name: retailers retailers_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailers
-    ADD CONSTRAINT retailers_pkey PRIMARY KEY (id);
-
-
---
--- Name: retailers unique_retailer_url; Type: CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailers
-    ADD CONSTRAINT unique_retailer_url UNIQUE (url);
-
-
---
--- Name: historical_prices historical_prices_product_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.historical_prices
-    ADD CONSTRAINT historical_prices_product_id_fkey FOREIGN KEY (product_id) REFERENCES public.products(id);
-
-
---
--- Name: products products_retailer_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.products
-    ADD CONSTRAINT products_retailer_id_fkey FOREIGN KEY (retailer_id) REFERENCES public.retailers(id);
-
-
---
--- Name: retailer_categories retailer_categories_category_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailer_categories
-    ADD CONSTRAINT retailer_categories_category_id_fkey FOREIGN KEY (category_id) REFERENCES public.categories(id);
-
-
---
--- Name: retailer_categories retailer_categories_retailer_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
---
-
-ALTER TABLE ONLY public.retailer_categories
-    ADD CONSTRAINT retailer_categories_retailer_id_fkey FOREIGN KEY (retailer_id) REFERENCES public.retailers(id);
-
-
---
--- PostgreSQL database dump complete
---
-
@@ -208,6 +208,16 @@ export default function ProductPage() {
                 {formatCurrency(product.original_price)}
               </p>
             )}
+            {product.price_stats?.is_all_time_low && (
+              <p className="text-sm font-medium text-green-600 dark:text-green-400">
+                📉 Precio más bajo registrado
+              </p>
+            )}
+            {product.price_stats?.min_final_price != null && !product.price_stats.is_all_time_low && (
+              <p className="text-sm text-gray-500 dark:text-gray-400">
+                Mínimo registrado: {formatCurrency(product.price_stats.min_final_price)}
+              </p>
+            )}
           </div>
 
           {/* Botón de compra */}
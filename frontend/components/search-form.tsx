@@ -7,7 +7,7 @@ import { useRouter, useSearchParams } from "next/navigation"
 import { Input } from "@/components/ui/input"
 import { Button } from "@/components/ui/button"
 import { ProductList } from "./product-list"
-import type { Product, ProductResponse } from "@/lib/types"
+import type { Product, ProductFacets, ProductResponse } from "@/lib/types"
 import { 
   Search, 
   SlidersHorizontal,
@@ -69,6 +69,14 @@ export function SearchForm() {
   // Paginado
   const [page, setPage] = useState(1)
   const [totalPages, setTotalPages] = useState(1)
+  // Cursor de la página siguiente: "Siguiente" no le hace recorrer al backend las páginas anteriores
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  // Con muchos resultados el total es estimado: no se ofrece saltar a la "última" página
+  const [totalExact, setTotalExact] = useState(true)
+  // Resultados por retailer / categoría con los filtros actuales (los vacíos se muestran en 0)
+  const [facets, setFacets] = useState<ProductFacets | null>(null)
+  const facetCount = (items: ProductFacets["retailers"] | undefined, value: string) =>
+    items?.find(item => item.value === value)?.count ?? 0
   const limit = 20 // o el número que prefieras
 
   
@@ -97,7 +105,7 @@ export function SearchForm() {
   }, [])
 
 
-  const fetchProducts = async (pageToLoad: number) => {
+  const fetchProducts = async (pageToLoad: number, cursor?: string | null) => {
     setLoading(true)
     setSearched(true)
     event({
@@ -108,9 +116,10 @@ export function SearchForm() {
     
   
     try {
-      let url = `${process.env.NEXT_PUBLIC_API_BASE_URL}/products?query=${encodeURIComponent(searchQuery)}&page=${pageToLoad}&limit=${limit}`
+      let url = `${process.env.NEXT_PUBLIC_API_BASE_URL}/products?query=${encodeURIComponent(searchQuery)}&page=${pageToLoad}&limit=${limit}&facets=true`
   
       if (sortBy) url += `&sort=${sortBy}`
+      if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`
       if (selectedRetailers.length > 0) url += `&retailers=${selectedRetailers.join(',')}`
       if (selectedCategories.length > 0) url += `&categories=${selectedCategories.join('|')}`
       url += `&minPrice=${priceRange[0]}&maxPrice=${priceRange[1]}`
@@ -119,6 +128,9 @@ export function SearchForm() {
       const result: ProductResponse = await response.json()
       setProducts(result.data)
       setTotalPages(Math.ceil(result.total / limit))
+      setNextCursor(result.next_cursor)
+      setTotalExact(result.total_exact)
+      setFacets(result.facets)
       setPage(pageToLoad) // actualizás el estado recién después de éxito
   
       // Actualizar la URL
@@ -238,6 +250,7 @@ export function SearchForm() {
                       <SelectValue placeholder="Seleccionar orden" />
                     </SelectTrigger>
                     <SelectContent>
+                      <SelectItem value="relevance">Relevancia</SelectItem>
                       <SelectItem value="name_asc">Nombre (A-Z)</SelectItem>
                       <SelectItem value="name_desc">Nombre (Z-A)</SelectItem>
                       <SelectItem value="price_asc">Precio (menor a mayor)</SelectItem>
@@ -274,6 +287,7 @@ export function SearchForm() {
                               className="text-sm cursor-pointer"
                             >
                               {retailer}
+                              {facets && <span className="ml-1 text-muted-foreground">({facetCount(facets.retailers, retailer)})</span>}
                             </Label>
                           </div>
                         ))}
@@ -304,6 +318,7 @@ export function SearchForm() {
                               className="text-sm cursor-pointer"
                             >
                               {category}
+                              {facets && <span className="ml-1 text-muted-foreground">({facetCount(facets.categories, category)})</span>}
                             </Label>
                           </div>
                         ))}
@@ -383,10 +398,11 @@ export function SearchForm() {
           <div className="flex flex-wrap gap-2">
             {sortBy && (
               <Badge variant="secondary" className="flex items-center gap-1 pr-1">
-                {sortBy.includes('name') ? 'Nombre' : 
+                {sortBy === 'relevance' ? 'Relevancia' :
+                 sortBy.includes('name') ? 'Nombre' : 
                  sortBy.includes('price') ? 'Precio' : 
                  sortBy.includes('retailer') ? 'Retailer' : 'Fecha'} 
-                {sortBy.includes('asc') ? '↑' : '↓'}
+                {sortBy === 'relevance' ? '' : sortBy.includes('asc') ? '↑' : '↓'}
                 <Button 
                   variant="ghost" 
                   size="icon" 
@@ -481,6 +497,7 @@ export function SearchForm() {
                       </span>
                     </SelectTrigger>
                     <SelectContent align="end">
+                      <SelectItem value="relevance">Relevancia</SelectItem>
                       <SelectItem value="name_asc">Nombre (A-Z)</SelectItem>
                       <SelectItem value="name_desc">Nombre (Z-A)</SelectItem>
                       <SelectItem value="price_asc">Precio (menor a mayor)</SelectItem>
@@ -569,7 +586,7 @@ export function SearchForm() {
                       </PaginationItem>
                     )}
 
-                    {page < totalPages - 1 && (
+                    {totalExact && page < totalPages - 1 && (
                       <PaginationItem>
                         <PaginationLink href="#" onClick={(e) => {
                           e.preventDefault()
@@ -586,7 +603,7 @@ export function SearchForm() {
                       </PaginationItem>
                     )}
 
-                    {page < totalPages && (
+                    {(page < totalPages || nextCursor) && (
                       <PaginationItem>
                         <PaginationNext
                           href="#"
@@ -598,7 +615,7 @@ export function SearchForm() {
                               label: `page ${page + 1}`, // o `page ${page - 1}`, `page ${page + 1}`, etc.
                             })
                             
-                            fetchProducts(page + 1)
+                            fetchProducts(page + 1, nextCursor)
                           }}
                         />
                       </PaginationItem>
@@ -15,9 +15,23 @@ export interface Product {
 }
 
 
+export interface FacetCount {
+  value: string
+  count: number
+}
+
+export interface ProductFacets {
+  retailers: FacetCount[]
+  categories: FacetCount[]
+  prices: { min: number; max: number | null; count: number }[]
+}
+
 export interface ProductResponse {
   data: Product[]
   total: number
+  total_exact: boolean
   page: number
   limit: number
+  next_cursor: string | null
+  facets: ProductFacets | null
 }
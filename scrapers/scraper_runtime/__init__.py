@@ -0,0 +1,13 @@
+from .adapter import CategoryTarget, RetailerAdapter, ScrapedProduct
+from .engine import ScrapeEngine, ScrapeStats, run
+from .prices import parse_price
+
+__all__ = [
+    "CategoryTarget",
+    "RetailerAdapter",
+    "ScrapedProduct",
+    "ScrapeEngine",
+    "ScrapeStats",
+    "run",
+    "parse_price",
+]
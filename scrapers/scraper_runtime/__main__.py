@@ -0,0 +1,27 @@
+import argparse
+
+from .adapters import ADAPTERS, get_adapter
+from .engine import run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrapea un retailer con el runtime compartido.")
+    parser.add_argument("retailer", choices=sorted(ADAPTERS))
+    parser.add_argument("--concurrency", type=int, default=None, help="Categorías en paralelo (por defecto, la del adapter)")
+    parser.add_argument("--fresh", action="store_true", help="Empezar una corrida nueva aunque la anterior haya quedado a medias")
+    parser.add_argument("--incremental", action=argparse.BooleanOptionalAction, default=None,
+                        help="Saltear páginas sin cambios desde la última corrida (por defecto, lo que diga el adapter)")
+    parser.add_argument("--adaptive", action=argparse.BooleanOptionalAction, default=None,
+                        help="Visitar menos seguido las categorías que no cambian (requiere --incremental)")
+    args = parser.parse_args()
+    run(
+        get_adapter(args.retailer),
+        concurrency=args.concurrency,
+        resume=not args.fresh,
+        incremental=args.incremental,
+        adaptive=args.adaptive,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import html
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .waits import wait_for_items
+
+
+def css(selector):
+    """Selector CSS precompilado: `soup.select(str)` vuelve a resolver el selector en cada item."""
+    return soupsieve.compile(selector)
+
+
+def class_strainer(tag, css_class):
+    """SoupStrainer por una clase CSS aunque el elemento tenga varias.
+
+    Mientras se parsea, `class` llega como un solo string ("item product product-item"),
+    así que `class_="product-item"` solo matchearía elementos con esa única clase.
+    """
+    return SoupStrainer(tag, class_=re.compile(rf"(^|\s){re.escape(css_class)}(\s|$)"))
+
+
+@dataclass
+class CategoryTarget:
+    url: str
+    slug: str
+
+
+@dataclass
+class ScrapedProduct:
+    title: str
+    url: str
+    final_price: Optional[float]
+    original_price: Optional[float] = None
+    image: str = ""
+    # None = el retailer no informa stock, se conserva el valor guardado
+    out_of_stock: Optional[bool] = None
+
+
+class ParsedPage(list):
+    """Productos de una página, con cuántos items traía antes de descartar los inválidos.
+
+    El fin de la paginación se decide con `raw_count`: una página llena con algunos items
+    descartados (sin stock, sin URL) no es la última.
+    """
+
+    def __init__(self, products=(), raw_count=0):
+        super().__init__(products)
+        self.raw_count = raw_count
+
+
+class RetailerAdapter:
+    """Lo único que cambia entre retailers: categorías, cómo se pide una página y cómo se parsea.
+
+    El engine se encarga de la conexión, el driver, los reintentos, la persistencia y los tiempos.
+    """
+
+    name = ""
+    url = ""
+    # Sufijo del log de errores: scraper_errors_<log_name>.log
+    log_name = ""
+    category_urls = []
+
+    # Paginación: si es False, cada categoría es una sola página (scroll / "ver más")
+    paginated = True
+    page_param = "page"
+    # Intentos por página antes de darla por vacía
+    max_attempts = 1
+    # Si una página trae menos items que esto, es la última
+    min_items_per_page = 1
+    # Páginas acumuladas por cada escritura en la DB
+    pages_per_flush = 1
+
+    # "http": httpx primero (HTML server-side o JSON), "selenium": navegador headless
+    fetch_mode = "selenium"
+    # Si el modo http falla para una categoría, se reintenta con Selenium
+    selenium_fallback = True
+
+    # Concurrencia: categorías en paralelo y cortesía con el sitio
+    concurrency = 1
+    max_requests_per_host = 2
+    # Segundos mínimos entre requests al mismo host
+    min_request_interval = 0.0
+
+    # Parseo: lxml es bastante más rápido que html.parser, y `item_strainer` (SoupStrainer)
+    # limita el árbol a los items del listado en vez de armar toda la página
+    html_parser = "lxml"
+    item_strainer = None
+
+    # Modo incremental: no reescribir páginas cuyo fingerprint (URLs + precios) no cambió,
+    # y opcionalmente visitar menos seguido las categorías que no cambian
+    incremental = False
+    adaptive_revisits = False
+
+    # Selenium
+    # CSS de los items del listado: el fetch espera a que la grilla esté cargada y quieta.
+    # Sin selector se vuelve a la espera fija de `page_load_wait` segundos.
+    item_selector = None
+    page_load_wait = 3
+    # Techo de la espera inicial y de cada scroll / click en "ver más"
+    ready_timeout = 15
+    load_more_timeout = 5
+    # Segundos que la cantidad de items tiene que quedar fija para dar la grilla por cargada
+    settle_time = 0.75
+    window_size = None
+    user_agent = None
+    stealth = False
+    # Pool de navegadores: None = uno por worker (`concurrency`)
+    browser_pool_size = None
+    # Levantar los navegadores antes de empezar y cargarles la home (cookies, cache)
+    warm_browsers = True
+    # Perfil de Chrome persistente entre corridas (ver SCRAPER_PROFILE_DIR)
+    persistent_profile = True
+    # Bloquear imágenes, fuentes y analytics (browser.DEFAULT_BLOCKED_URLS) más `blocked_urls`
+    block_resources = True
+    blocked_urls = []
+
+    def __init__(self, category_urls=None):
+        if category_urls is not None:
+            self.category_urls = list(category_urls)
+
+    # ─────────────────────────────────────────────────────────
+    # Categorías
+
+    def categories(self):
+        return [CategoryTarget(url=url, slug=self.category_slug(url)) for url in self.category_urls]
+
+    def category_slug(self, category_url):
+        return category_url.rstrip("/").split("/")[-1]
+
+    # ─────────────────────────────────────────────────────────
+    # Fetch
+
+    def page_url(self, category, page):
+        if not self.paginated:
+            return category.url
+        return f"{category.url}?{self.page_param}={page}"
+
+    def fetch_http(self, http, category, page):
+        return http.get_text(self.page_url(category, page))
+
+    def fetch_page(self, driver, url):
+        driver.get(url)
+        if self.item_selector:
+            wait_for_items(driver, self.item_selector, timeout=self.ready_timeout, settle=self.settle_time)
+        else:
+            time.sleep(self.page_load_wait)
+        self.prepare_page(driver)
+        return driver.page_source
+
+    # Hook para scrolls o clicks en "ver más" (ver waits.scroll_until_complete / click_until_exhausted)
+    def prepare_page(self, driver):
+        pass
+
+    # ─────────────────────────────────────────────────────────
+    # Parseo
+
+    # Lo que devuelve fetch_http: por defecto el mismo HTML que renderiza Selenium
+    def parse_http(self, payload, category):
+        return self.parse_page(payload, category)
+
+    def is_last_page(self, products, mode):
+        return not self.paginated or len(products) < self.min_items_per_page
+
+    def parse_page(self, page_html, category):
+        soup = BeautifulSoup(page_html, self.html_parser, parse_only=self.item_strainer)
+        products = []
+        for item in self.select_items(soup):
+            try:
+                product = self.parse_item(item, category)
+            except Exception as e:
+                logging.error(f"🛑 Error procesando producto en {category.slug}: {e}")
+                continue
+            if product and product.title and product.url:
+                products.append(product)
+        return products
+
+    def select_items(self, soup):
+        raise NotImplementedError
+
+    def parse_item(self, item, category):
+        raise NotImplementedError
+
+    # ─────────────────────────────────────────────────────────
+    # Helpers
+
+    def absolute_url(self, href):
+        if not href:
+            return ""
+        if href.startswith("http"):
+            return href
+        return self.url.rstrip("/") + href
+
+    @staticmethod
+    def text_of(tag):
+        return tag.get_text(strip=True) if tag else ""
+
+    @staticmethod
+    def clean_title(title):
+        return html.escape(title)
@@ -0,0 +1,35 @@
+from .cetrogar import CetrogarAdapter
+from .fravega import FravegaAdapter
+from .garbarino import GarbarinoAdapter
+from .megatone import MegatoneAdapter
+from .musimundo import MusimundoAdapter
+from .naldo import NaldoAdapter
+from .novogar import NovogarAdapter
+from .oncity import OnCityAdapter
+from .pardo import PardoAdapter
+from .philco import PhilcoAdapter
+from .samsung import SamsungAdapter
+from .whirlpool import WhirlpoolAdapter
+
+# Nombre usado en la línea de comandos / workflow → adapter
+ADAPTERS = {
+    "cetrogar": CetrogarAdapter,
+    "fravega": FravegaAdapter,
+    "garbarino": GarbarinoAdapter,
+    "megatone": MegatoneAdapter,
+    "musimundo": MusimundoAdapter,
+    "naldo": NaldoAdapter,
+    "novogar": NovogarAdapter,
+    "oncity": OnCityAdapter,
+    "pardo": PardoAdapter,
+    "philco": PhilcoAdapter,
+    "samsung-argentina": SamsungAdapter,
+    "whirlpool-argentina": WhirlpoolAdapter,
+}
+
+
+def get_adapter(name, **kwargs):
+    try:
+        return ADAPTERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Retailer desconocido: {name}. Opciones: {', '.join(sorted(ADAPTERS))}")
@@ -0,0 +1,63 @@
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer
+from ..prices import parse_price
+
+CATEGORY_URLS = [
+    "https://www.cetrogar.com.ar/tecnologia.html",
+    "https://www.cetrogar.com.ar/electrodomesticos.html",
+    "https://www.cetrogar.com.ar/bazar-y-decoracion.html",
+    "https://www.cetrogar.com.ar/belleza-y-cuidado-personal.html",
+    "https://www.cetrogar.com.ar/hogar.html",
+    "https://www.cetrogar.com.ar/herramientas.html",
+    "https://www.cetrogar.com.ar/deportes-y-fitness.html",
+    "https://www.cetrogar.com.ar/bebes-y-ninos.html",
+    "https://www.cetrogar.com.ar/otras-categorias.html",
+]
+
+
+class CetrogarAdapter(RetailerAdapter):
+    name = "Cetrogar"
+    url = "https://www.cetrogar.com.ar"
+    log_name = "cetrogar"
+    category_urls = CATEGORY_URLS
+    item_selector = "li.item.product.product-item"
+    item_strainer = class_strainer("li", "product-item")
+    fetch_mode = "http"
+    page_param = "p"
+
+    def category_slug(self, category_url):
+        return category_url.split("/")[-1].replace(".html", "")
+
+    def select_items(self, soup):
+        return soup.find_all("li", class_="item product product-item images-deferred")
+
+    def parse_item(self, product, category):
+        title = self.text_of(product.find("div", class_="product name product-item-name")) or "Sin título"
+        link_tag = product.find("a", class_="product-item-info product-card", href=True)
+        img_tag = product.find("img", class_="product-image-photo")
+
+        price_box = product.find("div", class_="price-box price-final_price")
+        original_price_str = ""
+        final_price_str = ""
+        if price_box:
+            discount_span = price_box.find("span", class_="special-price")
+            if discount_span:
+                old_price_container = price_box.find("span", class_="old-price")
+                if old_price_container:
+                    original_price_str = self.text_of(old_price_container.find("span", class_="price"))
+                final_price_str = self.text_of(discount_span.find("span", class_="price"))
+            else:
+                final_price_elem = price_box.find("span", id=lambda x: x and x.startswith("product-price-"))
+                if final_price_elem:
+                    final_price_str = self.text_of(final_price_elem)
+                else:
+                    price_spans = price_box.find_all("span", class_="price")
+                    if price_spans:
+                        final_price_str = price_spans[-1].get_text(strip=True)
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=link_tag["href"] if link_tag else "",
+            final_price=parse_price(final_price_str),
+            original_price=parse_price(original_price_str),
+            image=img_tag["src"] if img_tag and img_tag.has_attr("src") else "",
+        )
@@ -0,0 +1,95 @@
+from bs4 import SoupStrainer
+
+from ..adapter import RetailerAdapter, ScrapedProduct
+from ..prices import parse_price
+
+CATEGORY_URLS = [
+    "https://www.fravega.com/l/articulos-de-libreria-y-papeleria/",
+    "https://www.fravega.com/l/audio/",
+    "https://www.fravega.com/l/bebes-y-primera-infancia/",
+    "https://www.fravega.com/l/belleza-y-cuidado-corporal/",
+    "https://www.fravega.com/l/camaras-y-video-camaras/",
+    "https://www.fravega.com/l/camping-y-aire-libre/",
+    "https://www.fravega.com/l/celulares/",
+    "https://www.fravega.com/l/climatizacion/",
+    "https://www.fravega.com/l/cocina/",
+    "https://www.fravega.com/l/deportes-y-fitness/",
+    "https://www.fravega.com/l/domotica/",
+    "https://www.fravega.com/l/equipos-para-auto/",
+    "https://www.fravega.com/l/heladeras-freezers-y-cavas/",
+    "https://www.fravega.com/l/herramientas-y-construccion/griferias/",
+    "https://www.fravega.com/l/herramientas-y-construccion/herramientas/",
+    "https://www.fravega.com/l/herramientas-y-construccion/muebles-de-bano/",
+    "https://www.fravega.com/l/herramientas-y-construccion/pintureria/",
+    "https://www.fravega.com/l/herramientas-y-construccion/pisos-y-revestimientos,herramientas-y-construccion/ceramicos/",
+    "https://www.fravega.com/l/herramientas-y-construccion/plomeria/",
+    "https://www.fravega.com/l/herramientas-y-construccion/sanitarios/",
+    "https://www.fravega.com/l/hogar/bano/",
+    "https://www.fravega.com/l/hogar/bazar/",
+    "https://www.fravega.com/l/hogar/colchones-y-sommiers/",
+    "https://www.fravega.com/l/hogar/decoracion/",
+    "https://www.fravega.com/l/hogar/ropa-de-cama/",
+    "https://www.fravega.com/l/iluminacion/",
+    "https://www.fravega.com/l/indumentaria/",
+    "https://www.fravega.com/l/informatica/",
+    "https://www.fravega.com/l/instrumentos-musicales/",
+    "https://www.fravega.com/l/jardin/",
+    "https://www.fravega.com/l/juguetes-y-juegos/juegos-de-aire-libre/",
+    "https://www.fravega.com/l/juguetes-y-juegos/juegos-didacticos,bebes-y-primera-infancia/",
+    "https://www.fravega.com/l/juguetes-y-juegos/juguetes-electronicos/",
+    "https://www.fravega.com/l/juguetes-y-juegos/peluches-y-munecos-interactivos,juguetes-y-juegos/",
+    "https://www.fravega.com/l/juguetes-y-juegos/rodados-para-ninos/",
+    "https://www.fravega.com/l/juguetes-y-juegos/sets-y-otros/",
+    "https://www.fravega.com/l/lavado/",
+    "https://www.fravega.com/l/mascotas/",
+    "https://www.fravega.com/l/muebles/",
+    "https://www.fravega.com/l/pequenos-electrodomesticos/",
+    "https://www.fravega.com/l/relojes/",
+    "https://www.fravega.com/l/salud-y-bienestar/",
+    "https://www.fravega.com/l/seguridad-para-el-hogar/",
+    "https://www.fravega.com/l/termotanques-y-calefones/",
+    "https://www.fravega.com/l/tv-y-video/",
+    "https://www.fravega.com/l/videojuegos/",
+]
+
+
+class FravegaAdapter(RetailerAdapter):
+    name = "Fravega"
+    url = "https://www.fravega.com"
+    log_name = "fravega"
+    category_urls = CATEGORY_URLS
+    fetch_mode = "http"
+    max_attempts = 3
+    # ~46 categorías: antes se partían a mano en dos scripts
+    concurrency = 4
+    max_requests_per_host = 4
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+
+    item_selector = "article[data-test-id='result-item']"
+    item_strainer = SoupStrainer("article", attrs={"data-test-id": "result-item"})
+    ready_timeout = 10
+
+    def category_slug(self, category_url):
+        return category_url.split("/l/")[-1].strip("/")
+
+    def select_items(self, soup):
+        return soup.find_all("article", {"data-test-id": "result-item"})
+
+    def parse_item(self, article, category):
+        title = article.find("span", class_="sc-ca346929-0")
+        title_text = self.text_of(title) or "Sin título"
+
+        price_block = article.find("div", {"data-test-id": "product-price"})
+        original_price_tag = price_block.find("span", class_="sc-66d25270-0") if price_block else None
+        final_price_tag = price_block.find("span", class_="sc-1d9b1d9e-0") if price_block else None
+
+        link_tag = article.find("a", href=True)
+        img_tag = article.find("img")
+
+        return ScrapedProduct(
+            title=self.clean_title(title_text),
+            url=self.absolute_url(link_tag["href"]) if link_tag else "",
+            final_price=parse_price(self.text_of(final_price_tag)),
+            original_price=parse_price(self.text_of(original_price_tag)),
+            image=img_tag["src"] if img_tag and img_tag.has_attr("src") else "",
+        )
@@ -0,0 +1,66 @@
+from bs4 import SoupStrainer
+
+from ..adapter import RetailerAdapter, ScrapedProduct
+from ..prices import parse_price
+
+CATEGORY_URLS = [
+    "https://www.garbarino.com/celulares-notebooks-y-tecnologia",
+    "https://www.garbarino.com/smart-tv-audio-y-video",
+    "https://www.garbarino.com/electrodomesticos",
+    "https://www.garbarino.com/salud-y-belleza",
+    "https://www.garbarino.com/hogar-muebles-y-jardin",
+    "https://www.garbarino.com/bebes-y-ninos",
+    "https://www.garbarino.com/deportes-y-tiempo-libre",
+    "https://www.garbarino.com/construccion",
+    "https://www.garbarino.com/herramientas",
+    "https://www.garbarino.com/animales-y-mascotas",
+    "https://www.garbarino.com/moda-y-accesorios",
+    "https://www.garbarino.com/arte-libreria-y-merceria",
+    "https://www.garbarino.com/mas-categorias",
+]
+
+
+def _card_class(*parts):
+    return lambda cls: cls and "product-card" in cls and all(part in cls for part in parts)
+
+
+class GarbarinoAdapter(RetailerAdapter):
+    name = "Garbarino"
+    url = "https://www.garbarino.com"
+    log_name = "garbarino"
+    category_urls = CATEGORY_URLS
+    item_selector = "div[class*='product-card'][class*='vertical-wrapper']"
+    item_strainer = SoupStrainer("div", class_=_card_class("vertical-wrapper"))
+
+    def select_items(self, soup):
+        return soup.find_all("div", class_=_card_class("vertical-wrapper"))
+
+    def parse_item(self, product, category):
+        title = self.text_of(product.find("div", class_=_card_class("__name"))) or "Sin título"
+        if title == "Sin título":
+            return None
+
+        final_price_container = product.find("div", class_=_card_class("__price"))
+        final_price_str = ""
+        if final_price_container:
+            final_price_str = "".join(span.get_text(strip=True) for span in final_price_container.find_all("span"))
+
+        original_price_container = product.find("div", class_=_card_class("__prev-price"))
+        original_price_str = ""
+        if original_price_container:
+            original_price_str = "".join(span.get_text(strip=True) for span in original_price_container.find_all("span"))
+
+        link_tag = product.find("a", class_=lambda x: x and "card-anchor" in x)
+        img_tag = product.find("img", class_="ratio-image__image")
+
+        out_of_stock = "no-stock" in product.get("class", []) \
+            or product.find("div", class_=lambda c: c and "no-stock" in c) is not None
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(link_tag["href"]) if link_tag and "href" in link_tag.attrs else "",
+            final_price=parse_price(final_price_str),
+            original_price=parse_price(original_price_str),
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+            out_of_stock=out_of_stock,
+        )
@@ -0,0 +1,52 @@
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+
+CATEGORY_URLS = [
+    "https://www.megatone.net/listado/tv-audio-video/",
+    "https://www.megatone.net/listado/tecnologia/",
+    "https://www.megatone.net/listado/electrodomesticos/",
+    "https://www.megatone.net/listado/pequenos-electro-salud/",
+    "https://www.megatone.net/listado/hogar-deco/",
+    "https://www.megatone.net/listado/hogar-jardin/",
+    "https://www.megatone.net/listado/jardin-herramientas-construccion/",
+    "https://www.megatone.net/listado/deportes-tiempo-libre/",
+    "https://www.megatone.net/listado/bebes-ninos/",
+    "https://www.megatone.net/listado/otras-categorias/",
+]
+
+
+class MegatoneAdapter(RetailerAdapter):
+    name = "Megatone"
+    url = "https://www.megatone.net"
+    log_name = "megatone"
+    category_urls = CATEGORY_URLS
+    item_selector = "a.CajaProductoGrillaListado"
+    item_strainer = class_strainer("a", "CajaProductoGrillaListado")
+
+    ORIGINAL_PRICE = css("div.PrecioTachado")
+    DISCOUNTED_PRICE = css("div.Precio.fNova-Light")
+    PRICE = css("div.Precio.AjustePrecioMostrado")
+    fetch_mode = "http"
+    page_param = "p_"
+
+    def select_items(self, soup):
+        return soup.find_all("a", class_="CajaProductoGrillaListado")
+
+    def parse_item(self, product, category):
+        title = self.text_of(product.find("h3", class_="TituloListado")) or "Sin Título"
+
+        original_price_text = self.text_of(self.ORIGINAL_PRICE.select_one(product))
+        if original_price_text:
+            final_price_tag = self.DISCOUNTED_PRICE.select_one(product)
+        else:
+            final_price_tag = self.PRICE.select_one(product)
+
+        img_tag = product.find("img", class_="imagenListado")
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(product.get("href")),
+            final_price=parse_price(self.text_of(final_price_tag)),
+            original_price=parse_price(original_price_text),
+            image=img_tag.get("src") if img_tag else "",
+        )
@@ -0,0 +1,72 @@
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+from ..waits import scroll_until_complete
+
+CATEGORY_URLS = [
+    "https://www.musimundo.com/climatizacion/c/2",
+    "https://www.musimundo.com/audio-tv-video/c/3",
+    "https://www.musimundo.com/electrohogar/c/7",
+    "https://www.musimundo.com/telefonia/c/5",
+    "https://www.musimundo.com/informatica/c/6",
+    "https://www.musimundo.com/pequenos/c/8",
+    "https://www.musimundo.com/gaming/c/1",
+    "https://www.musimundo.com/cuidado-personal-y-salud/c/164",
+    "https://www.musimundo.com/hogar-y-aire-libre/c/10",
+    "https://www.musimundo.com/ninos/c/15",
+    "https://www.musimundo.com/camaras/c/4",
+    "https://www.musimundo.com/rodados/c/9",
+    "https://www.musimundo.com/audio-tv-video/accesorios-de-imagen-y-sonido/c/62",
+    "https://www.musimundo.com/mas-categorias/c/701",
+]
+
+
+class MusimundoAdapter(RetailerAdapter):
+    name = "Musimundo"
+    url = "https://www.musimundo.com"
+    log_name = "musimundo"
+    category_urls = CATEGORY_URLS
+    paginated = False
+    window_size = "1920,1080"
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+    stealth = True
+
+    item_selector = "div.product-card"
+    item_strainer = class_strainer("div", "product-card")
+    max_scroll_loops = 20
+
+    ITEMS = css("div.product-card")
+    TITLE = css("div.product-card_name")
+    PRICE = css("div.mus-pro-price")
+
+    def category_slug(self, category_url):
+        url_parts = category_url.split("/")
+        return url_parts[3] if len(url_parts) > 3 else "N/A"
+
+    # Scroll infinito hasta que un scroll deja de sumar productos
+    def prepare_page(self, driver):
+        scroll_until_complete(driver, self.item_selector, step_timeout=self.load_more_timeout, max_scrolls=self.max_scroll_loops)
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title = self.text_of(self.TITLE.select_one(product)) or "Sin título"
+
+        final_price_str = ""
+        price_container = self.PRICE.select_one(product)
+        if price_container:
+            price_tag = price_container.find("span", {"data-test-item-price": True})
+            if price_tag:
+                final_price_str = self.text_of(price_tag.find("span"))
+
+        a_tag = product.find("a", class_="mus-pro-thumb")
+        img_tag = product.find("img")
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(a_tag["href"]) if a_tag and "href" in a_tag.attrs else "",
+            final_price=parse_price(final_price_str),
+            # No disponible por ahora
+            original_price=None,
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+        )
@@ -0,0 +1,45 @@
+from ..adapter import ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+from .vtex import VtexAdapter
+
+CATEGORY_URLS = [
+    "https://www.naldo.com.ar/celulares/",
+    "https://www.naldo.com.ar/tv-audio-y-video",
+    "https://www.naldo.com.ar/climatizacion",
+    "https://www.naldo.com.ar/electrodomesticos",
+    "https://www.naldo.com.ar/tecnologia",
+    "https://www.naldo.com.ar/salud-belleza-y-fitness",
+    "https://www.naldo.com.ar/hogar-jardin-y-tiempo-libre",
+    "https://www.naldo.com.ar/rodados",
+]
+
+
+class NaldoAdapter(VtexAdapter):
+    name = "Naldo"
+    url = "https://www.naldo.com.ar"
+    log_name = "naldo"
+    category_urls = CATEGORY_URLS
+    item_selector = "div.naldoar-search-result-3-x-galleryItem"
+    item_strainer = class_strainer("div", "naldoar-search-result-3-x-galleryItem")
+
+    ITEMS = css("div.naldoar-search-result-3-x-galleryItem")
+    SELLING_PRICE = css("span.vtex-product-price-1-x-sellingPriceValue")
+    LIST_PRICE = css("span.vtex-product-price-1-x-listPriceValue")
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title = self.text_of(product.find("span", class_="vtex-product-summary-2-x-productBrand")) or "N/A"
+        final_price_tag = self.SELLING_PRICE.select_one(product)
+        original_price_tag = self.LIST_PRICE.select_one(product)
+        a_tag = product.find("a", class_="vtex-product-summary-2-x-clearLink")
+        img_tag = product.find("img", class_="vtex-product-summary-2-x-image")
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(a_tag["href"]) if a_tag and "href" in a_tag.attrs else "",
+            final_price=parse_price(self.text_of(final_price_tag)),
+            original_price=parse_price(self.text_of(original_price_tag)),
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+        )
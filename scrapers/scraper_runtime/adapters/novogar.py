@@ -0,0 +1,78 @@
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+from ..waits import scroll_until_complete
+
+CATEGORY_URLS = [
+    "https://www.novogar.com.ar/categorias/agua-caliente",
+    "https://www.novogar.com.ar/categorias/aire-acondicionado",
+    "https://www.novogar.com.ar/categorias/audio-y-video",
+    "https://www.novogar.com.ar/categorias/bicicletas",
+    "https://www.novogar.com.ar/categorias/calefaccion-",
+    "https://www.novogar.com.ar/categorias/cocinas",
+    "https://www.novogar.com.ar/categorias/colchones-y-sommier",
+    "https://www.novogar.com.ar/categorias/cuidado-personal",
+    "https://www.novogar.com.ar/categorias/electrodomesticos",
+    "https://www.novogar.com.ar/categorias/fitness",
+    "https://www.novogar.com.ar/categorias/gamer",
+    "https://www.novogar.com.ar/categorias/heladeras",
+    "https://www.novogar.com.ar/categorias/herramientas",
+    "https://www.novogar.com.ar/categorias/informatica",
+    "https://www.novogar.com.ar/categorias/jardin",
+    "https://www.novogar.com.ar/categorias/lavado",
+    "https://www.novogar.com.ar/categorias/limpieza-y-hogar",
+    "https://www.novogar.com.ar/categorias/luces",
+    "https://www.novogar.com.ar/categorias/muebles",
+    "https://www.novogar.com.ar/categorias/seguridad-para-el-hogar",
+    "https://www.novogar.com.ar/categorias/telefonia",
+    "https://www.novogar.com.ar/categorias/television-",
+    "https://www.novogar.com.ar/categorias/ventilacion",
+]
+
+
+class NovogarAdapter(RetailerAdapter):
+    name = "Novogar"
+    url = "https://www.novogar.com.ar"
+    log_name = "novogar"
+    category_urls = CATEGORY_URLS
+    paginated = False
+    window_size = "1920,1080"
+
+    item_selector = "div.one-product"
+    item_strainer = class_strainer("div", "one-product")
+    max_scrolls = 30
+
+    ITEMS = css("div.one-product")
+    TITLE = css("h3.product-card__name")
+    LINK = css("div.product-card a")
+    MOBILE_PRICE = css("p.frase_precio.cat-mobile-precioof")
+    REGULAR_PRICE = css("div.productCard_prices p.productCard_price_regular")
+    ORIGINAL_PRICE = css("p.productCard_price_regular:has(~ p.productCard_price_discount)")
+    IMAGES = css("div.productCard_img img")
+
+    # Scroll hasta cargar todos los productos
+    def prepare_page(self, driver):
+        scroll_until_complete(driver, self.item_selector, step_timeout=self.load_more_timeout, max_scrolls=self.max_scrolls)
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title = self.text_of(self.TITLE.select_one(product)) or "Sin título"
+        a_tag = self.LINK.select_one(product)
+
+        price_tag = self.MOBILE_PRICE.select_one(product) or self.REGULAR_PRICE.select_one(product)
+        final_price = parse_price(self.text_of(price_tag))
+
+        original_price_tag = self.ORIGINAL_PRICE.select_one(product)
+        original_price = parse_price(self.text_of(original_price_tag)) if original_price_tag else final_price
+
+        img_tags = self.IMAGES.select(product)
+        image_url = self.absolute_url(img_tags[-1]["src"]) if img_tags else ""
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(a_tag["href"]) if a_tag and "href" in a_tag.attrs else "",
+            final_price=final_price,
+            original_price=original_price,
+            image=image_url,
+        )
@@ -0,0 +1,51 @@
+from ..adapter import ScrapedProduct, css
+from ..prices import parse_price
+from .vtex import VtexAdapter
+
+CATEGORY_URLS = [
+    "https://www.oncity.com/aire-libre",
+    "https://www.oncity.com/audio-tv-y-video",
+    "https://www.oncity.com/arte-libreria-y-merceria",
+    "https://www.oncity.com/bebes",
+    "https://www.oncity.com/belleza-y-cuidado-personal",
+    "https://www.oncity.com/compra-internacional",
+    "https://www.oncity.com/deportes-y-fitness",
+    "https://www.oncity.com/electrodomesticos",
+    "https://www.oncity.com/herramientas-y-construccion",
+    "https://www.oncity.com/hogar",
+    "https://www.oncity.com/iluminacion",
+    "https://www.oncity.com/juegos-y-juguetes",
+    "https://www.oncity.com/mascotas",
+    "https://www.oncity.com/muebles",
+    "https://www.oncity.com/salud-y-equipamiento-medico",
+    "https://www.oncity.com/tecnologia",
+    "https://www.oncity.com/tiempo-libre",
+    "https://www.oncity.com/Autos-y-Motos",
+]
+
+
+class OnCityAdapter(VtexAdapter):
+    name = "OnCity"
+    url = "https://www.oncity.com"
+    log_name = "oncity"
+    category_urls = CATEGORY_URLS
+    item_selector = "div.vtex-search-result-3-x-galleryItem"
+    ITEMS = css(item_selector)
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title = self.text_of(product.find("span", class_="vtex-product-summary-2-x-productBrand")) or "Sin título"
+        final_price_container = product.find("span", class_="vtex-product-price-1-x-sellingPrice")
+        original_price_container = product.find("span", class_="vtex-product-price-1-x-listPrice")
+        a_tag = product.find("a", class_="vtex-product-summary-2-x-clearLink")
+        img_tag = product.find("img", class_="vtex-product-summary-2-x-imageNormal")
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(a_tag["href"]) if a_tag and "href" in a_tag.attrs else "",
+            final_price=parse_price(self.text_of(final_price_container)),
+            original_price=parse_price(self.text_of(original_price_container)),
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+        )
@@ -0,0 +1,71 @@
+from selenium.webdriver.common.by import By
+
+from ..adapter import ScrapedProduct, css
+from ..prices import parse_price
+from ..waits import click_until_exhausted, scroll_until_complete
+from .vtex import VtexAdapter
+
+CATEGORY_URLS = [
+    "https://www.pardo.com.ar/tv-y-video",
+    "https://www.pardo.com.ar/rodados",
+    "https://www.pardo.com.ar/bebes-y-ninos",
+    "https://www.pardo.com.ar/equipaje",
+    "https://www.pardo.com.ar/indumentaria-y-accesorios",
+    "https://www.pardo.com.ar/audio",
+    "https://www.pardo.com.ar/telefon%C3%ADa",
+    "https://www.pardo.com.ar/informatica",
+    "https://www.pardo.com.ar/electrodomesticos",
+    "https://www.pardo.com.ar/climatizacion",
+    "https://www.pardo.com.ar/hogar",
+    "https://www.pardo.com.ar/jardin",
+    "https://www.pardo.com.ar/belleza-y-salud",
+]
+
+
+class PardoAdapter(VtexAdapter):
+    name = "Pardo"
+    url = "https://www.pardo.com.ar"
+    log_name = "pardo"
+    category_urls = CATEGORY_URLS
+    min_items_per_page = 8
+    window_size = "1920,1080"
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    stealth = True
+
+    item_selector = "div.vtex-search-result-3-x-galleryItem"
+    ITEMS = css(item_selector)
+
+    def page_url(self, category, page):
+        return f"{category.url}/?page={page}"
+
+    # La grilla carga por lazy load al scrollear y a veces con un botón "Ver más"
+    def prepare_page(self, driver):
+        scroll_until_complete(driver, self.item_selector, step_timeout=self.load_more_timeout, max_scrolls=10, sweep=True)
+        click_until_exhausted(driver, self.find_load_more, self.item_selector, step_timeout=self.load_more_timeout)
+
+    @staticmethod
+    def find_load_more(driver):
+        buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Ver más') or contains(text(), 'Cargar más')]")
+        return buttons[0] if buttons else None
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        section = product.find("section", class_="vtex-product-summary-2-x-container")
+        if not section:
+            return None
+
+        title_tag = section.find("h3") or section.find("span", class_="vtex-product-summary-2-x-productBrand")
+        a_tag = section.find("a", href=True)
+        img_tag = section.find("img")
+        final_price = section.find(class_=lambda x: x and "sellingPrice" in x)
+        original_price = section.find(class_=lambda x: x and "listPrice" in x)
+
+        return ScrapedProduct(
+            title=self.clean_title(self.text_of(title_tag)),
+            url=self.absolute_url(a_tag["href"]) if a_tag else "",
+            final_price=parse_price(self.text_of(final_price)),
+            original_price=parse_price(self.text_of(original_price)),
+            image=img_tag["src"] if img_tag else "",
+        )
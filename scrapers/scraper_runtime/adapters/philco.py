@@ -0,0 +1,57 @@
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+
+CATEGORY_URLS = [
+    "https://philco.com.ar/tecnologia-y-accesorios.html",
+    "https://philco.com.ar/salud-y-belleza.html",
+    "https://philco.com.ar/herramientas/ver-todo-herramientas.html",
+    "https://philco.com.ar/electrodomesticos/aspiradoras.html",
+    "https://philco.com.ar/electrodomesticos/termotanque.html",
+    "https://philco.com.ar/electrodomesticos/cocina.html",
+    "https://philco.com.ar/electrodomesticos/lavado.html",
+    "https://philco.com.ar/electrodomesticos/heladeras-y-freezers.html",
+    "https://philco.com.ar/movilidad/ver-todo-movilidad.html",
+    "https://philco.com.ar/audio/audio.html",
+    "https://philco.com.ar/tv/ver-todo-tv.html",
+    "https://philco.com.ar/aire-climatizacion/ver-todo-aire-y-climatizacion.html",
+]
+
+
+class PhilcoAdapter(RetailerAdapter):
+    name = "Philco"
+    url = "https://philco.com.ar"
+    log_name = "philco"
+    category_urls = CATEGORY_URLS
+    item_selector = "ol.products.list.items.product-items li.item.product.product-item"
+    # Se conserva la <ol> para que el selector de items siga matcheando
+    item_strainer = class_strainer("ol", "product-items")
+
+    ITEMS = css(item_selector)
+    LINK = css("h2.product.name.product-item-name a.product-item-link")
+    FINAL_PRICE = css("div.price-box.price-final_price span.special-price span.price")
+    ORIGINAL_PRICE = css("div.price-box.price-final_price span.old-price span.price")
+    IMAGE = css("img.product-image-photo")
+    fetch_mode = "http"
+    paginated = False
+
+    def category_slug(self, category_url):
+        url_parts = category_url.split("/")
+        return url_parts[3] if len(url_parts) > 3 else "N/A"
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        link_tag = self.LINK.select_one(product)
+        title = self.text_of(link_tag) or "Sin título"
+        final_price_tag = self.FINAL_PRICE.select_one(product)
+        original_price_tag = self.ORIGINAL_PRICE.select_one(product)
+        img_tag = self.IMAGE.select_one(product)
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=link_tag["href"] if link_tag and "href" in link_tag.attrs else "",
+            final_price=parse_price(self.text_of(final_price_tag)),
+            original_price=parse_price(self.text_of(original_price_tag)),
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+        )
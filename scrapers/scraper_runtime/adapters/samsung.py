@@ -0,0 +1,64 @@
+from selenium.webdriver.common.by import By
+
+from ..adapter import RetailerAdapter, ScrapedProduct, class_strainer, css
+from ..prices import parse_price
+from ..waits import click_until_exhausted
+
+CATEGORY_URLS = [
+    "https://www.samsung.com/ar/tvs/all-tvs/",
+    "https://www.samsung.com/ar/audio-devices/all-audio-devices/",
+    "https://www.samsung.com/ar/projectors/all-projectors/",
+    "https://www.samsung.com/ar/refrigerators/all-refrigerators/",
+    "https://www.samsung.com/ar/washers-and-dryers/all-washers-and-dryers/",
+    "https://www.samsung.com/ar/vacuum-cleaners/all-vacuum-cleaners/",
+    "https://www.samsung.com/ar/dishwashers/",
+    "https://www.samsung.com/ar/cooking-appliances/all-cooking-appliances/",
+    "https://www.samsung.com/ar/air-conditioners/all-air-conditioners/",
+    "https://www.samsung.com/ar/computers/all-computers/",
+    "https://www.samsung.com/ar/monitors/all-monitors/",
+    "https://www.samsung.com/ar/mobile-accessories/all-mobile-accessories/",
+    "https://www.samsung.com/ar/smartphones/all-smartphones/",
+]
+
+
+class SamsungAdapter(RetailerAdapter):
+    name = "Samsung Argentina"
+    url = "https://www.samsung.com/ar"
+    log_name = "samsung-argentina"
+    category_urls = CATEGORY_URLS
+    paginated = False
+    item_selector = "div.pd19-product-card__item"
+    item_strainer = class_strainer("div", "pd19-product-card__item")
+
+    ITEMS = css(item_selector)
+    IMAGE = css("a.pd19-product-card__img img.image__main")
+
+    # Los links del listado son relativos al dominio, no a /ar
+    site_url = "https://www.samsung.com"
+
+    # Click en "Ver más" hasta que desaparece el botón
+    def prepare_page(self, driver):
+        click_until_exhausted(driver, self.find_view_more, self.item_selector, step_timeout=self.load_more_timeout)
+
+    @staticmethod
+    def find_view_more(driver):
+        buttons = driver.find_elements(By.CSS_SELECTOR, "button.pd19-product-finder__view-more-btn")
+        return buttons[0] if buttons and buttons[0].is_displayed() else None
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title_tag = product.find("a", class_="pd19-product-card__name")
+        title = self.text_of(title_tag) or "Sin título"
+        price_tag = product.find("strong", class_="pd19-product-card__current-price")
+        img_tag = self.IMAGE.select_one(product)
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.site_url + title_tag["href"] if title_tag and "href" in title_tag.attrs else "",
+            final_price=parse_price(self.text_of(price_tag)),
+            # Samsung no muestra precio original en su web por ahora
+            original_price=None,
+            image=img_tag["src"] if img_tag and "src" in img_tag.attrs else "",
+        )
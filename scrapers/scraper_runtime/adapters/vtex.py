@@ -0,0 +1,86 @@
+import logging
+from urllib.parse import urlsplit
+
+from ..adapter import ParsedPage, RetailerAdapter, ScrapedProduct, class_strainer
+
+
+class VtexAdapter(RetailerAdapter):
+    """Base para tiendas VTEX: en modo http usa el JSON del catálogo en vez del HTML renderizado.
+
+    El HTML (`vtex-search-result` + Selenium) queda como fallback.
+    """
+
+    fetch_mode = "http"
+    # La API de catálogo aguanta bien un par de categorías en paralelo
+    concurrency = 2
+    # Fallback HTML: solo interesan los items de la grilla del store theme
+    item_strainer = class_strainer("div", "vtex-search-result-3-x-galleryItem")
+
+    # El catálogo público acepta hasta 50 productos por request y no pagina más allá de _from=2500
+    api_page_size = 50
+    api_max_offset = 2500
+
+    def category_path(self, category):
+        return urlsplit(category.url).path.strip("/")
+
+    def fetch_http(self, http, category, page):
+        offset = (page - 1) * self.api_page_size
+        if offset >= self.api_max_offset:
+            # Solo se llega acá si la página anterior vino llena: la categoría tiene más productos
+            # de los que el catálogo deja paginar y el resto queda afuera
+            logging.warning(
+                f"⚠️ {category.slug}: el catálogo VTEX no pagina más allá de {self.api_max_offset} productos; "
+                f"el resto de la categoría no se scrapea (conviene dividirla en subcategorías)"
+            )
+            return []
+        path = self.category_path(category)
+        return http.get_json(
+            f"{self.url}/api/catalog_system/pub/products/search/{path}",
+            params={
+                "map": ",".join(["c"] * len(path.split("/"))),
+                "O": "OrderByNameASC",
+                "_from": offset,
+                "_to": offset + self.api_page_size - 1,
+            },
+        )
+
+    def parse_http(self, payload, category):
+        products = ParsedPage(raw_count=len(payload or []))
+        for item in payload or []:
+            try:
+                product = self.parse_catalog_item(item)
+            except Exception as e:
+                logging.error(f"🛑 Error procesando producto VTEX en {category.slug}: {e}")
+                continue
+            if product and product.title and product.url:
+                products.append(product)
+        return products
+
+    def parse_catalog_item(self, item):
+        skus = item.get("items") or []
+        if not skus:
+            return None
+        sku = skus[0]
+        sellers = sku.get("sellers") or []
+        seller = next((s for s in sellers if s.get("commertialOffer", {}).get("IsAvailable")), sellers[0] if sellers else None)
+        offer = seller.get("commertialOffer", {}) if seller else {}
+
+        price = offer.get("Price") or None
+        list_price = offer.get("ListPrice") or None
+        images = sku.get("images") or []
+
+        return ScrapedProduct(
+            title=self.clean_title(item.get("productName", "").strip()),
+            # Mismo formato de URL que el listado HTML, para no duplicar productos
+            url=f"{self.url}/{item['linkText']}/p" if item.get("linkText") else "",
+            final_price=price,
+            original_price=list_price if list_price and price and list_price > price else None,
+            image=images[0].get("imageUrl", "") if images else "",
+            out_of_stock=not offer.get("IsAvailable", True),
+        )
+
+    def is_last_page(self, products, mode):
+        if mode == "http":
+            # Lo que trajo la API, no lo que quedó después de descartar items
+            return getattr(products, "raw_count", len(products)) < self.api_page_size
+        return super().is_last_page(products, mode)
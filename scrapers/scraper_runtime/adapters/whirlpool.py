@@ -0,0 +1,58 @@
+from selenium.webdriver.common.by import By
+
+from ..adapter import ScrapedProduct, css
+from ..prices import parse_price
+from ..waits import click_until_exhausted
+from .vtex import VtexAdapter
+
+CATEGORY_URLS = [
+    "https://www.whirlpool.com.ar/refrigeracion",
+    "https://www.whirlpool.com.ar/lavado",
+    "https://www.whirlpool.com.ar/coccion",
+    "https://www.whirlpool.com.ar/empotrables",
+    "https://www.whirlpool.com.ar/electrodomesticos",
+    "https://www.whirlpool.com.ar/repuestos",
+]
+
+
+class WhirlpoolAdapter(VtexAdapter):
+    name = "Whirlpool"
+    url = "https://www.whirlpool.com.ar"
+    log_name = "whirlpool-argentina"
+    category_urls = CATEGORY_URLS
+    paginated = False
+    item_selector = "div.vtex-search-result-3-x-galleryItem"
+
+    ITEMS = css(item_selector)
+    TITLE = css("span.vtex-product-summary-2-x-brandName")
+    LIST_PRICE = css("div.whirlpoolargio-store-theme-1-x-ListPrice")
+    SELLING_PRICE = css("div.whirlpoolargio-store-theme-1-x-SellingPrice span")
+    IMAGE = css("img.vtex-product-summary-2-x-imageNormal")
+    LINK = css("a.vtex-product-summary-2-x-clearLink")
+
+    # Click en "Mostrar más" mientras sigan apareciendo productos
+    def prepare_page(self, driver):
+        click_until_exhausted(driver, self.find_show_more, self.item_selector, step_timeout=self.load_more_timeout)
+
+    @staticmethod
+    def find_show_more(driver):
+        buttons = driver.find_elements(By.XPATH, "//button[contains(., 'Mostrar más')]")
+        return buttons[0] if buttons else None
+
+    def select_items(self, soup):
+        return self.ITEMS.select(soup)
+
+    def parse_item(self, product, category):
+        title = self.text_of(self.TITLE.select_one(product)) or "N/A"
+        original_price_tag = self.LIST_PRICE.select_one(product)
+        final_price_tag = self.SELLING_PRICE.select_one(product)
+        image_tag = self.IMAGE.select_one(product)
+        a_tag = self.LINK.select_one(product)
+
+        return ScrapedProduct(
+            title=self.clean_title(title),
+            url=self.absolute_url(a_tag["href"]) if a_tag else "",
+            final_price=parse_price(self.text_of(final_price_tag)),
+            original_price=parse_price(self.text_of(original_price_tag)),
+            image=image_tag["src"] if image_tag else "",
+        )
@@ -0,0 +1,328 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .adapter import CategoryTarget
+from .adapters import ADAPTERS, get_adapter
+
+SCRAPERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Páginas guardadas: fixtures/<log_name>/<nombre>.html (o .json si el adapter trae JSON por http),
+# y al lado <nombre>.expected.json con lo que el adapter tiene que extraer de cada una. Los expected
+# se revisan a mano contra la página: `record` y `--update-expected` solo escriben un borrador
+# (<nombre>.expected.draft.json) con la salida del adapter, que hay que corregir y renombrar.
+FIXTURES_DIR = os.path.join(SCRAPERS_DIR, "fixtures")
+# Una línea por corrida de `bench run`, para comparar entre commits
+RESULTS_PATH = os.path.join(SCRAPERS_DIR, "benchmarks", "results.jsonl")
+
+# Si cambia alguno de estos campos respecto del expected, el parser se rompió. out_of_stock solo
+# se compara si el expected lo tiene (lo informa el JSON de VTEX, no los listados HTML)
+CHECKED_FIELDS = ("title", "url", "final_price", "original_price", "out_of_stock")
+
+
+class Fixture:
+    def __init__(self, path):
+        self.path = path
+        self.name, self.kind = os.path.splitext(os.path.basename(path))
+        self.expected_path = os.path.join(os.path.dirname(path), f"{self.name}.expected.json")
+        self.draft_path = os.path.join(os.path.dirname(path), f"{self.name}.expected.draft.json")
+        with open(path, encoding="utf-8") as f:
+            self.payload = f.read() if self.kind == ".html" else json.load(f)
+
+    def parse(self, adapter, category):
+        if self.kind == ".html":
+            return adapter.parse_page(self.payload, category)
+        return adapter.parse_http(self.payload, category)
+
+    def expected(self):
+        if not os.path.exists(self.expected_path):
+            return None
+        with open(self.expected_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_draft(self, products):
+        """Salida actual del adapter, para revisar a mano antes de convertirla en el expected."""
+        with open(self.draft_path, "w", encoding="utf-8") as f:
+            json.dump([extracted(p) for p in products], f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+def extracted(product):
+    return {field: getattr(product, field) for field in CHECKED_FIELDS}
+
+
+def load_fixtures(adapter):
+    directory = os.path.join(FIXTURES_DIR, adapter.log_name)
+    paths = glob.glob(os.path.join(directory, "*.html"))
+    paths += [
+        p for p in glob.glob(os.path.join(directory, "*.json"))
+        if not p.endswith((".expected.json", ".expected.draft.json"))
+    ]
+    return [Fixture(path) for path in sorted(paths)]
+
+
+def bench_category(adapter):
+    return CategoryTarget(url=adapter.url, slug="bench")
+
+
+def baseline_adapter(name):
+    """El mismo adapter con el parseo anterior: html.parser sobre el árbol completo."""
+    adapter = get_adapter(name)
+    adapter.html_parser = "html.parser"
+    adapter.item_strainer = None
+    return adapter
+
+
+# ─────────────────────────────────────────────────────────
+# Correctitud
+
+def check_fixtures(adapter, fixtures):
+    """Diferencias contra los expected (títulos, precios y URLs); lista vacía si todo coincide."""
+    errors = []
+    category = bench_category(adapter)
+    for fixture in fixtures:
+        expected = fixture.expected()
+        if expected is None:
+            if os.path.exists(fixture.draft_path):
+                errors.append(f"{fixture.path}: {os.path.basename(fixture.draft_path)} sin revisar (corregirlo contra la página y renombrarlo a .expected.json)")
+            else:
+                errors.append(f"{fixture.path}: falta {os.path.basename(fixture.expected_path)}")
+            continue
+        actual = [extracted(p) for p in fixture.parse(adapter, category)]
+        if len(actual) != len(expected):
+            errors.append(f"{fixture.path}: {len(actual)} productos, se esperaban {len(expected)}")
+        for index, (got, want) in enumerate(zip(actual, expected)):
+            for field in CHECKED_FIELDS:
+                if field in want and got[field] != want[field]:
+                    errors.append(f"{fixture.path} #{index} {field}: {got[field]!r} != {want[field]!r}")
+    return errors
+
+
+# ─────────────────────────────────────────────────────────
+# Performance
+
+def measure(adapter, fixtures, repeat):
+    category = bench_category(adapter)
+    # Primera pasada aparte: calienta imports y cachés de selectores
+    items = sum(len(fixture.parse(adapter, category)) for fixture in fixtures)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for fixture in fixtures:
+            fixture.parse(adapter, category)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc frena bastante el parseo: la memoria se mide en una pasada separada
+    tracemalloc.start()
+    for fixture in fixtures:
+        fixture.parse(adapter, category)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "pages": len(fixtures),
+        "items": items,
+        "ms_per_page": elapsed * 1000 / (repeat * len(fixtures)),
+        "items_per_sec": items * repeat / elapsed,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+# ─────────────────────────────────────────────────────────
+# Resultados
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRAPERS_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_results():
+    """Último resultado guardado de cada retailer: {name: (commit, métricas)}."""
+    previous = {}
+    if not os.path.exists(RESULTS_PATH):
+        return previous
+    with open(RESULTS_PATH, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            for name, metrics in record["retailers"].items():
+                previous[name] = (record.get("commit"), metrics)
+    return previous
+
+
+def save_results(results):
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    record = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "retailers": results,
+    }
+    with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+# ─────────────────────────────────────────────────────────
+# Grabación de fixtures
+
+def record_fixture(name, category_index=0, page=1, mode=None):
+    """Guarda una página real del retailer tal como la recibe el parser (HTML renderizado o JSON)."""
+    adapter = get_adapter(name)
+    category = adapter.categories()[category_index]
+    mode = mode or adapter.fetch_mode
+
+    if mode == "http":
+        from .http import HttpFetcher
+
+        http = HttpFetcher(user_agent=adapter.user_agent)
+        try:
+            payload = adapter.fetch_http(http, category, page)
+        finally:
+            http.close()
+    else:
+        from .browser import create_driver
+
+        driver = create_driver(adapter)
+        try:
+            payload = adapter.fetch_page(driver, adapter.page_url(category, page))
+        finally:
+            driver.quit()
+
+    directory = os.path.join(FIXTURES_DIR, adapter.log_name)
+    os.makedirs(directory, exist_ok=True)
+    kind = "html" if isinstance(payload, str) else "json"
+    path = os.path.join(directory, f"{category.slug.replace('/', '_')}-p{page}.{kind}")
+    with open(path, "w", encoding="utf-8") as f:
+        if kind == "html":
+            f.write(payload)
+        else:
+            json.dump(payload, f, ensure_ascii=False)
+
+    fixture = Fixture(path)
+    products = fixture.parse(adapter, bench_category(adapter))
+    fixture.write_draft(products)
+    print(
+        f"💾 {path}: {len(products)} productos. Revisar {os.path.basename(fixture.draft_path)} contra la página "
+        f"(títulos, precios, URLs, stock) y renombrarlo a {os.path.basename(fixture.expected_path)}"
+    )
+    return path
+
+
+# ─────────────────────────────────────────────────────────
+# CLI
+
+def selected_adapters(names):
+    unknown = set(names) - set(ADAPTERS)
+    if unknown:
+        raise SystemExit(f"retailers desconocidos: {', '.join(sorted(unknown))}")
+    for name in names or sorted(ADAPTERS):
+        adapter = get_adapter(name)
+        fixtures = load_fixtures(adapter)
+        if fixtures:
+            yield name, adapter, fixtures
+
+
+def cmd_check(args):
+    failed = False
+    for name, adapter, fixtures in selected_adapters(args.retailers):
+        if args.update_expected:
+            category = bench_category(adapter)
+            for fixture in fixtures:
+                fixture.write_draft(fixture.parse(adapter, category))
+            print(f"📝 {name}: {len(fixtures)} borradores .expected.draft.json para revisar y renombrar")
+            continue
+        errors = check_fixtures(adapter, fixtures)
+        if errors:
+            failed = True
+            print(f"❌ {name}: {len(errors)} diferencias")
+            for error in errors[:20]:
+                print(f"   {error}")
+        else:
+            print(f"✅ {name}: {len(fixtures)} fixtures OK")
+    return 1 if failed else 0
+
+
+def cmd_run(args):
+    previous = last_results()
+    results = {}
+    failed = False
+
+    header = f"{'retailer':<22}{'págs':>5}{'items':>7}{'ms/pág':>9}{'items/s':>10}{'pico KB':>10}"
+    if args.baseline:
+        header += f"{'vs html.parser':>16}"
+    print(header + "  vs anterior")
+
+    for name, adapter, fixtures in selected_adapters(args.retailers):
+        errors = check_fixtures(adapter, fixtures)
+        if errors:
+            failed = True
+            print(f"❌ {name}: {len(errors)} diferencias contra los expected (ver `check {name}`)")
+            continue
+
+        metrics = measure(adapter, fixtures, args.repeat)
+        results[name] = metrics
+        line = (
+            f"{name:<22}{metrics['pages']:>5}{metrics['items']:>7}{metrics['ms_per_page']:>9.2f}"
+            f"{metrics['items_per_sec']:>10.0f}{metrics['peak_memory_kb']:>10.0f}"
+        )
+        if args.baseline:
+            baseline = measure(baseline_adapter(name), fixtures, args.repeat)
+            line += f"{baseline['ms_per_page'] / metrics['ms_per_page']:>15.1f}x"
+        if name in previous:
+            commit, before = previous[name]
+            delta = (metrics["ms_per_page"] / before["ms_per_page"] - 1) * 100
+            line += f"  {delta:+.1f}% ({commit or '?'})"
+        print(line)
+
+    if results and not args.no_save:
+        save_results(results)
+        print(f"\n📈 Corrida agregada a {os.path.relpath(RESULTS_PATH)}")
+    return 1 if failed else 0
+
+
+def cmd_record(args):
+    record_fixture(args.retailer, category_index=args.category, page=args.page, mode=args.mode)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline del parseo de los adapters sobre páginas grabadas.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="ms/página, items/s y memoria pico por retailer (verifica los expected antes)")
+    run_parser.add_argument("retailers", nargs="*", help="Por defecto, todos los que tengan fixtures")
+    run_parser.add_argument("--repeat", type=int, default=10)
+    run_parser.add_argument("--baseline", action="store_true", help="Comparar también contra html.parser sin SoupStrainer")
+    run_parser.add_argument("--no-save", action="store_true", help="No agregar la corrida a benchmarks/results.jsonl")
+    run_parser.set_defaults(handler=cmd_run)
+
+    check_parser = commands.add_parser("check", help="Solo verifica títulos, precios y URLs contra los expected")
+    check_parser.add_argument("retailers", nargs="*")
+    check_parser.add_argument("--update-expected", action="store_true", help="Escribir la salida actual como borrador de los expected")
+    check_parser.set_defaults(handler=cmd_check)
+
+    record_parser = commands.add_parser("record", help="Graba una página real del retailer como fixture")
+    record_parser.add_argument("retailer", choices=sorted(ADAPTERS))
+    record_parser.add_argument("--category", type=int, default=0, help="Índice en las categorías del adapter")
+    record_parser.add_argument("--page", type=int, default=1)
+    record_parser.add_argument("--mode", choices=["http", "selenium"], help="Por defecto, el fetch_mode del adapter")
+    record_parser.set_defaults(handler=cmd_record)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
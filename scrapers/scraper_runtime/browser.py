@@ -0,0 +1,215 @@
+import os
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Lo que nunca hace falta para leer el listado: imágenes, fuentes y trackers.
+# Los <img> siguen teniendo su src en el DOM, así que las URLs de imagen no se pierden.
+DEFAULT_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*tiktok.com*",
+]
+
+# Perfiles de Chrome que sobreviven entre corridas (cache de disco y cookies)
+PROFILE_ROOT = os.getenv("SCRAPER_PROFILE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "shops-arbitrage", "chrome"))
+
+
+def build_chrome_options(window_size=None, user_agent=None, stealth=False, profile_dir=None, block_images=False):
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if window_size:
+        options.add_argument(f"window-size={window_size}")
+    if user_agent:
+        options.add_argument(f"user-agent={user_agent}")
+    if stealth:
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    if block_images:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def create_driver(adapter, profile_dir=None):
+    options = build_chrome_options(
+        window_size=adapter.window_size,
+        user_agent=adapter.user_agent,
+        stealth=adapter.stealth,
+        profile_dir=profile_dir,
+        block_images=adapter.block_resources,
+    )
+    driver = webdriver.Chrome(options=options)
+    if adapter.stealth:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": "Object.defineProperty(navigator, 'webdriver', { get: () => undefined })"
+        })
+    if adapter.block_resources:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": DEFAULT_BLOCKED_URLS + list(adapter.blocked_urls)})
+    return driver
+
+
+@dataclass
+class PoolStats:
+    startup_seconds: float = 0.0
+    lease_waits: list = field(default_factory=list)
+    page_loads: list = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_start(self, seconds):
+        with self._lock:
+            self.startup_seconds += seconds
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.lease_waits.append(seconds)
+
+    def record_page_load(self, seconds):
+        with self._lock:
+            self.page_loads.append(seconds)
+
+    def summary(self, size, created):
+        if not self.lease_waits:
+            return None
+        waits = sorted(self.lease_waits)
+        loads = sorted(self.page_loads)
+        return (
+            f"🌐 Navegadores: {created}/{size} (arranque: {self.startup_seconds:.2f}s) "
+            f"| Espera lease p50/p95/máx: {_percentile(waits, 50):.2f}/{_percentile(waits, 95):.2f}/{waits[-1]:.2f}s\n"
+            f"🕓 Carga de página ({len(loads)}) p50/p95: {_percentile(loads, 50):.2f}/{_percentile(loads, 95):.2f}s "
+            f"| media: {statistics.fmean(loads) if loads else 0.0:.2f}s"
+        )
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, round(pct / 100 * (len(values) - 1)))
+    return values[index]
+
+
+class DriverPool:
+    """Hasta `size` navegadores compartidos entre los workers.
+
+    Se crean a demanda o todos juntos con `warm()`; cada slot usa su propio perfil persistente
+    (Chrome no permite compartir un user-data-dir entre procesos) para reaprovechar cache y cookies.
+    Si la espera por un lease es alta en el resumen, conviene agrandar el pool.
+    """
+
+    def __init__(self, adapter, size=1, drivers=None):
+        self.adapter = adapter
+        self.size = max(1, size)
+        self.stats = PoolStats()
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._created = 0
+        self._lock = threading.Lock()
+        for driver in drivers or []:
+            self._all.append(driver)
+            self._idle.put(driver)
+            self._created += 1
+
+    def warm(self):
+        """Levanta los navegadores que faltan en paralelo y les carga la home del retailer."""
+        missing = self.size - self._created
+        if missing <= 0:
+            return
+        print(f"🔥 Calentando {missing} navegador(es) para {self.adapter.name}...")
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            for driver in pool.map(self._warm_one, range(missing)):
+                if driver is not None:
+                    self._idle.put(driver)
+
+    # Un navegador que no arranca no frena al resto: ese slot se vuelve a intentar en el primer lease
+    def _warm_one(self, _):
+        try:
+            return self._start_driver(warm=True)
+        except Exception as e:
+            print(f"⚠️ No se pudo levantar un navegador para el pool: {e}")
+            return None
+
+    @contextmanager
+    def lease(self):
+        start = time.perf_counter()
+        driver = self._acquire()
+        self.stats.record_wait(time.perf_counter() - start)
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        driver = self._start_driver()
+        if driver is None:
+            return self._idle.get()
+        return driver
+
+    # Devuelve None si el pool ya está completo
+    def _start_driver(self, warm=False):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            slot = self._created
+            self._created += 1
+        start = time.perf_counter()
+        try:
+            driver = self._create(slot)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._all.append(driver)
+        if warm and self.adapter.warm_browsers:
+            try:
+                driver.get(self.adapter.url)
+            except Exception as e:
+                print(f"⚠️ No se pudo calentar el navegador con {self.adapter.url}: {e}")
+        self.stats.record_start(time.perf_counter() - start)
+        return driver
+
+    def _create(self, slot):
+        profile_dir = self._profile_dir(slot)
+        if profile_dir is None:
+            return create_driver(self.adapter)
+        try:
+            return create_driver(self.adapter, profile_dir=profile_dir)
+        except Exception as e:
+            # Perfil bloqueado por otra corrida del mismo retailer: se sigue con uno descartable
+            print(f"⚠️ No se pudo usar el perfil {profile_dir} ({e}). Uso uno temporal.")
+            return create_driver(self.adapter)
+
+    def _profile_dir(self, slot):
+        if not self.adapter.persistent_profile:
+            return None
+        path = os.path.join(PROFILE_ROOT, f"{self.adapter.log_name}-{slot}")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def summary(self):
+        return self.stats.summary(self.size, self._created)
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,130 @@
+import threading
+from dataclasses import dataclass
+
+from psycopg2.extras import execute_values
+
+# Misma definición que la migración 0003 del backend; se aplica al arrancar por si falta
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS scrape_runs (
+        id SERIAL PRIMARY KEY,
+        retailer_id INTEGER REFERENCES retailers(id),
+        status TEXT NOT NULL DEFAULT 'running',
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS scrape_runs_retailer_started_idx ON scrape_runs (retailer_id, started_at DESC);
+    CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+        run_id INTEGER REFERENCES scrape_runs(id) ON DELETE CASCADE,
+        category TEXT NOT NULL,
+        last_page INTEGER NOT NULL DEFAULT 0,
+        done BOOLEAN NOT NULL DEFAULT FALSE,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (run_id, category)
+    );
+"""
+
+# Una página nunca retrocede el checkpoint y una categoría terminada queda terminada
+SAVE_CHECKPOINTS_SQL = """
+    INSERT INTO scrape_checkpoints (run_id, category, last_page, done, updated_at)
+    VALUES %s
+    ON CONFLICT (run_id, category) DO UPDATE SET
+        last_page = GREATEST(scrape_checkpoints.last_page, EXCLUDED.last_page),
+        done = scrape_checkpoints.done OR EXCLUDED.done,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+@dataclass
+class Checkpoint:
+    last_page: int = 0
+    done: bool = False
+
+
+class RunCheckpoints:
+    """Estado de una corrida (`scrape_runs`) y hasta qué página llegó cada categoría.
+
+    Si la última corrida del retailer no terminó y es más nueva que `resume_window_hours`,
+    se retoma: las categorías terminadas se saltean y el resto sigue desde la página siguiente
+    a la última guardada. Los checkpoints se escriben en la misma transacción que los productos
+    (ver `ProductWriter`), así que nunca quedan adelantados respecto de lo commiteado.
+    """
+
+    def __init__(self, conn, retailer_id, resume=True, resume_window_hours=24):
+        self.conn = conn
+        self.retailer_id = retailer_id
+        self.resume = resume
+        self.resume_window_hours = resume_window_hours
+        self.run_id = None
+        self.resumed = False
+        self._state = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL)
+            run = None
+            if self.resume:
+                cursor.execute("""
+                    SELECT id FROM scrape_runs
+                    WHERE retailer_id = %s
+                      AND status <> 'completed'
+                      AND started_at > CURRENT_TIMESTAMP - make_interval(hours => %s)
+                    ORDER BY started_at DESC
+                    LIMIT 1
+                """, (self.retailer_id, self.resume_window_hours))
+                run = cursor.fetchone()
+
+            if run:
+                self.run_id = run[0]
+                self.resumed = True
+                cursor.execute("UPDATE scrape_runs SET status = 'running', finished_at = NULL WHERE id = %s", (self.run_id,))
+                cursor.execute("SELECT category, last_page, done FROM scrape_checkpoints WHERE run_id = %s", (self.run_id,))
+                self._state = {category: Checkpoint(last_page, done) for category, last_page, done in cursor.fetchall()}
+            else:
+                cursor.execute("INSERT INTO scrape_runs (retailer_id) VALUES (%s) RETURNING id", (self.retailer_id,))
+                self.run_id = cursor.fetchone()[0]
+        self.conn.commit()
+
+        if self.resumed:
+            done = sum(1 for checkpoint in self._state.values() if checkpoint.done)
+            print(f"♻️ Retomando corrida {self.run_id}: {done} categorías terminadas, {len(self._state) - done} a medias")
+        else:
+            print(f"▶️ Corrida {self.run_id}")
+
+    def get(self, category):
+        return self._state.get(category.slug, Checkpoint())
+
+    # Se acumulan hasta el próximo flush del ProductWriter
+    def page_done(self, category, page):
+        self._mark(category, last_page=page)
+
+    def category_done(self, category):
+        self._mark(category, done=True)
+
+    def _mark(self, category, last_page=0, done=False):
+        with self._lock:
+            current = self._pending.get(category.slug, Checkpoint())
+            self._pending[category.slug] = Checkpoint(max(current.last_page, last_page), current.done or done)
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def write_pending(self, cursor):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        rows = [(self.run_id, slug, checkpoint.last_page, checkpoint.done) for slug, checkpoint in pending.items()]
+        execute_values(cursor, SAVE_CHECKPOINTS_SQL, rows, template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)")
+
+    def finish(self, completed):
+        status = "completed" if completed else "incomplete"
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_runs SET status = %s, finished_at = CURRENT_TIMESTAMP WHERE id = %s",
+                (status, self.run_id),
+            )
+        self.conn.commit()
+        return status
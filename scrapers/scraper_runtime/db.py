@@ -0,0 +1,29 @@
+import os
+
+import psycopg2
+from dotenv import load_dotenv
+
+
+def get_connection():
+    load_dotenv()
+    return psycopg2.connect(
+        dbname=os.getenv("DBNAME"),
+        user=os.getenv("DBUSER"),
+        password=os.getenv("DBPASSWORD"),
+        host=os.getenv("DBHOST"),
+        port=os.getenv("DBPORT")
+    )
+
+
+# Inserta el retailer si no existe y devuelve su id
+def ensure_retailer(conn, name, url):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO retailers (name, url)
+            VALUES (%s, %s)
+            ON CONFLICT (url) DO NOTHING
+        """, (name, url))
+        cursor.execute("SELECT id FROM retailers WHERE url = %s", (url,))
+        retailer_id = cursor.fetchone()[0]
+    conn.commit()
+    return retailer_id
@@ -0,0 +1,291 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .browser import DriverPool
+from .checkpoints import RunCheckpoints
+from .db import ensure_retailer, get_connection
+from .fingerprints import PageFingerprints, page_fingerprint
+from .http import HttpFetcher
+from .persistence import ProductWriter
+from .throttle import HostThrottle
+
+
+class HttpModeFailed(Exception):
+    def __init__(self, message, page):
+        super().__init__(message)
+        self.page = page
+
+
+@dataclass
+class ScrapeStats:
+    pages: int = 0
+    products: int = 0
+    failed_pages: int = 0
+    unchanged_pages: int = 0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    persist_seconds: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    # Los workers suman en paralelo
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def summary(self):
+        elapsed = self.elapsed
+        rate = self.products / elapsed if elapsed else 0.0
+        return (
+            f"📄 Páginas: {self.pages} (fallidas: {self.failed_pages}, sin cambios: {self.unchanged_pages}) "
+            f"| 🛒 Productos: {self.products} "
+            f"| ⚡ {rate:.1f} productos/s\n"
+            f"⏱ Fetch: {self.fetch_seconds:.2f}s | Parseo: {self.parse_seconds:.2f}s "
+            f"| DB: {self.persist_seconds:.2f}s | Total: {elapsed:.2f}s"
+        )
+
+
+class ScrapeEngine:
+    """Recorre las categorías de un adapter con `concurrency` workers.
+
+    En modo http los workers comparten un cliente httpx; en modo selenium, un pool de navegadores
+    del mismo tamaño. `HostThrottle` limita los requests simultáneos y el ritmo por host.
+    """
+
+    def __init__(self, adapter, conn=None, driver=None, http=None, concurrency=None, resume=True,
+                 incremental=None, adaptive=None):
+        self.adapter = adapter
+        self.conn = conn
+        self.resume = resume
+        self.incremental = adapter.incremental if incremental is None else incremental
+        self.adaptive = adapter.adaptive_revisits if adaptive is None else adaptive
+        self.concurrency = max(1, concurrency or adapter.concurrency)
+        self.throttle = HostThrottle(adapter.max_requests_per_host, adapter.min_request_interval)
+        self._drivers = DriverPool(
+            adapter,
+            size=adapter.browser_pool_size or self.concurrency,
+            drivers=[driver] if driver else None,
+        )
+        self._http = http
+        self._http_lock = threading.Lock()
+        self._owns_http = http is None
+        self.stats = ScrapeStats()
+        self.writer = None
+        self.checkpoints = None
+        self.fingerprints = None
+        self._changed_categories = set()
+
+    # El cliente HTTP se crea recién cuando hace falta (los navegadores, al pedirlos al pool)
+    @property
+    def http(self):
+        with self._http_lock:
+            if self._http is None:
+                self._http = HttpFetcher(
+                    user_agent=self.adapter.user_agent,
+                    max_connections=self.concurrency,
+                    throttle=self.throttle,
+                )
+        return self._http
+
+    def run(self):
+        configure_logging(self.adapter)
+        owns_conn = self.conn is None
+        if owns_conn:
+            self.conn = get_connection()
+
+        try:
+            retailer_id = ensure_retailer(self.conn, self.adapter.name, self.adapter.url)
+            self.checkpoints = RunCheckpoints(self.conn, retailer_id, resume=self.resume)
+            self.checkpoints.start()
+            if self.incremental:
+                self.fingerprints = PageFingerprints(self.conn, retailer_id, adaptive=self.adaptive)
+                self.fingerprints.load()
+            self.writer = ProductWriter(
+                self.conn, retailer_id,
+                pages_per_flush=self.adapter.pages_per_flush,
+                checkpoints=self.checkpoints,
+                fingerprints=self.fingerprints,
+            )
+            self.writer.ensure_schema()
+            categories = self.adapter.categories()
+            # En modo http los navegadores solo se levantan si hace falta el fallback
+            if self.adapter.fetch_mode == "selenium" and self.adapter.warm_browsers:
+                self._drivers.warm()
+            if self.concurrency == 1:
+                completed = [self.crawl_category(category) for category in categories]
+            else:
+                print(f"🧵 {len(categories)} categorías con {self.concurrency} workers")
+                with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=self.adapter.log_name) as pool:
+                    completed = list(pool.map(self.crawl_category, categories))
+            flushed = self.flush()
+            status = self.checkpoints.finish(flushed and all(completed))
+        finally:
+            self._drivers.close()
+            if self._owns_http and self._http is not None:
+                self._http.close()
+            if owns_conn:
+                self.conn.close()
+
+        if status == "completed":
+            print(f"\n✅ Scrapeo de {self.adapter.name} completo.")
+        else:
+            print(f"\n⚠️ Scrapeo de {self.adapter.name} incompleto: la corrida {self.checkpoints.run_id} se retoma en la próxima ejecución.")
+        print(f"🆕 Nuevos: {self.writer.inserted} | 🔄 Actualizados: {self.writer.updated} | 📉 Cambios de precio: {self.writer.history_rows}")
+        print(self.stats.summary())
+        pool_summary = self._drivers.summary()
+        if pool_summary:
+            print(pool_summary)
+        return self.stats
+
+    # Devuelve True si la categoría se recorrió entera (queda marcada en el checkpoint)
+    def crawl_category(self, category):
+        checkpoint = self.checkpoints.get(category)
+        if checkpoint.done:
+            print(f"⏭️ {category.slug} ya se completó en esta corrida.")
+            return True
+        if self.fingerprints and not self.fingerprints.should_visit(category):
+            print(f"💤 {category.slug}: todavía no toca revisitarla (revisita adaptativa).")
+            return True
+        if checkpoint.last_page:
+            print(f"♻️ {category.slug}: retomando desde la página {checkpoint.last_page + 1}")
+
+        mode = self.adapter.fetch_mode
+        try:
+            try:
+                completed = self._crawl(category, mode, checkpoint.last_page + 1)
+            except HttpModeFailed as e:
+                if not self.adapter.selenium_fallback:
+                    logging.error(f"🔥 Falló HTTP en {category.slug}: {e}")
+                    return False
+                print(f"↩️ HTTP no sirvió para {category.slug} ({e}). Reintentando con Selenium...")
+                completed = self._crawl(category, "selenium", e.page)
+        except Exception as e:
+            # Un worker caído no tiene que frenar al resto de las categorías
+            logging.error(f"🔥 Error inesperado en {category.slug}: {e}")
+            return False
+
+        if completed:
+            self.checkpoints.category_done(category)
+            if self.fingerprints:
+                self.fingerprints.category_visited(category, changed=category.slug in self._changed_categories)
+        return completed
+
+    # Devuelve False si la categoría quedó cortada por un error
+    def _crawl(self, category, mode, start_page=1):
+        page = start_page
+        previous_urls = set()
+        while True:
+            print(f"[{datetime.now().isoformat()}] Scrapeando {category.slug} - Página {page} ({mode})...")
+            try:
+                products = self.fetch_products(category, page, mode)
+            except Exception as e:
+                if mode == "http":
+                    raise HttpModeFailed(f"página {page}: {e}", page) from e
+                self.stats.add(failed_pages=1)
+                logging.error(f"🔥 Error al cargar página {page} de {category.slug}: {e}")
+                return False
+
+            if not products and getattr(products, "raw_count", 0):
+                # La página trajo items pero se descartaron todos: la categoría sigue
+                print(f"⚠️ Página {page} de {category.slug}: {products.raw_count} items descartados, ninguno válido.")
+                if self.adapter.is_last_page(products, mode):
+                    return True
+                page += 1
+                continue
+
+            if not products:
+                # En HTTP una primera página vacía suele significar que el listado necesita JS
+                if mode == "http" and page == 1:
+                    raise HttpModeFailed("la primera página no trajo productos", page)
+                print(f"🚫 No se encontraron productos en {category.slug} página {page}. Fin de categoría.")
+                return True
+
+            current_urls = {p.url for p in products}
+            if current_urls == previous_urls:
+                print(f"🌀 Página {page} de {category.slug} repite los mismos productos. Fin de categoría.")
+                return True
+
+            fingerprint = page_fingerprint(products, category) if self.fingerprints else None
+            if fingerprint and self.fingerprints.unchanged(category, page, fingerprint):
+                self.writer.skip_page(category, page)
+                self.stats.add(pages=1, products=len(products), unchanged_pages=1)
+                print(f"⏩ Página {page} de {category.slug} sin cambios ({len(products)} productos).\n")
+            else:
+                try:
+                    self.persist(products, category, page, fingerprint)
+                except Exception as e:
+                    self.stats.add(failed_pages=1)
+                    logging.error(f"🔥 Error guardando página {page} de {category.slug}: {e}")
+                    return False
+                # Una página reescrita solo porque su fingerprint venció no cuenta como cambio
+                if not fingerprint or self.fingerprints.changed(category, page, fingerprint):
+                    self._changed_categories.add(category.slug)
+                print(f"💾 Página {page} de {category.slug} guardada ({len(products)} productos).\n")
+
+            if self.adapter.is_last_page(products, mode):
+                return True
+            previous_urls = current_urls
+            page += 1
+
+    def fetch_products(self, category, page, mode):
+        products = []
+        for attempt in range(1, self.adapter.max_attempts + 1):
+            start = time.perf_counter()
+            if mode == "http":
+                payload = self.adapter.fetch_http(self.http, category, page)
+            else:
+                url = self.adapter.page_url(category, page)
+                with self.throttle.slot(url), self._drivers.lease() as driver:
+                    loading = time.perf_counter()
+                    payload = self.adapter.fetch_page(driver, url)
+                    self._drivers.stats.record_page_load(time.perf_counter() - loading)
+            fetched = time.perf_counter()
+
+            if mode == "http":
+                products = self.adapter.parse_http(payload, category)
+            else:
+                products = self.adapter.parse_page(payload, category)
+            self.stats.add(fetch_seconds=fetched - start, parse_seconds=time.perf_counter() - fetched)
+
+            if products or getattr(products, "raw_count", 0):
+                break
+            if attempt < self.adapter.max_attempts:
+                print(f"🔁 Reintentando página {page} de {category.slug} ({attempt}/{self.adapter.max_attempts})...")
+        return products
+
+    def persist(self, products, category, page=None, fingerprint=None):
+        start = time.perf_counter()
+        self.writer.save_page(products, category, page, fingerprint)
+        self.stats.add(persist_seconds=time.perf_counter() - start, pages=1, products=len(products))
+
+    def flush(self):
+        start = time.perf_counter()
+        try:
+            self.writer.flush()
+            return True
+        except Exception as e:
+            logging.error(f"🔥 Error guardando lote pendiente: {e}")
+            return False
+        finally:
+            self.stats.add(persist_seconds=time.perf_counter() - start)
+
+
+def configure_logging(adapter):
+    logging.basicConfig(
+        filename=f"scraper_errors_{adapter.log_name}.log",
+        level=logging.ERROR,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+
+def run(adapter, concurrency=None, resume=True, incremental=None, adaptive=None):
+    return ScrapeEngine(adapter, concurrency=concurrency, resume=resume, incremental=incremental, adaptive=adaptive).run()
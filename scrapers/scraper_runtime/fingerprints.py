@@ -0,0 +1,143 @@
+import hashlib
+import threading
+
+from psycopg2.extras import execute_values
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS page_fingerprints (
+        retailer_id INTEGER REFERENCES retailers(id),
+        category TEXT NOT NULL,
+        page INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        written_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (retailer_id, category, page)
+    );
+    CREATE TABLE IF NOT EXISTS category_revisits (
+        retailer_id INTEGER REFERENCES retailers(id),
+        category TEXT NOT NULL,
+        unchanged_runs INTEGER NOT NULL DEFAULT 0,
+        last_visited_at TIMESTAMP,
+        next_visit_at TIMESTAMP,
+        PRIMARY KEY (retailer_id, category)
+    );
+"""
+
+SAVE_FINGERPRINTS_SQL = """
+    INSERT INTO page_fingerprints (retailer_id, category, page, fingerprint, written_at)
+    VALUES %s
+    ON CONFLICT (retailer_id, category, page) DO UPDATE SET
+        fingerprint = EXCLUDED.fingerprint,
+        written_at = CURRENT_TIMESTAMP
+"""
+
+SAVE_REVISITS_SQL = """
+    INSERT INTO category_revisits (retailer_id, category, unchanged_runs, last_visited_at, next_visit_at)
+    VALUES %s
+    ON CONFLICT (retailer_id, category) DO UPDATE SET
+        unchanged_runs = EXCLUDED.unchanged_runs,
+        last_visited_at = EXCLUDED.last_visited_at,
+        next_visit_at = EXCLUDED.next_visit_at
+"""
+
+# Las corridas son nocturnas: sin la tolerancia de 2 h, una visita "a las 24 h" caería apenas después de la corrida
+REVISIT_TEMPLATE = "(%s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + make_interval(days => %s) - interval '2 hours')"
+
+
+def page_fingerprint(products, category):
+    """Digest de todo lo que se escribe de una página: si coincide, el upsert no cambiaría nada."""
+    rows = sorted(
+        f"{p.url}|{p.final_price}|{p.original_price}|{p.out_of_stock}|{p.title}|{p.image}"
+        for p in products
+    )
+    digest = hashlib.sha1(category.slug.encode())
+    for row in rows:
+        digest.update(b"\n" + row.encode())
+    return digest.hexdigest()
+
+
+class PageFingerprints:
+    """Modo incremental: recuerda el fingerprint de cada página de listado y avisa si no cambió.
+
+    Las páginas iguales a la última escritura no se vuelven a upsertear (ni se toca `updated_date`).
+    Los fingerprints más viejos que `max_age_days` no alcanzan para saltear la página, así cada
+    tanto todo se reescribe; pero esa reescritura no cuenta como cambio para la revisita adaptativa.
+
+    Con `adaptive`, una categoría que no cambia en varias corridas seguidas se visita cada vez
+    menos: se saltea 0, 1, 3, 7... días (hasta `max_skip_days`) y vuelve a diario apenas cambia.
+    """
+
+    def __init__(self, conn, retailer_id, adaptive=False, max_age_days=7, max_skip_days=7):
+        self.conn = conn
+        self.retailer_id = retailer_id
+        self.adaptive = adaptive
+        self.max_age_days = max_age_days
+        self.max_skip_days = max_skip_days
+        self._known = {}
+        self._revisits = {}
+        self._pending_pages = {}
+        self._pending_revisits = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL)
+            cursor.execute("""
+                SELECT category, page, fingerprint, written_at > CURRENT_TIMESTAMP - make_interval(days => %s)
+                FROM page_fingerprints
+                WHERE retailer_id = %s
+            """, (self.max_age_days, self.retailer_id))
+            # (fingerprint, vigente): uno vencido no saltea la página pero sí dice si cambió
+            self._known = {(category, page): (fingerprint, fresh) for category, page, fingerprint, fresh in cursor.fetchall()}
+            cursor.execute("""
+                SELECT category, unchanged_runs, COALESCE(next_visit_at <= CURRENT_TIMESTAMP, TRUE)
+                FROM category_revisits
+                WHERE retailer_id = %s
+            """, (self.retailer_id,))
+            self._revisits = {category: (unchanged_runs, due) for category, unchanged_runs, due in cursor.fetchall()}
+        self.conn.commit()
+        fresh = sum(1 for _, is_fresh in self._known.values() if is_fresh)
+        print(f"🧬 Modo incremental: {fresh} páginas con fingerprint vigente{' (revisita adaptativa)' if self.adaptive else ''}")
+
+    def should_visit(self, category):
+        if not self.adaptive:
+            return True
+        return self._revisits.get(category.slug, (0, True))[1]
+
+    def unchanged(self, category, page, fingerprint):
+        """True si la página se puede saltear: igual a la última escritura y no vencida."""
+        return self._known.get((category.slug, page)) == (fingerprint, True)
+
+    def changed(self, category, page, fingerprint):
+        """True si el contenido cambió de verdad (o la página es nueva), sin importar el vencimiento."""
+        known = self._known.get((category.slug, page))
+        return known is None or known[0] != fingerprint
+
+    # Se escribe con el mismo flush que los productos de la página
+    def page_written(self, category, page, fingerprint):
+        with self._lock:
+            self._pending_pages[(category.slug, page)] = fingerprint
+
+    def category_visited(self, category, changed):
+        if not self.adaptive:
+            return
+        unchanged_runs = 0 if changed else self._revisits.get(category.slug, (0, True))[0] + 1
+        skip_days = min(2 ** (unchanged_runs - 1) - 1, self.max_skip_days) if unchanged_runs else 0
+        with self._lock:
+            self._pending_revisits[category.slug] = (unchanged_runs, skip_days + 1)
+        if skip_days:
+            print(f"💤 {category.slug} sin cambios en {unchanged_runs} corridas: próxima visita en {skip_days + 1} días")
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending_pages or self._pending_revisits)
+
+    def write_pending(self, cursor):
+        with self._lock:
+            pages, self._pending_pages = self._pending_pages, {}
+            revisits, self._pending_revisits = self._pending_revisits, {}
+        if pages:
+            rows = [(self.retailer_id, category, page, fingerprint) for (category, page), fingerprint in pages.items()]
+            execute_values(cursor, SAVE_FINGERPRINTS_SQL, rows, template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)")
+        if revisits:
+            rows = [(self.retailer_id, category, *values) for category, values in revisits.items()]
+            execute_values(cursor, SAVE_REVISITS_SQL, rows, template=REVISIT_TEMPLATE)
@@ -0,0 +1,51 @@
+import httpx
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+
+
+class HttpFetchError(Exception):
+    pass
+
+
+class HttpFetcher:
+    """Cliente HTTP compartido por todo el run: pool de conexiones keep-alive, HTTP/2 y gzip (httpx lo negocia solo)."""
+
+    def __init__(self, user_agent=None, timeout=20.0, max_connections=10, throttle=None):
+        self.throttle = throttle
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={
+                "User-Agent": user_agent or DEFAULT_USER_AGENT,
+                "Accept-Language": "es-AR,es;q=0.9",
+            },
+        )
+
+    def get(self, url, params=None):
+        if self.throttle is None:
+            return self._get(url, params)
+        with self.throttle.slot(url):
+            return self._get(url, params)
+
+    def _get(self, url, params):
+        try:
+            response = self.client.get(url, params=params)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise HttpFetchError(f"{url}: {e}") from e
+        return response
+
+    def get_text(self, url, params=None):
+        return self.get(url, params=params).text
+
+    def get_json(self, url, params=None):
+        response = self.get(url, params=params)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise HttpFetchError(f"{url}: respuesta no es JSON") from e
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,246 @@
+import threading
+
+from psycopg2.extras import execute_values
+
+# Un solo statement por lote: deduplica por URL, guarda en `historical_prices` el precio
+# anterior de los productos cuyo precio cambió y hace el upsert en `products`.
+# Los CTEs ven el mismo snapshot, así que `history` lee los precios previos al upsert.
+# `{price_stats}` es el CTE de PRICE_STATS_CTE cuando existe `product_price_stats` y
+# `{arbitrage}` el de ARBITRAGE_CTE cuando existe `arbitrage_opportunities`.
+BULK_UPSERT_SQL = """
+    WITH incoming (ord, title, original_price, final_price, url, image, retail_category, retailer_id, out_of_stock) AS (
+        VALUES %s
+    ),
+    deduped AS (
+        SELECT DISTINCT ON (url) *
+        FROM incoming
+        ORDER BY url, ord DESC
+    ),
+    history AS (
+        INSERT INTO historical_prices (product_id, original_price, final_price)
+        SELECT p.id, p.original_price, p.final_price
+        FROM deduped i
+        JOIN products p ON p.url = i.url
+        WHERE (i.original_price IS NOT NULL AND p.original_price IS DISTINCT FROM i.original_price)
+           OR (i.final_price IS NOT NULL AND p.final_price IS DISTINCT FROM i.final_price)
+        RETURNING product_id, final_price
+    ),
+    upserted AS (
+        INSERT INTO products (title, original_price, final_price, url, image, retail_category, retailer_id, added_date, updated_date, out_of_stock)
+        SELECT title, original_price, final_price, url, image, retail_category, retailer_id,
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, COALESCE(out_of_stock, FALSE)
+        FROM deduped
+        ON CONFLICT (url) DO UPDATE SET
+            title = EXCLUDED.title,
+            original_price = EXCLUDED.original_price,
+            final_price = EXCLUDED.final_price,
+            image = EXCLUDED.image,
+            retail_category = EXCLUDED.retail_category,
+            retailer_id = EXCLUDED.retailer_id,
+            updated_date = CURRENT_TIMESTAMP,
+            out_of_stock = COALESCE(
+                (SELECT d.out_of_stock FROM deduped d WHERE d.url = EXCLUDED.url),
+                products.out_of_stock
+            )
+        RETURNING id, original_price, final_price, (xmax = 0) AS inserted
+    ){price_stats}{arbitrage}
+    SELECT
+        count(*) FILTER (WHERE inserted),
+        count(*) FILTER (WHERE NOT inserted),
+        (SELECT count(*) FROM history),
+        (SELECT array_agg(DISTINCT canonical_product_id ORDER BY canonical_product_id) FROM arbitrage)
+    FROM upserted
+"""
+
+# Resumen por producto (migración 0006 del backend), solo para los productos nuevos o con
+# cambio de precio. Cada cambio suma el precio final como una observación (igual que cada fila
+# del historial en el cálculo inicial) y mueve mínimo/máximo; la mayor diferencia original - final se reemplaza si la actual es más grande. Los precios de
+# hace N días no cambian al escribir: los recalcula refresh_product_price_windows(), que corre
+# cada hora (backend/refresh-price-windows.py) y no al arrancar los scrapers.
+PRICE_STATS_CTE = """,
+    changes AS (
+        SELECT u.id, u.original_price, u.final_price, u.inserted,
+               NULLIF(GREATEST(u.original_price - u.final_price, 0), 0) AS discount
+        FROM upserted u
+        LEFT JOIN history h ON h.product_id = u.id
+        WHERE u.inserted OR h.product_id IS NOT NULL
+    ),
+    price_stats AS (
+        INSERT INTO product_price_stats AS s (
+            product_id, current_price, min_final_price, max_final_price, price_sum, price_count,
+            is_all_time_low, max_discount, max_discount_original_price, max_discount_final_price,
+            max_discount_at, last_change_at, windows_refreshed_at
+        )
+        SELECT id, final_price,
+               final_price,
+               final_price,
+               COALESCE(final_price, 0),
+               (final_price IS NOT NULL)::int,
+               FALSE,
+               discount,
+               CASE WHEN discount IS NOT NULL THEN original_price END,
+               CASE WHEN discount IS NOT NULL THEN final_price END,
+               CASE WHEN discount IS NOT NULL THEN CURRENT_TIMESTAMP END,
+               CASE WHEN inserted THEN NULL ELSE CURRENT_TIMESTAMP END,
+               NULL
+        FROM changes
+        ON CONFLICT (product_id) DO UPDATE SET
+            current_price = EXCLUDED.current_price,
+            min_final_price = LEAST(s.min_final_price, EXCLUDED.min_final_price),
+            max_final_price = GREATEST(s.max_final_price, EXCLUDED.max_final_price),
+            price_sum = s.price_sum + EXCLUDED.price_sum,
+            price_count = s.price_count + EXCLUDED.price_count,
+            is_all_time_low = s.price_count > 0 AND EXCLUDED.current_price <= s.min_final_price,
+            max_discount = GREATEST(s.max_discount, EXCLUDED.max_discount),
+            max_discount_original_price = CASE WHEN EXCLUDED.max_discount > COALESCE(s.max_discount, 0)
+                THEN EXCLUDED.max_discount_original_price ELSE s.max_discount_original_price END,
+            max_discount_final_price = CASE WHEN EXCLUDED.max_discount > COALESCE(s.max_discount, 0)
+                THEN EXCLUDED.max_discount_final_price ELSE s.max_discount_final_price END,
+            max_discount_at = CASE WHEN EXCLUDED.max_discount > COALESCE(s.max_discount, 0)
+                THEN EXCLUDED.max_discount_at ELSE s.max_discount_at END,
+            last_change_at = CURRENT_TIMESTAMP
+        RETURNING 1
+    )
+"""
+
+# Productos canónicos (migración 0008 del backend) con alguna publicación que cambió de precio
+# o de stock: después del upsert se recalculan sus filas de `arbitrage_opportunities`. Se pasan
+# ordenados para que dos scrapers que comparten canónicos bloqueen sus filas en el mismo orden
+ARBITRAGE_CTE = """,
+    arbitrage AS (
+        SELECT p.canonical_product_id
+        FROM deduped i
+        JOIN products p ON p.url = i.url
+        WHERE p.canonical_product_id IS NOT NULL
+          AND ((i.final_price IS NOT NULL AND p.final_price IS DISTINCT FROM i.final_price)
+               OR (i.out_of_stock IS NOT NULL AND p.out_of_stock IS DISTINCT FROM i.out_of_stock))
+    )
+"""
+NO_ARBITRAGE_CTE = """,
+    arbitrage AS (SELECT NULL::integer AS canonical_product_id WHERE FALSE)
+"""
+
+REFRESH_ARBITRAGE_SQL = "SELECT refresh_arbitrage_opportunities(%s)"
+
+ROW_TEMPLATE = "(%s, %s, %s::numeric, %s::numeric, %s, %s, %s, %s, %s::boolean)"
+
+# Versión de los datos de `products`: el backend la lee para invalidar su caché de /products.
+# Misma definición que la migración 0003 del backend
+DATA_VERSIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name TEXT PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+BUMP_DATA_VERSION_SQL = """
+    INSERT INTO data_versions (name, version, updated_at) VALUES ('products', 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class ProductWriter:
+    """Acumula páginas scrapeadas y las escribe en `products` / `historical_prices` en un único statement.
+
+    Con `pages_per_flush > 1` se agrupan varias páginas por round trip; `flush()` vacía lo pendiente.
+    Es seguro llamarlo desde varios workers: las escrituras se serializan sobre la misma conexión.
+    `checkpoints` (RunCheckpoints) y `fingerprints` (PageFingerprints) guardan su estado en la
+    misma transacción que los productos, vía `has_pending()` / `write_pending(cursor)`.
+    Cada flush con productos incrementa `data_versions` en esa misma transacción y, si la tabla
+    existe (lo mira `ensure_schema()`), actualiza `product_price_stats` y `arbitrage_opportunities`.
+    """
+
+    def __init__(self, conn, retailer_id, pages_per_flush=1, checkpoints=None, fingerprints=None):
+        self.conn = conn
+        self.retailer_id = retailer_id
+        self.pages_per_flush = max(1, pages_per_flush)
+        self.checkpoints = checkpoints
+        self.fingerprints = fingerprints
+        self.inserted = 0
+        self.updated = 0
+        self.history_rows = 0
+        self._pending_rows = []
+        self._pending_pages = 0
+        self._lock = threading.RLock()
+        self._upsert_sql = BULK_UPSERT_SQL.format(price_stats="", arbitrage=NO_ARBITRAGE_CTE)
+
+    def ensure_schema(self):
+        # Sin DDL sobre historical_prices: las particiones las crea `manage-price-partitions.py ensure`
+        # (con varios scrapers arrancando a la vez competirían por el lock de la tabla)
+        with self.conn.cursor() as cursor:
+            cursor.execute(DATA_VERSIONS_SQL)
+            cursor.execute(
+                "SELECT to_regclass('product_price_stats') IS NOT NULL, "
+                "to_regproc('refresh_arbitrage_opportunities') IS NOT NULL"
+            )
+            price_stats, arbitrage = cursor.fetchone()
+            self._upsert_sql = BULK_UPSERT_SQL.format(
+                price_stats=PRICE_STATS_CTE if price_stats else "",
+                arbitrage=ARBITRAGE_CTE if arbitrage else NO_ARBITRAGE_CTE,
+            )
+        self.conn.commit()
+
+    def save_page(self, products, category, page=None, fingerprint=None):
+        with self._lock:
+            self._buffer(products, category)
+            if self.checkpoints and page is not None:
+                self.checkpoints.page_done(category, page)
+            if self.fingerprints and fingerprint is not None:
+                self.fingerprints.page_written(category, page, fingerprint)
+            if self._pending_pages >= self.pages_per_flush:
+                self.flush()
+
+    # Página igual a la última escrita (modo incremental): solo avanza el checkpoint
+    def skip_page(self, category, page):
+        if self.checkpoints:
+            with self._lock:
+                self.checkpoints.page_done(category, page)
+
+    def _buffer(self, products, category):
+        for product in products:
+            self._pending_rows.append((
+                len(self._pending_rows),
+                product.title,
+                product.original_price,
+                product.final_price,
+                product.url,
+                product.image,
+                category.slug,
+                self.retailer_id,
+                product.out_of_stock,
+            ))
+        self._pending_pages += 1
+
+    def flush(self):
+        with self._lock:
+            rows = self._pending_rows
+            self._pending_rows = []
+            self._pending_pages = 0
+            trackers = [t for t in (self.checkpoints, self.fingerprints) if t is not None and t.has_pending()]
+            if not rows and not trackers:
+                return
+            result = None
+            try:
+                with self.conn.cursor() as cursor:
+                    if rows:
+                        # page_size = len(rows): todo el lote en un solo statement
+                        result = execute_values(cursor, self._upsert_sql, rows, template=ROW_TEMPLATE, page_size=len(rows), fetch=True)
+                        canonical_ids = result[0][3]
+                        if canonical_ids:
+                            # Otro statement: el upsert no ve sus propios cambios
+                            cursor.execute(REFRESH_ARBITRAGE_SQL, (canonical_ids,))
+                        cursor.execute(BUMP_DATA_VERSION_SQL)
+                    for tracker in trackers:
+                        tracker.write_pending(cursor)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            if result:
+                self._record(*result[0][:3])
+
+    def _record(self, inserted, updated, history_rows):
+        self.inserted += inserted
+        self.updated += updated
+        self.history_rows += history_rows
@@ -0,0 +1,14 @@
+import logging
+import re
+
+
+# Convierte "$ 1.234.567,89" → 1234567.89
+def parse_price(price_str):
+    if not price_str or price_str == "N/A":
+        return None
+    try:
+        cleaned = re.sub(r"[^\d,]", "", price_str).replace(".", "").replace(",", ".")
+        return float(cleaned)
+    except Exception as e:
+        logging.error(f"⚠️ Error al convertir precio: {price_str} - {e}")
+        return None
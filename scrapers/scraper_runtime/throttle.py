@@ -0,0 +1,30 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class HostThrottle:
+    """Cortesía con los retailers: máximo de requests simultáneos y separación mínima por host."""
+
+    def __init__(self, max_per_host=2, min_interval=0.0):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            if self.min_interval:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_slot.get(host, now))
+                    self._next_slot[host] = start + self.min_interval
+                if start > now:
+                    time.sleep(start - now)
+            yield
@@ -0,0 +1,112 @@
+import time
+
+# Esperas por estado de la página en vez de `time.sleep` fijos: se sale apenas la grilla
+# está cargada y quieta, y el timeout de cada retailer es solo el techo.
+
+POLL_INTERVAL = 0.25
+
+# Cantidad de items, requests de red completados hasta ahora y estado del documento.
+# El buffer de resource timing viene en 250 entradas: se agranda para que el conteo no se congele.
+_SNAPSHOT_JS = """
+performance.setResourceTimingBufferSize(100000);
+return [
+    document.querySelectorAll(arguments[0]).length,
+    performance.getEntriesByType('resource').length,
+    document.readyState
+];
+"""
+
+
+def page_snapshot(driver, selector):
+    return tuple(driver.execute_script(_SNAPSHOT_JS, selector))
+
+
+def wait_for_items(driver, selector, timeout=15, settle=0.75, network_idle=0.5, empty_grace=2.0):
+    """Espera a que la grilla tenga items y deje de cambiar.
+
+    Se resuelve cuando la cantidad de `selector` no cambia durante `settle` segundos y la red
+    lleva `network_idle` segundos sin terminar requests nuevos. Si no hay items pero el documento
+    está completo y la red quieta por `empty_grace`, se asume página vacía (fin de categoría).
+    Devuelve la cantidad de items encontrada (al timeout, la última vista).
+    """
+    deadline = time.monotonic() + timeout
+    last_count, last_resources, _ = page_snapshot(driver, selector)
+    count_changed = resources_changed = time.monotonic()
+    while True:
+        time.sleep(POLL_INTERVAL)
+        now = time.monotonic()
+        count, resources, ready_state = page_snapshot(driver, selector)
+        if count != last_count:
+            last_count, count_changed = count, now
+        if resources != last_resources:
+            last_resources, resources_changed = resources, now
+
+        network_quiet = now - resources_changed
+        if count and now - count_changed >= settle and network_quiet >= network_idle:
+            return count
+        if not count and ready_state == "complete" and network_quiet >= empty_grace:
+            return 0
+        if now >= deadline:
+            print(f"⏳ Timeout ({timeout}s) esperando {selector}: {count} items")
+            return count
+
+
+def wait_for_growth(driver, selector, previous_count, timeout=5, settle=0.5):
+    """Espera a que aparezcan más items que `previous_count` y se estabilicen.
+
+    Devuelve la cantidad nueva, o `previous_count` si no creció antes del timeout.
+    """
+    deadline = time.monotonic() + timeout
+    last_count = previous_count
+    changed = None
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        count = page_snapshot(driver, selector)[0]
+        if count != last_count:
+            last_count, changed = count, time.monotonic()
+        elif changed is not None and time.monotonic() - changed >= settle:
+            break
+    return max(last_count, previous_count)
+
+
+def sweep_page(driver, steps=10, pause=0.1):
+    """Recorre la página de arriba a abajo para disparar el lazy load de cada tramo de la grilla."""
+    height = driver.execute_script("return document.body.scrollHeight")
+    for i in range(1, steps + 1):
+        driver.execute_script("window.scrollTo(0, arguments[0]);", height * i / steps)
+        time.sleep(pause)
+
+
+def scroll_until_complete(driver, selector, step_timeout=5, max_scrolls=30, sweep=False):
+    """Scroll infinito: baja al final hasta que un scroll deja de sumar items."""
+    if sweep:
+        sweep_page(driver)
+    count = page_snapshot(driver, selector)[0]
+    for _ in range(max_scrolls):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        new_count = wait_for_growth(driver, selector, count, timeout=step_timeout)
+        if new_count <= count:
+            break
+        count = new_count
+    return count
+
+
+def click_until_exhausted(driver, find_button, selector, step_timeout=5, max_clicks=50):
+    """Click en "ver más" mientras exista el botón y cada click sume items.
+
+    `find_button(driver)` devuelve el botón o None cuando ya no hay más.
+    """
+    count = page_snapshot(driver, selector)[0]
+    for _ in range(max_clicks):
+        try:
+            button = find_button(driver)
+        except Exception:
+            button = None
+        if button is None:
+            break
+        driver.execute_script("arguments[0].click();", button)
+        new_count = wait_for_growth(driver, selector, count, timeout=step_timeout)
+        if new_count <= count:
+            break
+        count = new_count
+    return count
@@ -0,0 +1,75 @@
+import unittest
+
+from scraper_runtime.adapter import CategoryTarget
+from scraper_runtime.fingerprints import PageFingerprints
+
+CATEGORY = CategoryTarget(url="https://tienda.example/heladeras", slug="heladeras")
+
+
+class FakeCursor:
+    """Devuelve, en orden, el resultado de cada SELECT de PageFingerprints.load()."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if sql.lstrip().upper().startswith("SELECT"):
+            self.rows = self.results.pop(0)
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def cursor(self):
+        return FakeCursor(self.results)
+
+    def commit(self):
+        pass
+
+
+def loaded(pages, revisits):
+    fingerprints = PageFingerprints(FakeConnection(pages, revisits), retailer_id=1, adaptive=True)
+    fingerprints.load()
+    return fingerprints
+
+
+class ExpiredFingerprintTest(unittest.TestCase):
+    def test_expired_fingerprint_is_rewritten_but_not_changed(self):
+        fingerprints = loaded([("heladeras", 1, "abc", False)], [])
+        self.assertFalse(fingerprints.unchanged(CATEGORY, 1, "abc"))
+        self.assertFalse(fingerprints.changed(CATEGORY, 1, "abc"))
+
+    def test_fresh_fingerprint_is_skipped(self):
+        fingerprints = loaded([("heladeras", 1, "abc", True)], [])
+        self.assertTrue(fingerprints.unchanged(CATEGORY, 1, "abc"))
+
+    def test_different_or_new_page_is_changed(self):
+        fingerprints = loaded([("heladeras", 1, "abc", False)], [])
+        self.assertTrue(fingerprints.changed(CATEGORY, 1, "xyz"))
+        self.assertTrue(fingerprints.changed(CATEGORY, 2, "abc"))
+
+    def test_backoff_reaches_max_skip_days_across_expiry(self):
+        # Cada corrida reescribe la página porque el fingerprint venció, sin cambios reales:
+        # la revisita tiene que seguir alargándose hasta max_skip_days
+        unchanged_runs = 0
+        for _ in range(6):
+            fingerprints = loaded([("heladeras", 1, "abc", False)], [("heladeras", unchanged_runs, True)])
+            fingerprints.category_visited(CATEGORY, changed=fingerprints.changed(CATEGORY, 1, "abc"))
+            unchanged_runs, visit_in_days = fingerprints._pending_revisits["heladeras"]
+        self.assertEqual(unchanged_runs, 6)
+        self.assertEqual(visit_in_days, fingerprints.max_skip_days + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()